@@ -4,6 +4,7 @@ from cl.runtime.records.record_mixin import RecordMixin
 from cl.runtime.db.db import Db
 from cl.runtime.context.protocols import ContextProtocol
 from cl.runtime.context.context import Context
+from cl.runtime.db.local.cached_db import CachedDb
 from cl.runtime.db.local.local_cache import LocalCache
 from cl.runtime.views.view import View
 from cl.runtime.views.record_view import RecordView
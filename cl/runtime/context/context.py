@@ -14,15 +14,19 @@
 
 import logging
 from contextlib import contextmanager
-from contextvars import ContextVar
 from dataclasses import dataclass
+from typing import Dict
 from typing import Iterable
 from typing import Iterator
 from typing import List
-from typing import Optional
+from typing import Tuple
 from typing import Type
 from cl.runtime.backend.core.user_key import UserKey
+from cl.runtime.context.context_batch import ContextBatch
+from cl.runtime.context.context_identity_map import ContextIdentityMap
 from cl.runtime.context.context_key import ContextKey
+from cl.runtime.context.context_stack import _context_stack
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
 from cl.runtime.db.db_key import DbKey
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
@@ -32,10 +36,12 @@ from cl.runtime.log.log_entry_level_enum import LogEntryLevelEnum
 from cl.runtime.log.log_key import LogKey
 from cl.runtime.log.user_log_entry import UserLogEntry
 from cl.runtime.records.dataclasses_extensions import missing
+from cl.runtime.records.key_util import KeyUtil
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import is_key
 from cl.runtime.records.record_mixin import RecordMixin
+from cl.runtime.schema.index_decl import IndexDecl
 from cl.runtime.settings.context_settings import ContextSettings
 
 root_context_types_str = """
@@ -44,10 +50,16 @@ The following root context types can be used in the outermost 'with' clause:
     - TestingContext: Context for running unit tests
 """
 
-_context_stack: ContextVar[Optional[List["Context"]]] = ContextVar("context_stack", default=None)
+_batch_dict: Dict[int, ContextBatch] = {}
 """
-Context adds self to the stack on __enter__ and removes self on __exit__.
-Each asynchronous context has its own stack.
+Dict of batches for contexts inside 'with context.batch()' block with id(context) key, stored outside
+the class to avoid serializing them. The entry is removed at the end of the outermost block.
+"""
+
+_identity_map_dict: Dict[int, ContextIdentityMap] = {}
+"""
+Dict of identity maps for contexts with 'use_identity_map' set with id(context) key, stored outside
+the class to avoid serializing them. The entry is added on __enter__ and removed on __exit__.
 """
 
 
@@ -75,6 +87,12 @@ class Context(ContextKey, RecordMixin[ContextKey]):
     dataset: str = missing()
     """Dataset of the context, 'Context.current().dataset' is used if not specified."""
 
+    use_identity_map: bool = False
+    """
+    If True, return the same record instance for the same key from load_one and load_many inside
+    'with' clause for this context, and load each key from the database at most once.
+    """
+
     is_deserialized: bool = False
     """Use this flag to determine if this context instance has been deserialized from data."""
 
@@ -136,6 +154,10 @@ class Context(ContextKey, RecordMixin[ContextKey]):
 
         # Set current context on entering 'with Context(...)' clause
         context_stack.append(self)
+
+        # Identity map is only used inside 'with' clause so that records do not outlive the context
+        if self.use_identity_map:
+            _identity_map_dict[id(self)] = ContextIdentityMap()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -171,6 +193,13 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         if current_context is not self:
             raise RuntimeError("Current context must only be modified by 'with Context(...)' clause.")
 
+        # Discard the identity map on exiting from 'with Context(...)' clause
+        _identity_map_dict.pop(id(self), None)
+
+        # Write records buffered by the database if it supports write-behind mode
+        if (flush := getattr(self.db, "flush", None)) is not None:
+            flush()
+
         # TODO: Support resource disposal for the database
         if self.db is not None:
             # TODO: Finalize approach to disposal self.db.disconnect()
@@ -204,6 +233,30 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             is_key_optional: If True, return None when key is none found instead of an error
             is_record_optional: If True, return None when record is not found instead of an error
         """
+        if (batch := self._get_batch()) is not None:
+            if batch.has_other_scopes(dataset=dataset, identity=identity) or isinstance(record_or_key, (tuple, str)):
+                # Write the batch first if a buffered record may be visible but cannot be found in the batch
+                self.flush_batch()
+            elif is_key(record_or_key) and (entry := batch.get(record_or_key, dataset=dataset, identity=identity)):
+                # Return the record saved or deleted inside the batch without DB lookup
+                if (record := entry[1]) is None and not is_record_optional:
+                    raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
+                return record
+        if (identity_map := self._get_identity_map()) is not None and is_key(record_or_key):
+            if (record := identity_map.get(record_or_key, dataset=dataset, identity=identity)) is not None:
+                # Return the record previously loaded or saved through this context without DB lookup
+                return record
+            record = self.db.load_one(  # noqa
+                record_type,
+                record_or_key,
+                dataset=dataset,
+                identity=identity,
+                is_key_optional=is_key_optional,
+                is_record_optional=is_record_optional,
+            )
+            if record is not None:
+                identity_map.add(record, dataset=dataset, identity=identity)
+            return record
         return self.db.load_one(  # noqa
             record_type,
             record_or_key,
@@ -231,6 +284,40 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
         """
+        if (batch := self._get_batch()) is not None:
+            records_or_keys = list(records_or_keys)
+            if batch.has_other_scopes(dataset=dataset, identity=identity) or any(
+                isinstance(x, (tuple, str)) for x in records_or_keys
+            ):
+                # Write the batch first if a buffered record may be visible but cannot be found in the batch
+                self.flush_batch()
+            else:
+                # Load only the keys not found in the batch and merge the results in the original order
+                entries = [
+                    batch.get(x, dataset=dataset, identity=identity) if is_key(x) else None for x in records_or_keys
+                ]
+                if any(entry is not None for entry in entries):
+                    not_buffered = [x for x, entry in zip(records_or_keys, entries) if entry is None]
+                    loaded = iter(self.db.load_many(record_type, not_buffered, dataset=dataset, identity=identity))
+                    return [entry[1] if entry is not None else next(loaded) for entry in entries]
+        if (identity_map := self._get_identity_map()) is not None and records_or_keys is not None:
+            records_or_keys = list(records_or_keys)
+            if not any(isinstance(x, (tuple, str)) for x in records_or_keys):
+                # Load each key not in the identity map once and merge the results in the original order
+                not_found: Dict[Tuple, KeyProtocol] = {}
+                for x in records_or_keys:
+                    if is_key(x) and identity_map.get(x, dataset=dataset, identity=identity) is None:
+                        not_found.setdefault(KeyUtil.get_key_tuple(x), x)
+                if not_found:
+                    loaded = self.db.load_many(
+                        record_type, list(not_found.values()), dataset=dataset, identity=identity
+                    )
+                    for record in loaded:
+                        if record is not None:
+                            identity_map.add(record, dataset=dataset, identity=identity)
+                return [
+                    identity_map.get(x, dataset=dataset, identity=identity) if is_key(x) else x for x in records_or_keys
+                ]
         return self.db.load_many(  # noqa
             record_type,
             records_or_keys,
@@ -244,6 +331,9 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord | None] | None:
         """
         Load all records of the specified type and its subtypes (excludes other types in the same DB table).
@@ -252,11 +342,18 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             record_type: Type of the records to load
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
+            limit: If specified, return at most this number of records (no limit if None, error if negative)
+            skip: If specified, skip this number of records from the beginning of the sorted result (error if negative)
+            sort: Fields to sort by in the order of priority, sorted by key fields if not specified and paging is used
         """
+        self.flush_batch()
         return self.db.load_all(  # noqa
             record_type,
             dataset=dataset,
             identity=identity,
+            limit=limit,
+            skip=skip,
+            sort=sort,
         )
 
     def load_filter(
@@ -266,6 +363,9 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord]:
         """
         Load records where values of those fields that are set in the filter match the filter.
@@ -275,12 +375,66 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             filter_obj: Instance of 'record_type' whose fields are used for the query
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
+            limit: If specified, return at most this number of records (no limit if None, error if negative)
+            skip: If specified, skip this number of records from the beginning of the sorted result (error if negative)
+            sort: Fields to sort by in the order of priority, sorted by key fields if not specified and paging is used
         """
+        self.flush_batch()
         return self.db.load_filter(  # noqa
             record_type,
             filter_obj,
             dataset=dataset,
             identity=identity,
+            limit=limit,
+            skip=skip,
+            sort=sort,
+        )
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records of the specified type and its subtypes.
+
+        Args:
+            record_type: Type of the records to count
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        self.flush_batch()
+        return self.db.count_all(  # noqa
+            record_type,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records that match the filter.
+
+        Args:
+            record_type: Type of the records to count
+            filter_obj: Instance of 'record_type' whose fields are used for the query
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        self.flush_batch()
+        return self.db.count_filter(  # noqa
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
         )
 
     def save_one(
@@ -298,11 +452,19 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: Target dataset as a delimited string, list of levels, or None
             identity: Identity token for database access and row-level security
         """
+        if (batch := self._get_batch()) is not None:
+            if record is not None:
+                batch.save(record, dataset=dataset, identity=identity)
+                self._remove_from_identity_map([record])
+            return
         self.db.save_one(  # noqa
             record,
             dataset=dataset,
             identity=identity,
         )
+        if record is not None and (identity_map := self._get_identity_map()) is not None:
+            identity_map.remove(record)
+            identity_map.add(record, dataset=dataset, identity=identity)
 
     def save_many(
         self,
@@ -319,11 +481,24 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: Target dataset as a delimited string, list of levels, or None
             identity: Identity token for database access and row-level security
         """
+        if (batch := self._get_batch()) is not None:
+            for record in records:
+                if record is not None:
+                    batch.save(record, dataset=dataset, identity=identity)
+                    self._remove_from_identity_map([record])
+            return
+        if (identity_map := self._get_identity_map()) is not None:
+            records = list(records)
         self.db.save_many(  # noqa
             records,
             dataset=dataset,
             identity=identity,
         )
+        if identity_map is not None:
+            for record in records:
+                if record is not None:
+                    identity_map.remove(record)
+                    identity_map.add(record, dataset=dataset, identity=identity)
 
     def delete_one(
         self,
@@ -342,6 +517,14 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
         """
+        self._remove_from_identity_map([key])
+        if (batch := self._get_batch()) is not None:
+            if is_key(key):
+                batch.delete(key, dataset=dataset, identity=identity)
+                return
+            else:
+                # Keys in tuple or string format are deleted directly after writing the batch
+                self.flush_batch()
         self.db.delete_one(  # noqa
             key_type,
             key,
@@ -364,12 +547,200 @@ class Context(ContextKey, RecordMixin[ContextKey]):
             dataset: Target dataset as a delimited string, list of levels, or None
             identity: Identity token for database access and row-level security
         """
+        if self._get_identity_map() is not None:
+            keys = list(keys)
+            self._remove_from_identity_map(keys)
+        if (batch := self._get_batch()) is not None:
+            keys = list(keys)
+            if all(is_key(key) for key in keys):
+                for key in keys:
+                    batch.delete(key, dataset=dataset, identity=identity)
+                return
+            else:
+                # Records and keys in other formats are deleted directly after writing the batch
+                self.flush_batch()
         self.db.delete_many(  # noqa
             keys,
             dataset=dataset,
             identity=identity,
         )
 
+    async def load_one_async(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        """Async version of 'load_one' with the same arguments, runs 'load_one' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.load_one,
+            record_type,
+            record_or_key,
+            dataset=dataset,
+            identity=identity,
+            is_key_optional=is_key_optional,
+            is_record_optional=is_record_optional,
+        )
+
+    async def load_many_async(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async version of 'load_many' with the same arguments, runs 'load_many' in the thread pool."""
+        return await ThreadPoolUtil.run_to_list(
+            self.load_many,
+            record_type,
+            records_or_keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def load_all_async(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async version of 'load_all' with the same arguments, runs 'load_all' in the thread pool."""
+        return await ThreadPoolUtil.run_to_list(
+            self.load_all,
+            record_type,
+            dataset=dataset,
+            identity=identity,
+            limit=limit,
+            skip=skip,
+            sort=sort,
+        )
+
+    async def load_filter_async(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[TRecord]:
+        """Async version of 'load_filter' with the same arguments, runs 'load_filter' in the thread pool."""
+        return await ThreadPoolUtil.run_to_list(
+            self.load_filter,
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+            limit=limit,
+            skip=skip,
+            sort=sort,
+        )
+
+    async def count_all_async(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async version of 'count_all' with the same arguments, runs 'count_all' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.count_all,
+            record_type,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def count_filter_async(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async version of 'count_filter' with the same arguments, runs 'count_filter' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.count_filter,
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def save_one_async(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'save_one' with the same arguments, runs 'save_one' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.save_one,
+            record,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def save_many_async(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'save_many' with the same arguments, runs 'save_many' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.save_many,
+            records,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def delete_one_async(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'delete_one' with the same arguments, runs 'delete_one' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.delete_one,
+            key_type,
+            key,
+            dataset=dataset,
+            identity=identity,
+        )
+
+    async def delete_many_async(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'delete_many' with the same arguments, runs 'delete_many' in the thread pool."""
+        return await ThreadPoolUtil.run(
+            self.delete_many,
+            keys,
+            dataset=dataset,
+            identity=identity,
+        )
+
     def delete_all_and_drop_db(self) -> None:
         """
         IMPORTANT: !!! DESTRUCTIVE - THIS WILL PERMANENTLY DELETE ALL RECORDS WITHOUT THE POSSIBILITY OF RECOVERY
@@ -380,8 +751,58 @@ class Context(ContextKey, RecordMixin[ContextKey]):
         """
         # Additional check in context in case a custom database implementation does not check it
         self.error_if_not_temp_db(self.db.db_id)
+        if (batch := self._get_batch()) is not None:
+            batch.clear()
+        if (identity_map := self._get_identity_map()) is not None:
+            identity_map.clear()
         self.db.delete_all_and_drop_db()  # noqa
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Buffer save and delete operations inside 'with context.batch()' block and write them at the end
+        of the outermost block using save_many and delete_many, discard them if the block exits with an exception.
+        """
+        batch = _batch_dict.setdefault(id(self), ContextBatch())
+        batch.depth += 1
+        is_success = False
+        try:
+            yield
+            is_success = True
+        finally:
+            batch.depth -= 1
+            if batch.depth == 0:
+                # Remove before writing so that further operations are not buffered
+                del _batch_dict[id(self)]
+                if is_success:
+                    batch.flush(self.db)
+
+    def flush_batch(self) -> None:
+        """Write operations buffered inside 'with context.batch()' block without waiting for the end of the block."""
+        if (batch := self._get_batch()) is not None:
+            batch.flush(self.db)
+
+    def _get_batch(self) -> ContextBatch | None:
+        """Return the batch if inside 'with context.batch()' block and None otherwise."""
+        return _batch_dict.get(id(self), None) if _batch_dict else None
+
+    def _get_identity_map(self) -> ContextIdentityMap | None:
+        """Return the identity map if 'use_identity_map' is set and inside 'with' clause, and None otherwise."""
+        return _identity_map_dict.get(id(self), None) if _identity_map_dict else None
+
+    def _remove_from_identity_map(
+        self,
+        records_or_keys: Iterable[RecordProtocol | KeyProtocol | tuple | str | None],
+    ) -> None:
+        """Remove records or keys from the identity map when they are saved or deleted through this context."""
+        if (identity_map := self._get_identity_map()) is not None:
+            for x in records_or_keys:
+                if isinstance(x, (tuple, str)):
+                    # Key in tuple or string format cannot be matched to the entries, remove all of them
+                    identity_map.clear()
+                elif x is not None:
+                    identity_map.remove(x)
+
     def _root_context_field_not_set_error(self, field_name: str) -> None:
         """Error message about a Context field not set."""
         if type(self) is not Context:
@@ -0,0 +1,85 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import List
+from typing import Tuple
+from cl.runtime.db.protocols import DbProtocol
+from cl.runtime.records.key_util import KeyUtil
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+
+_BatchScope = Tuple[str | None, str | None]
+"""Dataset and identity of the buffered operations."""
+
+_BatchEntry = Tuple[KeyProtocol | RecordProtocol, RecordProtocol | None]
+"""Key and the saved record, or None if the record is deleted."""
+
+
+@dataclass(slots=True, kw_only=True)
+class ContextBatch:
+    """
+    Buffer of save and delete operations for the 'with context.batch()' block, written to the database
+    by one 'save_many' and one 'delete_many' for each dataset at the end of the outermost block.
+
+    Notes:
+        - Only the last operation for each key is retained, so the order of operations on different keys is not kept
+        - Buffered records are returned by load_one and load_many for the same dataset and identity
+    """
+
+    depth: int = 0
+    """Number of nested 'with context.batch()' blocks using this batch."""
+
+    entries: Dict[_BatchScope, Dict[Tuple, _BatchEntry]] = field(default_factory=dict)
+    """Dictionary of buffered entries by key tuple for each dataset and identity."""
+
+    def save(self, record: RecordProtocol, *, dataset: str | None, identity: str | None) -> None:
+        """Buffer the record, overwriting the previous operation for the same key."""
+        self.entries.setdefault((dataset, identity), {})[KeyUtil.get_key_tuple(record)] = (record, record)
+
+    def delete(self, key: KeyProtocol, *, dataset: str | None, identity: str | None) -> None:
+        """Buffer deletion, overwriting the previous operation for the same key."""
+        self.entries.setdefault((dataset, identity), {})[KeyUtil.get_key_tuple(key)] = (key, None)
+
+    def get(self, key: KeyProtocol, *, dataset: str | None, identity: str | None) -> _BatchEntry | None:
+        """Return buffered entry for the key or None if there are no buffered operations for the key."""
+        if (scope_entries := self.entries.get((dataset, identity), None)) is not None:
+            return scope_entries.get(KeyUtil.get_key_tuple(key), None)
+        else:
+            return None
+
+    def has_other_scopes(self, *, dataset: str | None, identity: str | None) -> bool:
+        """
+        Return True if there are buffered operations for another dataset or identity, in which case the batch
+        must be flushed before reading because the other dataset may be a parent of the dataset being read.
+        """
+        return any(scope != (dataset, identity) for scope in self.entries.keys())
+
+    def flush(self, db: DbProtocol) -> None:
+        """Write buffered operations to the database and clear the buffer."""
+        entries = self.entries
+        self.entries = {}
+        for (dataset, identity), scope_entries in entries.items():
+            records: List[RecordProtocol] = [record for _, record in scope_entries.values() if record is not None]
+            keys: List[KeyProtocol] = [key for key, record in scope_entries.values() if record is None]
+            if records:
+                db.save_many(records, dataset=dataset, identity=identity)
+            if keys:
+                db.delete_many(keys, dataset=dataset, identity=identity)
+
+    def clear(self) -> None:
+        """Discard buffered operations without writing them."""
+        self.entries = {}
@@ -0,0 +1,60 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Tuple
+from cl.runtime.records.key_util import KeyUtil
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+
+_IdentityMapScope = Tuple[str | None, str | None]
+"""Dataset and identity of the loaded records."""
+
+
+@dataclass(slots=True, kw_only=True)
+class ContextIdentityMap:
+    """
+    Records loaded or saved through a context with 'use_identity_map' set, used to return the same
+    record instance for the same key and to avoid loading the same key from the database more than once.
+
+    Notes:
+        - Entries for a key are removed from all datasets when the key is saved or deleted through the context
+        - Changes made by other processes or contexts are not visible until the key is saved or deleted here
+    """
+
+    records: Dict[_IdentityMapScope, Dict[Tuple, RecordProtocol]] = field(default_factory=dict)
+    """Dictionary of records by key tuple for each dataset and identity."""
+
+    def get(self, key: KeyProtocol, *, dataset: str | None, identity: str | None) -> RecordProtocol | None:
+        """Return the record for the key or None if the key is not in the identity map."""
+        if (scope_records := self.records.get((dataset, identity), None)) is not None:
+            return scope_records.get(KeyUtil.get_key_tuple(key), None)
+        else:
+            return None
+
+    def add(self, record: RecordProtocol, *, dataset: str | None, identity: str | None) -> None:
+        """Add the record, replacing the previous record for the same key."""
+        self.records.setdefault((dataset, identity), {})[KeyUtil.get_key_tuple(record)] = record
+
+    def remove(self, key_or_record: KeyProtocol | RecordProtocol) -> None:
+        """Remove the key from all datasets because a change in one dataset may be visible in its child datasets."""
+        key_tuple = KeyUtil.get_key_tuple(key_or_record)
+        for scope_records in self.records.values():
+            scope_records.pop(key_tuple, None)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        self.records = {}
@@ -0,0 +1,24 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextvars import ContextVar
+from typing import List
+from typing import Optional
+from cl.runtime.context.protocols import ContextProtocol
+
+_context_stack: ContextVar[Optional[List[ContextProtocol]]] = ContextVar("context_stack", default=None)
+"""
+Context adds self to the stack on __enter__ and removes self on __exit__.
+Each asynchronous context has its own stack.
+"""
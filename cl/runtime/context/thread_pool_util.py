@@ -0,0 +1,84 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import TypeVar
+from cl.runtime.context.context_stack import _context_stack
+from cl.runtime.settings.context_settings import ContextSettings
+
+TResult = TypeVar("TResult")
+
+_executor: ThreadPoolExecutor | None = None
+"""Thread pool shared by all callers in this process, created on first use."""
+
+_executor_lock = threading.Lock()
+"""Lock to create the thread pool only once when first used from more than one thread."""
+
+
+class ThreadPoolUtil:
+    """Run blocking code such as database I/O or rendering in a bounded thread pool from async code."""
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """Return the thread pool shared by all callers in this process, create on first call."""
+        global _executor
+        if _executor is None:
+            with _executor_lock:
+                if _executor is None:
+                    max_workers = ContextSettings.instance().thread_pool_size
+                    _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="runtime_worker")
+        return _executor
+
+    @classmethod
+    async def run(cls, func: Callable[..., TResult], *args: Any, **kwargs: Any) -> TResult:
+        """
+        Run func(*args, **kwargs) in the thread pool and await the result without blocking the event loop.
+
+        The worker thread runs in a copy of the caller's context variables, so 'Context.current()' returns
+        the same context as in the caller. Contexts entered inside func are added to a copy of the caller's
+        context stack and do not affect the caller.
+        """
+        caller_context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            cls.get_executor(), caller_context.run, cls._run_in_worker, func, args, kwargs
+        )
+
+    @classmethod
+    async def run_to_list(cls, func: Callable[..., Iterable | None], *args: Any, **kwargs: Any) -> List | None:
+        """
+        Run func(*args, **kwargs) in the thread pool and convert the lazy iterable it returns to a list
+        in the worker thread, so that the caller does not perform I/O when iterating over the result.
+        """
+        return await cls.run(cls._to_list, func, args, kwargs)
+
+    @classmethod
+    def _to_list(cls, func: Callable[..., Iterable | None], args: tuple, kwargs: dict) -> List | None:
+        """Invoke func and convert the lazy iterable it returns to a list in the same thread."""
+        result = func(*args, **kwargs)
+        return list(result) if result is not None else None
+
+    @classmethod
+    def _run_in_worker(cls, func: Callable[..., TResult], args: tuple, kwargs: dict) -> TResult:
+        """Invoked inside a copy of the caller's context variables to isolate the context stack of the worker."""
+        context_stack = _context_stack.get()
+        _context_stack.set(list(context_stack) if context_stack is not None else None)
+        return func(*args, **kwargs)
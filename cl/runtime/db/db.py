@@ -18,7 +18,9 @@ from abc import abstractmethod
 from dataclasses import dataclass
 from typing import ClassVar
 from typing import Iterable
+from typing import List
 from typing import Type
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
 from cl.runtime.db.db_key import DbKey
 from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.records.protocols import KeyProtocol
@@ -27,6 +29,7 @@ from cl.runtime.records.protocols import TKey
 from cl.runtime.records.protocols import TQuery
 from cl.runtime.records.protocols import TRecord
 from cl.runtime.records.record_mixin import RecordMixin
+from cl.runtime.schema.index_decl import IndexDecl
 from cl.runtime.settings.context_settings import ContextSettings
 
 
@@ -34,6 +37,12 @@ from cl.runtime.settings.context_settings import ContextSettings
 class Db(DbKey, RecordMixin[DbKey], ABC):
     """Polymorphic data storage with dataset isolation."""
 
+    validate_on_load: bool = False
+    """
+    If True, validate loaded records against the schema, otherwise only invoke their init methods
+    because records are validated when saved.
+    """
+
     # TODO: Do not store here, instead get from settings once during the initial Context construction
     __default: ClassVar[Db | None] = None
 
@@ -90,6 +99,9 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord | None] | None:
         """
         Load all records of the specified type and its subtypes (excludes other types in the same DB table).
@@ -98,6 +110,9 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             record_type: Record type to load, error if the result is not this type or its subclass
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
+            limit: If specified, return at most this number of records (no limit if None, error if negative)
+            skip: If specified, skip this number of records from the beginning of the sorted result (error if negative)
+            sort: Fields to sort by in the order of priority, sorted by key fields if not specified and paging is used
         """
 
     @abstractmethod
@@ -108,6 +123,9 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord]:
         """
         Load records where values of those fields that are set in the filter match the filter.
@@ -117,7 +135,46 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
             filter_obj: Instance of 'record_type' whose fields are used for the query
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
+            limit: If specified, return at most this number of records (no limit if None, error if negative)
+            skip: If specified, skip this number of records from the beginning of the sorted result (error if negative)
+            sort: Fields to sort by in the order of priority, sorted by key fields if not specified and paging is used
+        """
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records of the specified type and its subtypes, override to count on the DB side.
+
+        Args:
+            record_type: Record type to count
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+        return sum(1 for _ in self.load_all(record_type, dataset=dataset, identity=identity))
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records that match the filter, override to count on the DB side.
+
+        Args:
+            record_type: Record type to count
+            filter_obj: Instance of 'record_type' whose fields are used for the query
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
         """
+        return sum(1 for _ in self.load_filter(record_type, filter_obj, dataset=dataset, identity=identity))
 
     @abstractmethod
     def save_one(
@@ -203,6 +260,146 @@ class Db(DbKey, RecordMixin[DbKey], ABC):
     def close_connection(self) -> None:
         """Close database connection to releasing resource locks."""
 
+    async def load_one_async(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        """Async version of 'load_one', the default implementation runs 'load_one' in a thread pool."""
+        return await ThreadPoolUtil.run(
+            self.load_one,
+            record_type,
+            record_or_key,
+            dataset=dataset,
+            identity=identity,
+            is_key_optional=is_key_optional,
+            is_record_optional=is_record_optional,
+        )
+
+    async def load_many_async(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async version of 'load_many', the default implementation runs 'load_many' in a thread pool."""
+        return await ThreadPoolUtil.run_to_list(
+            self.load_many, record_type, records_or_keys, dataset=dataset, identity=identity
+        )
+
+    async def load_all_async(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async version of 'load_all', the default implementation runs 'load_all' in a thread pool."""
+        return await ThreadPoolUtil.run_to_list(
+            self.load_all,
+            record_type,
+            dataset=dataset,
+            identity=identity,
+            limit=limit,
+            skip=skip,
+            sort=sort,
+        )
+
+    async def load_filter_async(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[TRecord]:
+        """Async version of 'load_filter', the default implementation runs 'load_filter' in a thread pool."""
+        return await ThreadPoolUtil.run_to_list(
+            self.load_filter,
+            record_type,
+            filter_obj,
+            dataset=dataset,
+            identity=identity,
+            limit=limit,
+            skip=skip,
+            sort=sort,
+        )
+
+    async def count_all_async(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async version of 'count_all', the default implementation runs 'count_all' in a thread pool."""
+        return await ThreadPoolUtil.run(self.count_all, record_type, dataset=dataset, identity=identity)
+
+    async def count_filter_async(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async version of 'count_filter', the default implementation runs 'count_filter' in a thread pool."""
+        return await ThreadPoolUtil.run(self.count_filter, record_type, filter_obj, dataset=dataset, identity=identity)
+
+    async def save_one_async(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'save_one', the default implementation runs 'save_one' in a thread pool."""
+        return await ThreadPoolUtil.run(self.save_one, record, dataset=dataset, identity=identity)
+
+    async def save_many_async(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'save_many', the default implementation runs 'save_many' in a thread pool."""
+        return await ThreadPoolUtil.run(self.save_many, records, dataset=dataset, identity=identity)
+
+    async def delete_one_async(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'delete_one', the default implementation runs 'delete_one' in a thread pool."""
+        return await ThreadPoolUtil.run(self.delete_one, key_type, key, dataset=dataset, identity=identity)
+
+    async def delete_many_async(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'delete_many', the default implementation runs 'delete_many' in a thread pool."""
+        return await ThreadPoolUtil.run(self.delete_many, keys, dataset=dataset, identity=identity)
+
     @classmethod
     def default(cls) -> Db:
         """Default database is initialized from settings and cannot be modified in code."""
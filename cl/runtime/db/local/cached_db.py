@@ -0,0 +1,344 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Type
+from cl.runtime.db.db import Db
+from cl.runtime.db.local.local_cache import LocalCache
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.dataclasses_extensions import missing
+from cl.runtime.records.key_util import KeyUtil
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_key
+from cl.runtime.schema.index_decl import IndexDecl
+
+_cache_dict: Dict[str, LocalCache] = {}
+"""Dict of LocalCache instances with db_id key stored outside the class to avoid serializing them."""
+
+_expiry_dict: Dict[str, Dict[Tuple, Dict[str | None, float | None]]] = {}
+"""
+Dict with db_id key of expiry times (time.monotonic() or None if the record does not expire) of cached records
+for each key tuple from KeyUtil.get_key_tuple and dataset, used to invalidate a key in all datasets on save or delete.
+"""
+
+_pending_dict: Dict[str, List[Tuple[str | None, str | None, RecordProtocol]]] = {}
+"""Dict with db_id key of records in (dataset, identity, record) format saved in write-behind mode but not flushed."""
+
+_lock_dict: Dict[str, threading.RLock] = {}
+"""Dict with db_id key of locks for reading and modifying the cache, expiry times and pending writes."""
+
+_lock_dict_lock = threading.Lock()
+"""Lock for adding to the lock dictionary from more than one thread."""
+
+
+@dataclass(slots=True, kw_only=True)
+class CachedDb(Db):
+    """
+    Database that wraps another database with an in-process cache of records loaded by key.
+
+    Notes:
+        - Records are cached according to the policies for their key type, other records are not cached
+        - A cached key is invalidated in all datasets when it is saved or deleted through this database
+        - Queries (load_all, load_filter) and operations with identity are not cached
+    """
+
+    base_db: Db = missing()
+    """Database for which this class provides a cache."""
+
+    immutable_types: List[str] | None = None
+    """Names of key types (e.g. 'PromptKey') whose records are cached until saved or deleted through this database."""
+
+    type_ttls: Dict[str, float] | None = None
+    """Seconds a record remains in cache for the specified key type names."""
+
+    default_ttl: float | None = None
+    """Seconds a record remains in cache for key types not specified above, not cached if None."""
+
+    max_entries: int | None = None
+    """Maximum number of records in cache, least recently used records are evicted when exceeded."""
+
+    write_behind: bool = False
+    """If True, saved records are buffered and written to base_db by flush, which is called on context exit."""
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        # Check for an empty key
+        if record_or_key is None:
+            if is_key_optional:
+                return None
+            else:
+                raise UserError(f"Key is None when trying to load record type {record_type.__name__} from DB.")
+
+        # Delegate to load_many
+        result = next(iter(self.load_many(record_type, [record_or_key], dataset=dataset, identity=identity)))
+
+        # Check if the record was not found
+        if not is_record_optional and result is None:
+            raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
+        return result
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        # Row-level security is enforced by base_db, do not cache
+        if identity is not None:
+            self.flush()
+            return self.base_db.load_many(record_type, records_or_keys, dataset=dataset, identity=identity)
+
+        lock = self._get_lock()
+        cache = self._get_cache()
+        expiry_times = self._get_expiry_times()
+        now = time.monotonic()
+
+        # Look up keys in cache, records and None are returned without lookup
+        result = list(records_or_keys)
+        missing_indices = []
+        with lock:
+            for index, key in enumerate(result):
+                if not is_key(key):
+                    continue
+                dataset_expiry_times = expiry_times.get(KeyUtil.get_key_tuple(key), {})
+                if dataset in dataset_expiry_times:
+                    expiry_time = dataset_expiry_times[dataset]
+                    is_expired = expiry_time is not None and expiry_time <= now
+                    record = (
+                        None
+                        if is_expired
+                        else cache.load_one(record_type, key, dataset=dataset, is_record_optional=True)
+                    )
+                    if record is not None:
+                        result[index] = record
+                        continue
+                    # Remove expired or evicted record
+                    self._invalidate(key, [dataset])
+                missing_indices.append(index)
+
+        # Load the remaining keys from base_db, cache the records whose key type has a policy
+        if missing_indices:
+            self.flush()
+            loaded_records = self.base_db.load_many(
+                record_type, [result[index] for index in missing_indices], dataset=dataset
+            )
+            with lock:
+                for index, record in zip(missing_indices, loaded_records):
+                    result[index] = record
+                    if record is not None and (ttl := self._get_ttl(record.get_key_type())) != 0:
+                        cache.save_one(record, dataset=dataset)
+                        expiry_times.setdefault(KeyUtil.get_key_tuple(record), {})[dataset] = (
+                            now + ttl if ttl is not None else None
+                        )
+        return result
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self.flush()
+        return self.base_db.load_all(record_type, dataset=dataset, identity=identity, limit=limit, skip=skip, sort=sort)
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> Iterable[TRecord]:
+        self.flush()
+        return self.base_db.load_filter(
+            record_type, filter_obj, dataset=dataset, identity=identity, limit=limit, skip=skip, sort=sort
+        )
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        self.flush()
+        return self.base_db.count_all(record_type, dataset=dataset, identity=identity)
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        self.flush()
+        return self.base_db.count_filter(record_type, filter_obj, dataset=dataset, identity=identity)
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.save_many([record], dataset=dataset, identity=identity)
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        records = [record for record in records if record is not None]
+
+        # Invalidate before writing so that cache does not return the previous version
+        with self._get_lock():
+            for record in records:
+                self._invalidate(record)
+
+            if self.write_behind:
+                _pending_dict.setdefault(self.db_id, []).extend((dataset, identity, record) for record in records)
+                return
+        self.base_db.save_many(records, dataset=dataset, identity=identity)
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.flush()
+        if key is not None:
+            with self._get_lock():
+                self._invalidate(key)
+        self.base_db.delete_one(key_type, key, dataset=dataset, identity=identity)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.flush()
+        keys = list(keys)
+        with self._get_lock():
+            for key in keys:
+                self._invalidate(key)
+        self.base_db.delete_many(keys, dataset=dataset, identity=identity)
+
+    def delete_all_and_drop_db(self) -> None:
+        # Discard pending writes and cached records before dropping base_db
+        with self._get_lock():
+            _pending_dict.pop(self.db_id, None)
+            self.clear_cache()
+        self.base_db.delete_all_and_drop_db()
+
+    def close_connection(self) -> None:
+        self.flush()
+        self.base_db.close_connection()
+
+    def flush(self) -> None:
+        """Write records saved in write-behind mode to base_db, preserving the order of saves."""
+        # Hold the lock while writing so that other threads do not read from base_db before the writes complete
+        with self._get_lock():
+            if pending := _pending_dict.pop(self.db_id, None):
+                for (dataset, identity), group in groupby(pending, lambda x: (x[0], x[1])):
+                    self.base_db.save_many([record for _, _, record in group], dataset=dataset, identity=identity)
+
+    def clear_cache(self) -> None:
+        """Remove all records from cache."""
+        with self._get_lock():
+            _cache_dict.pop(self.db_id, None)
+            _expiry_dict.pop(self.db_id, None)
+
+    def get_cache(self) -> LocalCache:
+        """Return the cache of this database, use to inspect hit, miss and eviction counters."""
+        return self._get_cache()
+
+    def _get_ttl(self, key_type: Type) -> float | None:
+        """Return seconds a record of the key type remains in cache, None if it does not expire or 0 if not cached."""
+        type_name = key_type.__name__
+        if self.immutable_types is not None and type_name in self.immutable_types:
+            return None
+        elif self.type_ttls is not None and (ttl := self.type_ttls.get(type_name, None)) is not None:
+            return ttl
+        elif self.default_ttl is not None:
+            return self.default_ttl
+        else:
+            return 0
+
+    def _invalidate(self, key: KeyProtocol, datasets: Iterable[str | None] | None = None) -> None:
+        """Remove cached record for the key (or record) in the specified datasets, or in all datasets if None."""
+        key_type = key.get_key_type()
+        expiry_times = self._get_expiry_times()
+        key_tuple = KeyUtil.get_key_tuple(key)
+        if (dataset_expiry_times := expiry_times.get(key_tuple, None)) is None:
+            return
+        cache = self._get_cache()
+        for dataset in list(dataset_expiry_times.keys()) if datasets is None else datasets:
+            if dataset in dataset_expiry_times:
+                del dataset_expiry_times[dataset]
+                cache.delete_one(key_type, key, dataset=dataset)
+        if not dataset_expiry_times:
+            del expiry_times[key_tuple]
+
+    def _get_cache(self) -> LocalCache:
+        """Get cache for this database, created on first access."""
+        if (result := _cache_dict.get(self.db_id, None)) is None:
+            with self._get_lock():
+                result = _cache_dict.setdefault(self.db_id, LocalCache(max_entries=self.max_entries))
+        return result
+
+    def _get_expiry_times(self) -> Dict[Tuple, Dict[str | None, float | None]]:
+        """Get expiry times of cached records for this database."""
+        return _expiry_dict.setdefault(self.db_id, {})
+
+    def _get_lock(self) -> threading.RLock:
+        """Get the lock for the cache, expiry times and pending writes of this database, created on first access."""
+        if (result := _lock_dict.get(self.db_id, None)) is None:
+            with _lock_dict_lock:
+                result = _lock_dict.setdefault(self.db_id, threading.RLock())
+        return result
@@ -13,36 +13,77 @@
 # limitations under the License.
 
 from __future__ import annotations
+import sys
+import threading
 from dataclasses import dataclass
 from dataclasses import field
-from typing import ClassVar
 from typing import Dict
 from typing import Iterable
+from typing import List
+from typing import Tuple
 from typing import Type
 from typing import cast
 from typing_extensions import Self
-from cl.runtime.db.dataset_util import DatasetUtil
+from cl.runtime.db.local.cache_eviction_policy_enum import CacheEvictionPolicyEnum
+from cl.runtime.db.page_util import PageUtil
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.records.key_util import KeyUtil
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
-from cl.runtime.records.protocols import TQuery
-from cl.runtime.serialization.string_serializer import StringSerializer
-
-key_serializer = StringSerializer()
-"""Serializer for keys used in cache lookup."""
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots  # TODO: Move to ClassInfo
 
 _local_cache_instance: LocalCache | None = None
 """Singleton instance is created on first access."""
 
+TEntry = Tuple[str | None, Type, Tuple]
+"""Cache entry identifier in (dataset, key_type, key_tuple) format where key_tuple is from KeyUtil.get_key_tuple."""
+
 
 @dataclass(slots=True, kw_only=True)
 class LocalCache:
-    """In-memory cache for objects without serialization."""
+    """In-memory cache for objects without serialization with optional size limit and eviction."""
+
+    max_entries: int | None = None
+    """Maximum number of records in cache, records are evicted when exceeded (no limit if None)."""
+
+    max_bytes: int | None = None
+    """
+    Approximate maximum size of records in cache in bytes, records are evicted when exceeded (no limit if None).
+    The size of a record includes the record object and its field values but not objects nested in them.
+    """
+
+    eviction_policy: CacheEvictionPolicyEnum = CacheEvictionPolicyEnum.LRU
+    """Policy for selecting the record to evict when max_entries or max_bytes is exceeded."""
+
+    hit_count: int = 0
+    """Number of keys found in cache."""
+
+    miss_count: int = 0
+    """Number of keys not found in cache."""
+
+    eviction_count: int = 0
+    """Number of records evicted from cache to stay within max_entries and max_bytes."""
+
+    byte_count: int = 0
+    """Approximate size of records in cache in bytes, only tracked when max_bytes is set."""
+
+    __cache: Dict[str | None, Dict[Type, Dict[Tuple, RecordProtocol]]] = field(default_factory=lambda: {})
+    """Record instance is stored in cache without serialization in dataset, key type and key tuple dicts."""
+
+    __frequencies: Dict[TEntry, int] = field(default_factory=lambda: {})
+    """Use frequency of each entry, always 1 for the LRU policy."""
+
+    __frequency_buckets: Dict[int, Dict[TEntry, None]] = field(default_factory=lambda: {})
+    """Entries for each use frequency as insertion-ordered dict keys, from the least to the most recently used."""
+
+    __sizes: Dict[TEntry, int] = field(default_factory=lambda: {})
+    """Approximate size of each entry in bytes, only tracked when max_bytes is set."""
 
-    __cache: Dict[KeyProtocol, RecordProtocol] = field(default_factory=lambda: {})
-    """Record instance is stored in cache without serialization."""
+    __lock: threading.RLock = field(default_factory=threading.RLock)
+    """Lock for reading and modifying cache dictionaries and counters from more than one thread."""
 
     def load_one(
         self,
@@ -68,18 +109,21 @@ class LocalCache:
         elif getattr(record_or_key, "get_key_type"):
             # Key, look up the record in cache
             key_type = record_or_key.get_key_type()
-            serialized_key = key_serializer.serialize_key(record_or_key)
+            key_tuple = KeyUtil.get_key_tuple(record_or_key)
 
-            # Try to retrieve dataset dictionary, insert if it does not yet exist
-            dataset_cache = self.__cache.setdefault(dataset, {})
+            with self.__lock:
+                # Look up the record in table dictionary, defaults to None
+                if (table_cache := self.__cache.get(dataset, {}).get(key_type, None)) is not None:
+                    result = table_cache.get(key_tuple, None)
+                else:
+                    result = None
 
-            # Try to retrieve table dictionary
-            if (table_cache := dataset_cache.setdefault(key_type, None)) is not None:
-                # Look up the record, defaults to None
-                result = table_cache.get(serialized_key, None)
-            else:
-                # Return None if not found
-                return None
+                # Update counters and usage
+                if result is not None:
+                    self.hit_count += 1
+                    self._touch((dataset, key_type, key_tuple))
+                else:
+                    self.miss_count += 1
 
             # Check if the record was not found
             if not is_record_optional and result is None:
@@ -97,7 +141,6 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        # TODO: Implement directly for better performance
         result = [
             self.load_one(
                 record_type,
@@ -117,8 +160,15 @@ class LocalCache:
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord | None] | None:
-        raise NotImplementedError()
+        # Only the table for the key type is scanned, records of other types stored in this table are skipped
+        with self.__lock:
+            table_cache = self.__cache.get(dataset, {}).get(record_type.get_key_type(), {})
+            result = [record for record in table_cache.values() if isinstance(record, record_type)]
+        return PageUtil.get_page(result, limit=limit, skip=skip, sort=sort)
 
     def load_filter(
         self,
@@ -127,8 +177,43 @@ class LocalCache:
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord]:
-        raise NotImplementedError()
+        # Match the fields that are set in the filter object
+        filter_fields = [
+            (k, v)
+            for k in _get_class_hierarchy_slots(filter_obj.__class__)
+            if (v := getattr(filter_obj, k)) is not None
+        ]
+        result = [
+            record
+            for record in self.load_all(record_type, dataset=dataset, identity=identity)
+            if all(getattr(record, k, None) == v for k, v in filter_fields)
+        ]
+        return PageUtil.get_page(result, limit=limit, skip=skip, sort=sort)
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        with self.__lock:
+            table_cache = self.__cache.get(dataset, {}).get(record_type.get_key_type(), {})
+            return sum(1 for record in table_cache.values() if isinstance(record, record_type))
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        return len(self.load_filter(record_type, filter_obj, dataset=dataset, identity=identity))
 
     def save_one(
         self,
@@ -141,18 +226,32 @@ class LocalCache:
         if record is None:
             return
 
-        # Try to retrieve dataset dictionary, insert if it does not yet exist
-        dataset_cache = self.__cache.setdefault(dataset, {})
+        with self.__lock:
+            # Try to retrieve dataset dictionary, insert if it does not yet exist
+            dataset_cache = self.__cache.setdefault(dataset, {})
+
+            # Try to retrieve table dictionary using 'key_type' as key, insert if it does not yet exist
+            key_type = record.get_key_type()
+            table_cache = dataset_cache.setdefault(key_type, {})
 
-        # Try to retrieve table dictionary using 'key_type' as key, insert if it does not yet exist
-        key_type = record.get_key_type()
-        table_cache = dataset_cache.setdefault(key_type, {})
+            # Hashable tuple of key field values is used as dictionary key
+            key_tuple = KeyUtil.get_key_tuple(record)
 
-        # Serialize both key and record
-        serialized_key = key_serializer.serialize_key(record)
+            # Add record to cache, overwriting an existing record if present
+            entry = (dataset, key_type, key_tuple)
+            if key_tuple in table_cache:
+                self._touch(entry)
+            else:
+                self.__frequencies[entry] = 1
+                self.__frequency_buckets.setdefault(1, {})[entry] = None
+            table_cache[key_tuple] = record
 
-        # Add record to cache, overwriting an existing record if present
-        table_cache[serialized_key] = record
+            # Track size and evict records if the limits are exceeded
+            if self.max_bytes is not None:
+                size = self._get_size(record)
+                self.byte_count += size - self.__sizes.get(entry, 0)
+                self.__sizes[entry] = size
+            self._evict(entry)
 
     def save_many(
         self,
@@ -162,7 +261,7 @@ class LocalCache:
         identity: str | None = None,
     ) -> None:
         # TODO: Review performance compared to a custom implementation for save_many
-        [self.save_one(x) for x in records]
+        [self.save_one(x, dataset=dataset, identity=identity) for x in records]
 
     def delete_one(
         self,
@@ -172,7 +271,9 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        raise NotImplementedError()
+        if key is not None:
+            with self.__lock:
+                self._remove((dataset, key_type.get_key_type(), KeyUtil.get_key_tuple(key)))
 
     def delete_many(
         self,
@@ -181,8 +282,91 @@ class LocalCache:
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        # Validate the dataset and if necessary convert to delimited string
-        raise NotImplementedError()
+        for key in keys:
+            self.delete_one(key.get_key_type(), key, dataset=dataset, identity=identity)
+
+    def delete_all_and_drop_db(self) -> None:
+        """Remove all records from cache, counters are not reset."""
+        with self.__lock:
+            self.__cache.clear()
+            self.__frequencies.clear()
+            self.__frequency_buckets.clear()
+            self.__sizes.clear()
+            self.byte_count = 0
+
+    def close_connection(self) -> None:
+        """Local cache does not have a connection, do nothing."""
+
+    def get_entry_count(self) -> int:
+        """Return the number of records in cache."""
+        return len(self.__frequencies)
+
+    def reset_counters(self) -> None:
+        """Reset hit, miss and eviction counters."""
+        with self.__lock:
+            self.hit_count = 0
+            self.miss_count = 0
+            self.eviction_count = 0
+
+    def _touch(self, entry: TEntry) -> None:
+        """Record the use of an existing entry."""
+        frequency = self.__frequencies[entry]
+        bucket = self.__frequency_buckets[frequency]
+        del bucket[entry]
+        if self.eviction_policy == CacheEvictionPolicyEnum.LFU:
+            # Move to the bucket for the next frequency
+            if not bucket:
+                del self.__frequency_buckets[frequency]
+            frequency += 1
+            self.__frequencies[entry] = frequency
+            self.__frequency_buckets.setdefault(frequency, {})[entry] = None
+        else:
+            # Move to the end of the same bucket as the most recently used entry
+            bucket[entry] = None
+
+    def _remove(self, entry: TEntry) -> None:
+        """Remove entry from cache if present."""
+        if (frequency := self.__frequencies.pop(entry, None)) is None:
+            return
+        bucket = self.__frequency_buckets[frequency]
+        del bucket[entry]
+        if not bucket:
+            del self.__frequency_buckets[frequency]
+        self.byte_count -= self.__sizes.pop(entry, 0)
+
+        # Remove the record and the table dictionary if empty
+        dataset, key_type, key_tuple = entry
+        dataset_cache = self.__cache[dataset]
+        table_cache = dataset_cache[key_type]
+        del table_cache[key_tuple]
+        if not table_cache:
+            del dataset_cache[key_type]
+
+    def _evict(self, saved_entry: TEntry) -> None:
+        """
+        Evict entries according to eviction_policy until the cache is within max_entries and max_bytes,
+        the entry that has just been saved is not evicted even if it has the lowest use frequency.
+        """
+        while len(self.__frequencies) > 1 and (
+            (self.max_entries is not None and len(self.__frequencies) > self.max_entries)
+            or (self.max_bytes is not None and self.byte_count > self.max_bytes)
+        ):
+            # Evict the first entry in the bucket for the lowest frequency
+            evicted_entry = next(
+                entry
+                for frequency in sorted(self.__frequency_buckets.keys())
+                for entry in self.__frequency_buckets[frequency]
+                if entry != saved_entry
+            )
+            self._remove(evicted_entry)
+            self.eviction_count += 1
+
+    @classmethod
+    def _get_size(cls, record: RecordProtocol) -> int:
+        """Approximate size of the record in bytes including its field values but not objects nested in them."""
+        return sys.getsizeof(record) + sum(
+            sys.getsizeof(getattr(record, k, None)) for k in _get_class_hierarchy_slots(record.__class__)
+        )
 
     @classmethod
     def instance(cls) -> Self:
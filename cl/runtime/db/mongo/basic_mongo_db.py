@@ -13,22 +13,33 @@
 # limitations under the License.
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass
 from itertools import groupby
 from typing import Dict
 from typing import Iterable
+from typing import List
 from typing import Type
 from typing import cast
+from pymongo import ASCENDING
+from pymongo import DESCENDING
 from pymongo import MongoClient
+from pymongo import ReplaceOne
+from pymongo.collection import Collection
 from pymongo.database import Database
 from cl.runtime.context.context import Context
 from cl.runtime.db.db import Db
 from cl.runtime.db.mongo.mongo_filter_serializer import MongoFilterSerializer
+from cl.runtime.db.page_util import PageUtil
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.primitive.list_util import ListUtil
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_key
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.schema.schema import Schema
 from cl.runtime.serialization.dict_serializer import DictSerializer
 from cl.runtime.serialization.string_serializer import StringSerializer
@@ -42,6 +53,7 @@ invalid_db_name_regex = re.compile(f"[{invalid_db_name_symbols}]")
 # TODO: Revise and consider making fields of the database
 # TODO: Review and consider alternative names, e.g. DataSerializer or RecordSerializer
 data_serializer = DictSerializer()
+trusted_data_serializer = DictSerializer(skip_validation=True)
 key_serializer = StringSerializer()
 filter_serializer = MongoFilterSerializer()
 
@@ -51,6 +63,9 @@ _client_dict: Dict[str, MongoClient] = {}
 _db_dict: Dict[str, Database] = {}
 """Dict of database instances with client_uri.database_name key stored outside the class to avoid serializing them."""
 
+_collection_dict: Dict[str, Collection] = {}
+"""Dict of collection instances with client_uri.database_name.collection_name key, added after indexes are created."""
+
 
 @dataclass(slots=True, kw_only=True)
 class BasicMongoDb(Db):
@@ -59,6 +74,12 @@ class BasicMongoDb(Db):
     client_uri: str = "mongodb://localhost:27017/"
     """MongoDB client URI, defaults to mongodb://localhost:27017/"""
 
+    batch_size: int = 1000
+    """Maximum number of keys in a single $in query or records in a single bulk write."""
+
+    fetch_size: int = 1000
+    """Number of documents the cursor fetches from the server per batch when reading query results."""
+
     def load_one(
         self,
         record_type: Type[TRecord],
@@ -86,18 +107,16 @@ class BasicMongoDb(Db):
             if identity is not None:
                 raise RuntimeError("BasicMongo database type does not support row-level security.")
 
-            # Key, get collection name from key type by removing Key suffix if present
+            # Key, get collection for key type
             key_type = record_or_key.get_key_type()
-            collection_name = key_type.__name__  # TODO: Decision on short alias
-            db = self._get_db()
-            collection = db[collection_name]
+            collection = self._get_collection(key_type)
 
             serialized_key = key_serializer.serialize_key(record_or_key)
             serialized_record = collection.find_one({"_key": serialized_key})
             if serialized_record is not None:
                 del serialized_record["_id"]
                 del serialized_record["_key"]
-                result = data_serializer.deserialize_data(serialized_record)
+                result = self._get_load_serializer().deserialize_data(serialized_record)
                 return result
             else:
                 # Check if returning None is allowed
@@ -115,18 +134,45 @@ class BasicMongoDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        # TODO: Implement directly for better performance
-        result = [
-            self.load_one(
-                record_type,
-                x,
-                dataset=dataset,
-                identity=identity,
-                is_key_optional=True,  # TODO: Keep the existing defaults for load_many
-                is_record_optional=True,  # TODO: Keep the existing defaults for load_many
-            )
-            for x in records_or_keys
-        ]
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        result = []
+
+        # Use itertools.groupby to preserve the original order of records_or_keys
+        # Group by key type and then by it is key or record, if records rather than keys return without lookup
+        for key_type, records_or_keys_group in groupby(records_or_keys, lambda x: x.get_key_type() if x else None):
+            # Return None for None
+            if key_type is None:
+                result.extend(records_or_keys_group)
+                continue
+
+            for is_key_group, keys_group in groupby(records_or_keys_group, lambda x: is_key(x)):
+                # Return records without lookup
+                if not is_key_group:
+                    result.extend(keys_group)
+                    continue
+
+                collection = self._get_collection(key_type)
+
+                # Query in chunks to keep the query document well under the BSON size limit
+                for keys_chunk in ListUtil.chunks(keys_group, self.batch_size):
+                    serialized_keys = [key_serializer.serialize_key(key) for key in keys_chunk]
+                    serialized_records = collection.find(
+                        {"_key": {"$in": list(dict.fromkeys(serialized_keys))}},
+                        {"_id": 0},
+                        batch_size=self.fetch_size,
+                    )
+
+                    # Documents are returned in arbitrary order, index them by serialized key
+                    records_dict = {
+                        serialized_record.pop("_key"): self._get_load_serializer().deserialize_data(serialized_record)
+                        for serialized_record in serialized_records
+                    }
+                    result.extend(records_dict.get(serialized_key) for serialized_key in serialized_keys)
         return result
 
     def load_all(
@@ -135,6 +181,9 @@ class BasicMongoDb(Db):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord | None] | None:
         # Confirm dataset and identity are both None
         if dataset is not None:
@@ -142,23 +191,18 @@ class BasicMongoDb(Db):
         if identity is not None:
             raise RuntimeError("BasicMongo database type does not support row-level security.")
 
-        # Key, get collection name from key type by removing Key suffix if present
+        # Get collection for key type
         key_type = record_type.get_key_type()
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type)
 
         subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
-        serialized_records = collection.find({"_type": {"$in": subtype_names}})
-        result = []
-        for serialized_record in serialized_records:
-            del serialized_record["_id"]
-            del serialized_record["_key"]
-            record = data_serializer.deserialize_data(
-                serialized_record
-            )  # TODO: Convert to comprehension for performance
-            result.append(record)
-        return result
+
+        # Exclude _id and _key on the server side and fetch in batches, records are deserialized lazily
+        serialized_records = self._find(
+            collection, {"_type": {"$in": subtype_names}}, limit=limit, skip=skip, sort=sort
+        )
+        serializer = self._get_load_serializer()
+        return (serializer.deserialize_data(serialized_record) for serialized_record in serialized_records)
 
     def load_filter(
         self,
@@ -167,6 +211,9 @@ class BasicMongoDb(Db):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord]:
         # Confirm dataset and identity are both None
         if dataset is not None:
@@ -174,25 +221,51 @@ class BasicMongoDb(Db):
         if identity is not None:
             raise RuntimeError("BasicMongo database type does not support row-level security.")
 
-        # Key, get collection name from key type by removing Key suffix if present
+        # Get collection for key type
         key_type = record_type.get_key_type()
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type)
 
         # Convert filter object to a dictionary
         filter_dict = filter_serializer.serialize_filter(filter_obj)
 
-        serialized_records = collection.find(filter_dict)  # TODO: Filter by derived type
-        result = []
-        for serialized_record in serialized_records:
-            del serialized_record["_id"]
-            del serialized_record["_key"]
-            record = data_serializer.deserialize_data(
-                serialized_record
-            )  # TODO: Convert to comprehension for performance
-            result.append(record)
-        return result
+        # TODO: Filter by derived type
+        serialized_records = self._find(collection, filter_dict, limit=limit, skip=skip, sort=sort)
+        serializer = self._get_load_serializer()
+        return [serializer.deserialize_data(serialized_record) for serialized_record in serialized_records]
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        collection = self._get_collection(record_type.get_key_type())
+        subtype_names = list(t.__name__ for t in Schema.get_type_successors(record_type))
+        return collection.count_documents({"_type": {"$in": subtype_names}})
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        collection = self._get_collection(record_type.get_key_type())
+        return collection.count_documents(filter_serializer.serialize_filter(filter_obj))
 
     def save_one(
         self,
@@ -215,11 +288,9 @@ class BasicMongoDb(Db):
         if identity is not None:
             raise RuntimeError("BasicMongo database type does not support row-level security.")
 
-        # Get collection name from key type by removing Key suffix if present
+        # Get collection for key type
         key_type = record.get_key_type()
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        collection = self._get_collection(key_type)
 
         # Serialize record data and key
         serialized_key = key_serializer.serialize_key(record)
@@ -237,9 +308,33 @@ class BasicMongoDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-        # TODO: Temporary, replace by independent implementation
-        [self.save_one(x, dataset=dataset, identity=identity) for x in records]
-        return
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        # Group records by key type, call on_save if defined
+        grouped_records = defaultdict(list)
+        for record in records:
+            if record is None:
+                continue
+            if hasattr(record, "on_save"):
+                record.on_save()  # TODO: Refactor on_save
+            grouped_records[record.get_key_type()].append(record)
+
+        for key_type, records_group in grouped_records.items():
+            collection = self._get_collection(key_type)
+
+            # Replace the entire document, unordered bulk write lets the server apply the batch in parallel
+            for records_chunk in ListUtil.chunks(records_group, self.batch_size):
+                requests = []
+                for record in records_chunk:
+                    serialized_key = key_serializer.serialize_key(record)
+                    serialized_record = data_serializer.serialize_data(record)
+                    serialized_record["_key"] = serialized_key
+                    requests.append(ReplaceOne({"_key": serialized_key}, serialized_record, upsert=True))
+                collection.bulk_write(requests, ordered=False)
 
     def delete_one(
         self,
@@ -255,10 +350,8 @@ class BasicMongoDb(Db):
         if identity is not None:
             raise RuntimeError("BasicMongo database type does not support row-level security.")
 
-        # Get collection name from key type by removing Key suffix if present
-        collection_name = key_type.__name__  # TODO: Decision on short alias
-        db = self._get_db()
-        collection = db[collection_name]
+        # Get collection for key type
+        collection = self._get_collection(key_type)
 
         serialized_key = key_serializer.serialize_key(key)
 
@@ -272,8 +365,21 @@ class BasicMongoDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
+        # Confirm dataset and identity are both None
+        if dataset is not None:
+            raise RuntimeError("BasicMongo database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("BasicMongo database type does not support row-level security.")
+
+        # Group serialized keys by key type
+        grouped_keys = defaultdict(list)
         for key in keys:
-            self.delete_one(type(key), key, dataset=dataset, identity=identity)
+            grouped_keys[key.get_key_type()].append(key_serializer.serialize_key(key))
+
+        for key_type, serialized_keys in grouped_keys.items():
+            collection = self._get_collection(key_type)
+            for serialized_keys_chunk in ListUtil.chunks(serialized_keys, self.batch_size):
+                collection.delete_many({"_key": {"$in": list(serialized_keys_chunk)}})
 
     def delete_all_and_drop_db(self) -> None:
         # Check that db_id and db_name both match temp_db_prefix
@@ -286,12 +392,26 @@ class BasicMongoDb(Db):
         client = self._get_client()
         client.drop_database(db_name)
 
+        # Remove collections of the dropped database so their indexes are created again on next access
+        self._remove_collections(f"{self.client_uri}{db_name}.")
+
     def close_connection(self) -> None:
         if (client := _client_dict.get(self.client_uri, None)) is not None:
             # Close connection
             client.close()
             # Remove client from dictionary so connection can be reopened on next access
             del _client_dict[self.client_uri]
+            self._remove_collections(self.client_uri)
+
+    @classmethod
+    def _remove_collections(cls, collection_key_prefix: str) -> None:
+        """Remove collections whose key starts with the prefix from the collection dictionary."""
+        for collection_key in [x for x in _collection_dict.keys() if x.startswith(collection_key_prefix)]:
+            del _collection_dict[collection_key]
+
+    def _get_load_serializer(self) -> DictSerializer:
+        """Serializer for loaded records, skips validation unless validate_on_load is set."""
+        return data_serializer if self.validate_on_load else trusted_data_serializer
 
     def _get_client(self) -> MongoClient:
         """Get PyMongo client object."""
@@ -317,6 +437,62 @@ class BasicMongoDb(Db):
             _db_dict[db_key] = result
         return result
 
+    def _find(
+        self,
+        collection: Collection,
+        query: Dict,
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> Iterable[Dict]:
+        """
+        Return documents matching the query without _id and _key fields, sorted and paged on
+        the server side. When limit or skip is specified, _key is used as the last sort field so that pages
+        are stable between calls.
+        """
+        PageUtil.check_page_args(limit=limit, skip=skip)
+        cursor = collection.find(query, {"_id": 0, "_key": 0}, batch_size=self.fetch_size)
+        is_paged = limit is not None or skip is not None
+        sort_elements = [
+            (element.name, DESCENDING if element.direction == IndexSortOrderEnum.DESCENDING else ASCENDING)
+            for element in (sort or ())
+        ]
+        if is_paged:
+            sort_elements.append(("_key", ASCENDING))
+        if sort_elements:
+            cursor = cursor.sort(sort_elements)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit is not None:
+            # Zero limit means no limit in MongoDB, return no documents instead
+            if limit == 0:
+                return []
+            cursor = cursor.limit(limit)
+        return cursor
+
+    def _get_collection(self, key_type: Type) -> Collection:
+        """Get PyMongo collection object for the key type, indexes are created on first access."""
+        collection_name = key_type.__name__  # TODO: Decision on short alias
+        collection_key = f"{self.client_uri}{self._get_db_name()}.{collection_name}"
+        if (result := _collection_dict.get(collection_key, None)) is None:
+            result = self._get_db()[collection_name]
+            self._create_indexes(result, key_type)
+            _collection_dict[collection_key] = result
+        return result
+
+    @classmethod
+    def _create_indexes(cls, collection: Collection, key_type: Type) -> None:
+        """Create indexes on _key, _type and those declared for the key type if they do not exist."""
+        collection.create_index("_key", unique=True)
+        collection.create_index("_type")
+        for index_decl in Schema.get_type_indexes(key_type):
+            index_elements = [
+                (element.name, DESCENDING if element.direction == IndexSortOrderEnum.DESCENDING else ASCENDING)
+                for element in index_decl.elements
+            ]
+            collection.create_index(index_elements, name=index_decl.name)
+
     def _get_db_name(self) -> str:
         """Database is from db_id, check validity before returning."""
         result = self.db_id
@@ -0,0 +1,59 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+
+
+class PageUtil:
+    """Utilities for sorting and paging query results in memory."""
+
+    @classmethod
+    def check_page_args(cls, *, limit: int | None = None, skip: int | None = None) -> None:
+        """Error if limit or skip is negative, limit of None means no limit and limit of zero means no records."""
+        if limit is not None and limit < 0:
+            raise RuntimeError(f"Negative limit {limit} is not allowed, use None for no limit.")
+        if skip is not None and skip < 0:
+            raise RuntimeError(f"Negative skip {skip} is not allowed.")
+
+    @classmethod
+    def get_page(
+        cls,
+        records: List[RecordProtocol],
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[RecordProtocol]:
+        """
+        Sort records in place by sort fields with None values last, then return the specified page.
+        Use for databases that do not support sorting and paging on the server side.
+        """
+        cls.check_page_args(limit=limit, skip=skip)
+
+        # Stable sort by each field starting from the lowest priority, records keep their input order otherwise
+        for sort_element in reversed(sort or ()):
+            # The first element of the sort key places None values last in both directions
+            descending = sort_element.direction == IndexSortOrderEnum.DESCENDING
+            records.sort(
+                key=lambda x: (((v := getattr(x, sort_element.name, None)) is None) != descending, v),
+                reverse=descending,
+            )
+        if skip or limit is not None:
+            start = skip or 0
+            return records[start : start + limit if limit is not None else None]
+        else:
+            return records
@@ -13,12 +13,14 @@
 # limitations under the License.
 
 from typing import Iterable
+from typing import List
 from typing import Protocol
 from typing import Type
 from typing import TypeVar
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import TQuery
+from cl.runtime.schema.index_decl import IndexDecl
 
 TRecord = TypeVar("TRecord")  # TODO: Remove duplicate TKey definition
 TKey = TypeVar("TKey")  # TODO: Remove duplicate TKey definition
@@ -74,6 +76,9 @@ class DbProtocol(Protocol):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord | None] | None:
         """
         Load all records of the specified type and its subtypes (excludes other types in the same DB table).
@@ -82,6 +87,9 @@ class DbProtocol(Protocol):
             record_type: Type of the records to load
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
+            limit: If specified, return at most this number of records (no limit if None, error if negative)
+            skip: If specified, skip this number of records from the beginning of the sorted result (error if negative)
+            sort: Fields to sort by in the order of priority, sorted by key fields if not specified and paging is used
         """
 
     def load_filter(
@@ -91,6 +99,9 @@ class DbProtocol(Protocol):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord]:
         """
         Load records where values of those fields that are set in the filter match the filter.
@@ -100,6 +111,43 @@ class DbProtocol(Protocol):
             filter_obj: Instance of 'record_type' whose fields are used for the query
             dataset: If specified, append to the root dataset of the database
             identity: Identity token for database access and row-level security
+            limit: If specified, return at most this number of records (no limit if None, error if negative)
+            skip: If specified, skip this number of records from the beginning of the sorted result (error if negative)
+            sort: Fields to sort by in the order of priority, sorted by key fields if not specified and paging is used
+        """
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records of the specified type and its subtypes.
+
+        Args:
+            record_type: Type of the records to count
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
+        """
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """
+        Return the number of records that match the filter.
+
+        Args:
+            record_type: Type of the records to count
+            filter_obj: Instance of 'record_type' whose fields are used for the query
+            dataset: If specified, append to the root dataset of the database
+            identity: Identity token for database access and row-level security
         """
 
     def save_one(
@@ -173,3 +221,110 @@ class DbProtocol(Protocol):
         unless stopped due to either db_id or database name not matching 'temp_db_prefix'
         specified in Dynaconf database settings ('DbSettings' class).
         """
+
+
+class AsyncDbProtocol(Protocol):
+    """Async counterpart of DbProtocol for use from asyncio code without blocking the event loop."""
+
+    async def load_one_async(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        """Async version of 'load_one' with the same arguments."""
+
+    async def load_many_async(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async version of 'load_many' with the same arguments, iterable results are returned as a list."""
+
+    async def load_all_async(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[TRecord | None] | None:
+        """Async version of 'load_all' with the same arguments, iterable results are returned as a list."""
+
+    async def load_filter_async(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> List[TRecord]:
+        """Async version of 'load_filter' with the same arguments, iterable results are returned as a list."""
+
+    async def count_all_async(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async version of 'count_all' with the same arguments."""
+
+    async def count_filter_async(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        """Async version of 'count_filter' with the same arguments."""
+
+    async def save_one_async(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'save_one' with the same arguments."""
+
+    async def save_many_async(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'save_many' with the same arguments."""
+
+    async def delete_one_async(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'delete_one' with the same arguments."""
+
+    async def delete_many_async(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        """Async version of 'delete_many' with the same arguments."""
@@ -0,0 +1,368 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Type
+from redis import Redis
+from cl.runtime.context.context import Context
+from cl.runtime.db.db import Db
+from cl.runtime.db.page_util import PageUtil
+from cl.runtime.db.protocols import TKey
+from cl.runtime.db.protocols import TRecord
+from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.primitive.list_util import ListUtil
+from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.records.protocols import RecordProtocol
+from cl.runtime.records.protocols import is_key
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.schema import Schema
+from cl.runtime.serialization.binary_serializer import BinarySerializer
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots  # TODO: Move to ClassInfo
+from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
+from cl.runtime.serialization.string_serializer import StringSerializer
+from cl.runtime.settings.context_settings import ContextSettings
+
+data_serializer = FlatDictSerializer()
+trusted_data_serializer = FlatDictSerializer(skip_validation=True)
+binary_serializer = BinarySerializer()
+trusted_binary_serializer = BinarySerializer(skip_validation=True)
+key_serializer = StringSerializer()
+
+_client_dict: Dict[str, Redis] = {}
+"""Dict of Redis client instances with client_uri key stored outside the class to avoid serializing them."""
+
+
+@dataclass(slots=True, kw_only=True)
+class RedisDb(Db):
+    """
+    Redis key-value database without datasets for low-latency storage shared between processes.
+
+    Notes:
+        - Each record is stored as a JSON or MessagePack blob under '{db_id}:{key_type}:{serialized_key}'
+        - Records in both formats can be loaded irrespective of data_format, the format is detected from the blob
+        - Serialized keys of each record type are stored in a set used by load_all and load_filter
+        - Queries are filtered, sorted and paged in memory after loading all records of the type
+    """
+
+    client_uri: str = "redis://localhost:6379/0"
+    """Redis client URI, defaults to redis://localhost:6379/0"""
+
+    batch_size: int = 1000
+    """Maximum number of keys in a single MGET command or records in a single pipeline."""
+
+    type_ttls: Dict[str, float] | None = None
+    """Seconds after which records expire for the specified key type names."""
+
+    default_ttl: float | None = None
+    """Seconds after which records expire for key types not specified above, records do not expire if None."""
+
+    data_format: str | None = None
+    """Format of saved records, 'json' or 'binary' (MessagePack), ContextSettings.db_data_format if not specified."""
+
+    def load_one(
+        self,
+        record_type: Type[TRecord],
+        record_or_key: TRecord | KeyProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        is_key_optional: bool = False,
+        is_record_optional: bool = False,
+    ) -> TRecord | None:
+        # Check for an empty key
+        if record_or_key is None:
+            if is_key_optional:
+                return None
+            else:
+                raise UserError(f"Key is None when trying to load record type {record_type.__name__} from DB.")
+
+        # Delegate to load_many
+        result = self.load_many(record_type, [record_or_key], dataset=dataset, identity=identity)[0]
+
+        # Check if the record was not found
+        if not is_record_optional and result is None:
+            raise UserError(f"{record_type.__name__} record is not found for key {record_or_key}")
+        return result
+
+    def load_many(
+        self,
+        record_type: Type[TRecord],
+        records_or_keys: Iterable[TRecord | KeyProtocol | tuple | str | None] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        result = []
+
+        # Use itertools.groupby to preserve the original order of records_or_keys
+        # Group by key type and then by it is key or record, if records rather than keys return without lookup
+        for key_type, records_or_keys_group in groupby(records_or_keys, lambda x: x.get_key_type() if x else None):
+            # Return None for None
+            if key_type is None:
+                result.extend(records_or_keys_group)
+                continue
+
+            for is_key_group, keys_group in groupby(records_or_keys_group, lambda x: is_key(x)):
+                # Return records without lookup
+                if not is_key_group:
+                    result.extend(keys_group)
+                    continue
+
+                # Values are returned in the order of keys with None for missing keys
+                record_keys = [self._get_record_key(key_type, key_serializer.serialize_key(key)) for key in keys_group]
+                result.extend(self._get_records(record_keys))
+        return result
+
+    def load_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> Iterable[TRecord | None] | None:
+        self._check_dataset_and_identity(dataset, identity)
+        result = self._load_type(record_type)
+        return PageUtil.get_page(result, limit=limit, skip=skip, sort=sort)
+
+    def load_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> Iterable[TRecord]:
+        self._check_dataset_and_identity(dataset, identity)
+
+        # Match the fields that are set in the filter object
+        filter_fields = [
+            (k, v)
+            for k in _get_class_hierarchy_slots(filter_obj.__class__)
+            if (v := getattr(filter_obj, k)) is not None
+        ]
+        result = [
+            record
+            for record in self._load_type(record_type)
+            if all(getattr(record, k, None) == v for k, v in filter_fields)
+        ]
+        return PageUtil.get_page(result, limit=limit, skip=skip, sort=sort)
+
+    def save_one(
+        self,
+        record: RecordProtocol | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self.save_many([record], dataset=dataset, identity=identity)
+
+    def save_many(
+        self,
+        records: Iterable[RecordProtocol],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        # Call on_save if defined
+        records = [record for record in records if record is not None]
+        for record in records:
+            if hasattr(record, "on_save"):
+                record.on_save()  # TODO: Refactor on_save
+
+        client = self._get_client()
+        data_format = self._get_data_format()
+        for records_chunk in ListUtil.chunks(records, self.batch_size):
+            # Send the entire chunk in a single round trip
+            pipeline = client.pipeline(transaction=False)
+            values_without_ttl = {}
+            type_keys = defaultdict(list)
+            for record in records_chunk:
+                key_type = record.get_key_type()
+                serialized_key = key_serializer.serialize_key(record)
+                record_key = self._get_record_key(key_type, serialized_key)
+                if data_format == "binary":
+                    value = binary_serializer.serialize_to_bytes(record)
+                else:
+                    value = data_serializer.serialize_to_json(record)
+                if (ttl := self._get_ttl(key_type)) is None:
+                    values_without_ttl[record_key] = value
+                else:
+                    pipeline.set(record_key, value, px=int(ttl * 1000))
+                type_keys[self._get_type_set_key(type(record).__name__)].append(serialized_key)
+            if values_without_ttl:
+                pipeline.mset(values_without_ttl)
+            for type_set_key, serialized_keys in type_keys.items():
+                pipeline.sadd(type_set_key, *serialized_keys)
+            pipeline.execute()
+
+    def delete_one(
+        self,
+        key_type: Type[TKey],
+        key: TKey | KeyProtocol | tuple | str | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        if key is not None:
+            self.delete_many([key], dataset=dataset, identity=identity)
+
+    def delete_many(
+        self,
+        keys: Iterable[KeyProtocol] | None,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> None:
+        self._check_dataset_and_identity(dataset, identity)
+
+        # Keys remain in type sets until the next load_all or load_filter for the type removes them
+        record_keys = [self._get_record_key(key.get_key_type(), key_serializer.serialize_key(key)) for key in keys]
+        client = self._get_client()
+        for record_keys_chunk in ListUtil.chunks(record_keys, self.batch_size):
+            client.delete(*record_keys_chunk)
+
+    def delete_all_and_drop_db(self) -> None:
+        # Check that db_id matches temp_db_prefix
+        Context.error_if_not_temp_db(self.db_id)
+
+        # Delete all keys of this database without possibility of recovery, this
+        # relies on the temp_db_prefix check above to prevent unintended use
+        client = self._get_client()
+        pattern = f"{self._escape_pattern(self.db_id)}:*"
+        for keys_chunk in ListUtil.chunks(client.scan_iter(match=pattern, count=self.batch_size), self.batch_size):
+            client.delete(*keys_chunk)
+
+    def close_connection(self) -> None:
+        if (client := _client_dict.get(self.client_uri, None)) is not None:
+            # Close connection
+            client.close()
+            # Remove client from dictionary so connection can be reopened on next access
+            del _client_dict[self.client_uri]
+
+    def _load_type(self, record_type: Type[TRecord]) -> List[TRecord]:
+        """Load records of record_type and its subtypes sorted by serialized key, remove stale keys from type sets."""
+        client = self._get_client()
+        key_type = record_type.get_key_type()
+        type_names = [t.__name__ for t in Schema.get_type_successors(record_type)]
+        type_set_keys = [self._get_type_set_key(type_name) for type_name in type_names]
+
+        # Sort serialized keys so that the order is the same between calls
+        serialized_keys_by_type = zip(type_names, self._execute_for_each(client, "smembers", type_set_keys))
+        set_items = sorted(
+            (serialized_key.decode(), type_name)
+            for type_name, serialized_keys in serialized_keys_by_type
+            for serialized_key in serialized_keys
+        )
+        records = self._get_records([self._get_record_key(key_type, serialized_key) for serialized_key, _ in set_items])
+
+        # Remove keys of records that were deleted, expired or saved with another type from type sets
+        pipeline = client.pipeline(transaction=False)
+        result = []
+        for (serialized_key, type_name), record in zip(set_items, records):
+            if record is not None and type(record).__name__ == type_name:
+                result.append(record)
+            else:
+                pipeline.srem(self._get_type_set_key(type_name), serialized_key)
+        if len(pipeline):
+            pipeline.execute()
+        return result
+
+    def _get_records(self, record_keys: List[str]) -> List[RecordProtocol | None]:
+        """Get records for the list of Redis keys in a single round trip, None for missing keys."""
+        client = self._get_client()
+        pipeline = client.pipeline(transaction=False)
+        for record_keys_chunk in ListUtil.chunks(record_keys, self.batch_size):
+            pipeline.mget(record_keys_chunk)
+        return [
+            self._deserialize(value) if value is not None else None for values in pipeline.execute() for value in values
+        ]
+
+    def _deserialize(self, value: bytes) -> RecordProtocol:
+        """Deserialize JSON or MessagePack blob, JSON blob is a dict that starts from '{'."""
+        if value[:1] == b"{":
+            serializer = data_serializer if self.validate_on_load else trusted_data_serializer
+            return serializer.deserialize_from_json(value)
+        else:
+            serializer = binary_serializer if self.validate_on_load else trusted_binary_serializer
+            return serializer.deserialize_from_bytes(value)
+
+    @classmethod
+    def _execute_for_each(cls, client: Redis, command: str, keys: List[str]) -> List:
+        """Execute the command for each key in a single round trip and return the list of results."""
+        pipeline = client.pipeline(transaction=False)
+        for key in keys:
+            getattr(pipeline, command)(key)
+        return pipeline.execute()
+
+    def _get_record_key(self, key_type: Type, serialized_key: str) -> str:
+        """Redis key for the record with the specified key type and serialized key."""
+        return f"{self.db_id}:{key_type.__name__}:{serialized_key}"  # TODO: Decision on short alias
+
+    def _get_type_set_key(self, type_name: str) -> str:
+        """Redis key for the set of serialized keys of records with exactly this type (excludes subtypes)."""
+        return f"{self.db_id}:_types:{type_name}"
+
+    def _get_data_format(self) -> str:
+        """Format of saved records, 'json' or 'binary'."""
+        data_format = self.data_format if self.data_format is not None else ContextSettings.instance().db_data_format
+        if data_format not in ("json", "binary"):
+            raise RuntimeError(f"{type(self).__name__} field 'data_format' must be 'json' or 'binary'.")
+        return data_format
+
+    def _get_ttl(self, key_type: Type) -> float | None:
+        """Seconds after which records of the key type expire, or None if they do not expire."""
+        if self.type_ttls is not None and (ttl := self.type_ttls.get(key_type.__name__, None)) is not None:
+            return ttl
+        else:
+            return self.default_ttl
+
+    def _get_client(self) -> Redis:
+        """Get Redis client object."""
+        if (client := _client_dict.get(self.client_uri, None)) is None:
+            # Create if it does not exist
+            client = self._create_client()
+            _client_dict[self.client_uri] = client
+        return client
+
+    def _create_client(self) -> Redis:
+        """Create a new Redis client object for client_uri."""
+        return Redis.from_url(self.client_uri)
+
+    @classmethod
+    def _escape_pattern(cls, value: str) -> str:
+        """Escape characters that have special meaning in Redis glob-style patterns."""
+        return "".join(f"\\{c}" if c in "*?[]\\" else c for c in value)
+
+    @classmethod
+    def _check_dataset_and_identity(cls, dataset: str | None, identity: str | None) -> None:
+        """Error message if dataset or identity is specified."""
+        if dataset is not None:
+            raise RuntimeError("Redis database type does not support datasets.")
+        if identity is not None:
+            raise RuntimeError("Redis database type does not support row-level security.")
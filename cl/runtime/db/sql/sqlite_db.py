@@ -14,33 +14,56 @@
 
 import os
 import sqlite3
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
 from itertools import groupby
 from typing import Any
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Tuple
 from typing import Type
 from cl.runtime.context.context import Context
+from cl.runtime.db.dataset_util import DatasetUtil
 from cl.runtime.db.db import Db
+from cl.runtime.db.page_util import PageUtil
 from cl.runtime.db.protocols import TKey
 from cl.runtime.db.protocols import TRecord
 from cl.runtime.db.sql.sqlite_schema_manager import SqliteSchemaManager
+from cl.runtime.db.sql.sqlite_schema_manager import dataset_column
 from cl.runtime.file.file_util import FileUtil
 from cl.runtime.log.exceptions.user_error import UserError
+from cl.runtime.primitive.list_util import ListUtil
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.records.protocols import RecordProtocol
 from cl.runtime.records.protocols import is_key
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.schema.schema import Schema
+from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots  # TODO: Move to ClassInfo
 from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
 from cl.runtime.settings.project_settings import ProjectSettings
 
-_connection_dict: Dict[str, sqlite3.Connection] = {}
-"""Dict of Connection instances with db_id key stored outside the class to avoid serialization."""
+_connection_dict: Dict[Tuple, sqlite3.Connection] = {}
+"""
+Dict of Connection instances stored outside the class to avoid serialization, the key is (db_id,)
+or (db_id, process_id, thread_id) when SqliteDb.pooled is True.
+"""
 
-_schema_manager_dict: Dict[str, SqliteSchemaManager] = {}
-"""Dict of SqliteSchemaManager instances with db_id key key stored outside the class to avoid serialization."""
+_schema_manager_dict: Dict[Tuple, SqliteSchemaManager] = {}
+"""Dict of SqliteSchemaManager instances with the same key as the connection they use."""
+
+_lock_dict: Dict[Tuple, threading.RLock] = {}
+"""
+Dict of locks with the same key as the connection they protect, a connection shared by more than one thread
+(when SqliteDb.pooled is False) is used by one transaction or query at a time.
+"""
+
+_connection_lock = threading.Lock()
+"""Lock for modifying the connection, schema manager and lock dictionaries from more than one thread."""
 
 
 def dict_factory(cursor, row):
@@ -51,47 +74,299 @@ def dict_factory(cursor, row):
 
 @dataclass(slots=True, kw_only=True)
 class SqliteDb(Db):
-    """Sqlite database without dataset and mile wide table for inheritance."""
+    """
+    Sqlite database with mile wide table for inheritance and hierarchical dataset lookup.
+
+    Each row stores its dataset, a record saved to a dataset is visible in that dataset and its descendants
+    unless a record with the same key is saved to a dataset closer to the one being queried.
+    """
+
+    batch_size: int = 1000
+    """Maximum number of records serialized and passed to a single executemany call in save_many."""
+
+    fetch_size: int = 1000
+    """Number of rows fetched from the cursor at a time when reading query results."""
+
+    pooled: bool = False
+    """
+    If True, open a separate connection for each process and thread in WAL journal mode and apply the
+    pragmas below, so that reads run concurrently with a writer. Otherwise one connection is shared
+    by all threads, which use it for one transaction or query at a time.
+    """
+
+    busy_timeout: float = 5.0
+    """Seconds to wait for a lock held by another connection before raising 'database is locked' error."""
+
+    synchronous: str | None = "NORMAL"
+    """Value of 'PRAGMA synchronous' for pooled connections (NORMAL is safe in WAL mode), None to keep default."""
 
-    def batch_size(self) -> int:
-        pass
+    cache_size: int | None = -65536
+    """Value of 'PRAGMA cache_size' for pooled connections (negative value is in KiB), None to keep default."""
+
+    mmap_size: int | None = 268435456
+    """Value of 'PRAGMA mmap_size' for pooled connections in bytes, None to keep default."""
+
+    variable_limit: int = 999
+    """
+    Maximum number of parameters in a single SQL statement, queries with more keys are split into chunks.
+    The default is the SQLITE_MAX_VARIABLE_NUMBER of SQLite versions prior to 3.32.0.
+    """
+
+    @classmethod
+    def _get_keys_in_condition(cls, key_columns: Tuple[str, ...], keys_len: int) -> str | None:
+        """
+        Return "(key_column1, ...) IN ((value1_for_column1, ...), (value2_for_column1, ...), ...)" condition
+        with placeholders for values, or None if there are no key columns.
+        """
+        if key_columns:
+            value_places = ", ".join([f'({", ".join(["?"] * len(key_columns))})' for _ in range(keys_len)])
+            key_column_str = ", ".join([f'"{key_column}"' for key_column in key_columns])
+            return f"({key_column_str}) IN ({value_places})"
+        else:
+            return None
 
     @classmethod
-    def _add_where_keys_in_clause(
+    def _serialize_key_tuple(
         cls,
-        sql_statement: str,
+        key: KeyProtocol,
         key_fields: Tuple[str, ...],
-        columns_mapping: Dict[str, str],
-        keys_len: int,
-    ) -> str:
+        serializer,
+    ) -> Tuple[Any, ...]:
         """
-        Add "WHERE (key_field1, ...) IN ((value1_for_field1, ...), (value2_for_field1, ...), ...)" clause to
-        sql_statement.
+        Serialize key fields of a single key into a tuple of column values in the order of key_fields.
+        The tuple is hashable and matches the values of key columns in the rows returned by the database.
         """
+        return tuple(serializer.serialize_data(getattr(key, key_field)) for key_field in key_fields)
 
-        # if key fields isn't empty add WHERE clause
-        if key_fields:
-            value_places = ", ".join([f'({", ".join(["?"] * len(key_fields))})' for _ in range(keys_len)])
-            key_column_str = ", ".join([f'"{columns_mapping[key]}"' for key in key_fields])
+    @classmethod
+    def _serialize_filter(cls, filter_obj: Any, serializer) -> Dict[str, Any]:
+        """
+        Serialize fields that are set in the filter object to column values in the same format as save_many,
+        without invoking init or validation because filter objects usually do not have all required fields.
+        """
+        serialized_fields = {
+            k: v if v.__class__.__name__ in DictSerializer.primitive_type_names else serializer.serialize_data(v)
+            for k in _get_class_hierarchy_slots(filter_obj.__class__)
+            if (v := getattr(filter_obj, k)) is not None
+        }
+        # Exclude fields such as empty lists which serialize to None
+        return {k: v for k, v in serialized_fields.items() if v is not None}
 
-            # add WHERE clause to sql_statement
-            sql_statement += f" WHERE ({key_column_str}) IN ({value_places})"
+    def _read_records(
+        self,
+        cursor: sqlite3.Cursor,
+        reversed_columns_mapping: Dict[str, str],
+        serializer,
+    ) -> Iterator[RecordProtocol]:
+        """Fetch rows of an executed query in batches of fetch_size and deserialize them one at a time."""
+        lock = self._get_lock()
+        while True:
+            # Fetch under the lock but deserialize and yield outside of it so that the caller does not hold the lock
+            with lock:
+                rows = cursor.fetchmany(self.fetch_size)
+            if not rows:
+                break
+            for data in rows:
+                yield serializer.deserialize_data(self._row_to_fields(data, reversed_columns_mapping))
 
-        return sql_statement
+    @classmethod
+    def _row_to_fields(cls, data: Dict[str, Any], reversed_columns_mapping: Dict[str, str]) -> Dict[str, Any]:
+        """Convert row to a dict of field values, skip NULL values and columns such as dataset that are not fields."""
+        # TODO (Roman): select only needed columns on db side.
+        return {
+            field_name: v
+            for k, v in data.items()
+            if v is not None and (field_name := reversed_columns_mapping.get(k, None)) is not None
+        }
 
     @classmethod
-    def _serialize_keys_to_flat_tuple(
+    def _select_in_dataset(
         cls,
-        keys: Iterable[KeyProtocol],
-        key_fields: Tuple[str, ...],
-        serializer,
-    ) -> Tuple[Any, ...]:
+        table_name: str,
+        key_columns: Tuple[str, ...],
+        lookup_list: List[str],
+        *,
+        key_where: str | None = None,
+        key_values: Iterable[Any] = (),
+        where: str | None = None,
+        values: Iterable[Any] = (),
+    ) -> Tuple[str, List[Any]]:
         """
-        Sequentially serialize key fields for each key in keys into a flat tuple of values.
-        Expected all keys are of the same type for which key fields are specified.
+        Return SELECT statement without the terminating semicolon and its values for the rows visible
+        in the first dataset of lookup_list.
+
+        For each key, only the row from the dataset that comes first in lookup_list is selected in a single query
+        using ROW_NUMBER() window partitioned by key columns. Conditions in key_where depend only on key columns
+        and are applied before the lookup, conditions in where are applied to the selected rows so that a record
+        is not taken from a parent dataset when the nearer record does not match them.
         """
+        if len(lookup_list) == 1:
+            # Root dataset has no parents, select directly
+            where_str = " AND ".join([f'"{dataset_column}" = ?', *filter(None, [key_where, where])])
+            sql_statement = f'SELECT * FROM "{table_name}" WHERE {where_str}'
+            return sql_statement, [*lookup_list, *key_values, *values]
+
+        # Rank rows with the same key by the position of their dataset in the lookup list
+        key_columns_str = ", ".join(f'"{key_column}"' for key_column in key_columns)
+        partition_str = f"PARTITION BY {key_columns_str} " if key_columns else ""
+        rank_cases = " ".join(f"WHEN ? THEN {i}" for i in range(len(lookup_list)))
+        lookup_placeholders = ", ".join(["?"] * len(lookup_list))
+        inner_where_str = " AND ".join([f'"{dataset_column}" IN ({lookup_placeholders})', *filter(None, [key_where])])
+        outer_where_str = " AND ".join(['"_rank" = 1', *filter(None, [where])])
+        sql_statement = (
+            f'SELECT * FROM (SELECT *, ROW_NUMBER() OVER ({partition_str}ORDER BY CASE "{dataset_column}" '
+            f'{rank_cases} END) AS "_rank" FROM "{table_name}" WHERE {inner_where_str}) WHERE {outer_where_str}'
+        )
+        return sql_statement, [*lookup_list, *lookup_list, *key_values, *values]
 
-        return tuple(serializer.serialize_data(getattr(key, key_field)) for key in keys for key_field in key_fields)
+    @classmethod
+    def _get_page_clause(
+        cls,
+        columns_mapping: Dict[str, str],
+        key_columns: Tuple[str, ...],
+        *,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Return ORDER BY, LIMIT and OFFSET clauses and their values for a SELECT statement.
+
+        When limit or skip is specified without sort, the rows are sorted by key columns so that pages
+        are stable between calls. Sort elements after the first are tie-breakers in the order specified.
+        """
+        PageUtil.check_page_args(limit=limit, skip=skip)
+        is_paged = limit is not None or skip is not None
+        if sort:
+            order_elements = []
+            for sort_element in sort:
+                if (column := columns_mapping.get(sort_element.name, None)) is None:
+                    raise RuntimeError(f"Sort field '{sort_element.name}' is not stored in the database table.")
+                direction = "DESC" if sort_element.direction == IndexSortOrderEnum.DESCENDING else "ASC"
+                order_elements.append(f'"{column}" {direction}')
+            # Key columns make the order deterministic for rows with the same values of sort fields
+            if is_paged:
+                order_elements.extend(f'"{key_column}" ASC' for key_column in key_columns)
+        elif is_paged:
+            order_elements = [f'"{key_column}" ASC' for key_column in key_columns]
+        else:
+            order_elements = []
+
+        clauses = []
+        clause_values = []
+        if order_elements:
+            clauses.append(f"ORDER BY {', '.join(order_elements)}")
+        if is_paged:
+            # SQLite requires LIMIT before OFFSET, limit of None is passed as -1 which means no limit in SQLite
+            clauses.append("LIMIT ? OFFSET ?")
+            clause_values.extend([limit if limit is not None else -1, skip or 0])
+        return " ".join(clauses), clause_values
+
+    def _select_type(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None,
+        dataset: str | None,
+    ) -> Tuple[str, List[Any], Dict[str, str], Tuple[str, ...]] | None:
+        """
+        Return SELECT statement without the terminating semicolon, its values, columns mapping and key columns
+        for the records of record_type and its subtypes that match the fields set in filter_obj (if specified),
+        or None if the table does not exist.
+        """
+        serializer = FlatDictSerializer()
+        schema_manager = self._get_schema_manager()
+
+        key_type = record_type.get_key_type()
+        table_name: str = schema_manager.table_name_for_type(key_type)
+        if not schema_manager.has_table_for_type(key_type):
+            return None
+
+        # Restrict the query to record_type and its subtypes
+        subtype_names = tuple(t.__name__ for t in Schema.get_type_successors(record_type))
+        value_placeholders = ", ".join(["?"] * len(subtype_names))
+        where_conditions = [f"_type in ({value_placeholders})"]
+        query_values = list(subtype_names)
+
+        columns_mapping = schema_manager.get_columns_mapping(key_type)
+        if filter_obj is not None:
+            # Create declared indexes in case the table was created before they were declared
+            schema_manager.create_indexes(key_type)
+
+            # Add a condition for each field that is set in the filter object
+            for field_name, field_value in self._serialize_filter(filter_obj, serializer).items():
+                if (column := columns_mapping.get(field_name, None)) is None:
+                    raise RuntimeError(
+                        f"Field '{field_name}' of filter type {type(filter_obj).__name__} is not stored "
+                        f"in table '{table_name}' for record type {record_type.__name__}."
+                    )
+                # Rows saved before complex fields were encoded in a single pass store them in the legacy format
+                legacy_value = serializer.serialize_legacy_data(getattr(filter_obj, field_name))
+                if legacy_value == field_value:
+                    where_conditions.append(f'"{column}" = ?')
+                    query_values.append(field_value)
+                else:
+                    where_conditions.append(f'("{column}" = ? OR "{column}" = ?)')
+                    query_values.extend((field_value, legacy_value))
+
+        key_columns = tuple(columns_mapping[key_field] for key_field in schema_manager.get_primary_keys(key_type))
+        sql_statement, query_values = self._select_in_dataset(
+            table_name,
+            key_columns,
+            DatasetUtil.to_lookup_list(dataset),
+            where=" AND ".join(where_conditions),
+            values=query_values,
+        )
+        return sql_statement, query_values, columns_mapping, key_columns
+
+    def _load_type(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord | None,
+        *,
+        dataset: str | None,
+        limit: int | None,
+        skip: int | None,
+        sort: List[IndexDecl] | None,
+    ) -> Iterator[TRecord]:
+        """Common implementation of load_all and load_filter."""
+        with self._get_lock():
+            if (select := self._select_type(record_type, filter_obj, dataset)) is None:
+                # Table does not exist, return empty result
+                return
+            sql_statement, query_values, columns_mapping, key_columns = select
+
+            page_clause, page_values = self._get_page_clause(
+                columns_mapping, key_columns, limit=limit, skip=skip, sort=sort
+            )
+            if page_clause:
+                sql_statement = f"{sql_statement} {page_clause}"
+                query_values = [*query_values, *page_values]
+
+            schema_manager = self._get_schema_manager()
+            reversed_columns_mapping = schema_manager.get_reversed_columns_mapping(record_type.get_key_type())
+            cursor = self._get_connection().cursor()
+            cursor.execute(f"{sql_statement};", query_values)
+        serializer = FlatDictSerializer(skip_validation=not self.validate_on_load)
+        yield from self._read_records(cursor, reversed_columns_mapping, serializer)
+
+    def _count_type(self, record_type: Type[TRecord], filter_obj: TRecord | None, dataset: str | None) -> int:
+        """Common implementation of count_all and count_filter."""
+        with self._get_lock():
+            if (select := self._select_type(record_type, filter_obj, dataset)) is None:
+                # Table does not exist
+                return 0
+            sql_statement, query_values, _, _ = select
+            cursor = self._get_connection().cursor()
+            cursor.execute(f'SELECT COUNT(*) AS "count" FROM ({sql_statement});', query_values)
+            return cursor.fetchone()["count"]
+
+    def _get_keys_chunk_size(self, key_fields: Tuple[str, ...], other_values_len: int = 0) -> int:
+        """
+        Maximum number of keys in a single WHERE ... IN clause that stays under the SQL variable limit
+        when the statement has other_values_len other parameters.
+        """
+        variable_limit = self.variable_limit - other_values_len
+        return max(1, variable_limit // len(key_fields)) if key_fields else variable_limit
 
     def load_one(
         self,
@@ -126,8 +401,10 @@ class SqliteDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> Iterable[TRecord | None] | None:
-        serializer = FlatDictSerializer()
+        serializer = FlatDictSerializer(skip_validation=not self.validate_on_load)
         schema_manager = self._get_schema_manager()
+        lock = self._get_lock()
+        lookup_list = DatasetUtil.to_lookup_list(dataset)
 
         # Use itertools.groupby to preserve the original order of records_or_keys
         # Group by key type and then by it is key or record, if records rather than keys return without lookup
@@ -143,51 +420,46 @@ class SqliteDb(Db):
                     yield from keys_group
                     continue
 
-                table_name = schema_manager.table_name_for_type(key_type)
-
-                # if keys_group don't support "in" or "len" operator convert it to tuple
-                if not hasattr(keys_group, "__contains__") or not hasattr(keys_group, "__len__"):
-                    keys_group = tuple(keys_group)
+                with lock:
+                    table_name = schema_manager.table_name_for_type(key_type)
+                    if has_table := schema_manager.has_table_for_type(key_type):
+                        key_fields = schema_manager.get_primary_keys(key_type)
+                        columns_mapping = schema_manager.get_columns_mapping(key_type)
+                        reversed_columns_mapping = schema_manager.get_reversed_columns_mapping(key_type)
+                        key_columns = tuple(columns_mapping[key_field] for key_field in key_fields)
 
                 # return None for all keys in group if table doesn't exist
-                existing_tables = schema_manager.existing_tables()
-                if table_name not in existing_tables:
-                    yield from (None for _ in range(len(keys_group)))
+                if not has_table:
+                    yield from (None for _ in keys_group)
                     continue
 
-                key_fields = schema_manager.get_primary_keys(key_type)
-                columns_mapping = schema_manager.get_columns_mapping(key_type)
-
-                # if keys_group don't support "in" or "len" operator convert it to tuple
-                sql_statement = f'SELECT * FROM "{table_name}"'
-                sql_statement = self._add_where_keys_in_clause(
-                    sql_statement, key_fields, columns_mapping, len(keys_group)
-                )
-                sql_statement += ";"
-
-                # serialize keys to tuple
-                query_values = self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer)
-
+                # Query in chunks to stay under the SQL variable limit and to limit the number of rows held in memory
                 cursor = self._get_connection().cursor()
-                cursor.execute(sql_statement, query_values)
-
-                reversed_columns_mapping = {v: k for k, v in columns_mapping.items()}
-
-                # TODO (Roman): investigate performance impact from this ordering approach
-                # bulk load from db returns records in any order so we need to check all records in group before return
-                # collect db result to dictionary to return it according to input keys order
-                result = {}
-                for data in cursor.fetchall():
-                    # TODO (Roman): select only needed columns on db side.
-                    data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
-                    deserialized_data = serializer.deserialize_data(data)
-
-                    # TODO (Roman): make key hashable and remove conversion of key to str
-                    result[str(deserialized_data.get_key())] = deserialized_data
-
-                # yield records according to input keys order
-                for key in keys_group:
-                    yield result.get(str(key))
+                keys_chunk_size = self._get_keys_chunk_size(key_fields, 2 * len(lookup_list))
+                for keys_chunk in ListUtil.chunks(keys_group, keys_chunk_size):
+                    # Serialized key tuples are used both as query values and to match the returned rows
+                    key_tuples = [self._serialize_key_tuple(key, key_fields, serializer) for key in keys_chunk]
+                    unique_key_tuples = tuple(dict.fromkeys(key_tuples))
+
+                    sql_statement, query_values = self._select_in_dataset(
+                        table_name,
+                        key_columns,
+                        lookup_list,
+                        key_where=self._get_keys_in_condition(key_columns, len(unique_key_tuples)),
+                        key_values=(value for key_tuple in unique_key_tuples for value in key_tuple),
+                    )
+                    # Rows are returned in arbitrary order, index them by the tuple of key column values
+                    result = {}
+                    with lock:
+                        cursor.execute(f"{sql_statement};", query_values)
+                        while rows := cursor.fetchmany(self.fetch_size):
+                            for data in rows:
+                                row_key_tuple = tuple(data[key_column] for key_column in key_columns)
+                                data = self._row_to_fields(data, reversed_columns_mapping)
+                                result[row_key_tuple] = serializer.deserialize_data(data)
+
+                    # yield records according to input keys order
+                    yield from (result.get(key_tuple) for key_tuple in key_tuples)
 
     def load_all(
         self,
@@ -195,32 +467,11 @@ class SqliteDb(Db):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord | None] | None:
-        serializer = FlatDictSerializer()
-        schema_manager = self._get_schema_manager()
-
-        table_name: str = schema_manager.table_name_for_type(record_type)
-
-        # if table doesn't exist return empty list
-        if table_name not in schema_manager.existing_tables():
-            return list()
-
-        # get subtypes for record_type and use them in match condition
-        subtype_names = tuple(t.__name__ for t in Schema.get_type_successors(record_type))
-        value_placeholders = ", ".join(["?"] * len(subtype_names))
-        sql_statement = f'SELECT * FROM "{table_name}" WHERE _type in ({value_placeholders});'
-
-        reversed_columns_mapping = {
-            v: k for k, v in schema_manager.get_columns_mapping(record_type.get_key_type()).items()
-        }
-
-        cursor = self._get_connection().cursor()
-        cursor.execute(sql_statement, subtype_names)
-
-        for data in cursor.fetchall():
-            # TODO (Roman): select only needed columns on db side.
-            data = {reversed_columns_mapping[k]: v for k, v in data.items() if v is not None}
-            yield serializer.deserialize_data(data)
+        return self._load_type(record_type, None, dataset=dataset, limit=limit, skip=skip, sort=sort)
 
     def load_filter(
         self,
@@ -229,8 +480,30 @@ class SqliteDb(Db):
         *,
         dataset: str | None = None,
         identity: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+        sort: List[IndexDecl] | None = None,
     ) -> Iterable[TRecord]:
-        raise NotImplementedError()
+        return self._load_type(record_type, filter_obj, dataset=dataset, limit=limit, skip=skip, sort=sort)
+
+    def count_all(
+        self,
+        record_type: Type[TRecord],
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        return self._count_type(record_type, None, dataset)
+
+    def count_filter(
+        self,
+        record_type: Type[TRecord],
+        filter_obj: TRecord,
+        *,
+        dataset: str | None = None,
+        identity: str | None = None,
+    ) -> int:
+        return self._count_type(record_type, filter_obj, dataset)
 
     def save_one(
         self,
@@ -248,67 +521,65 @@ class SqliteDb(Db):
         dataset: str | None = None,
         identity: str | None = None,
     ) -> None:
-
-        # Call on_save if defined
-        [
-            record.on_save()
-            for record in records  # TODO: Refactor on_save
-            if record is not None and hasattr(record, "on_save")
-        ]
-
         serializer = FlatDictSerializer()
         schema_manager = self._get_schema_manager()
 
+        # Group records by key type, call on_save if defined
         grouped_records = defaultdict(list)
-
-        # TODO (Roman): improve grouping
         for record in records:
+            if record is None:
+                continue
+            if hasattr(record, "on_save"):
+                record.on_save()  # TODO: Refactor on_save
             grouped_records[record.get_key_type()].append(record)
 
-        for key_type, records_group in grouped_records.items():
-            # serialize records
-            serialized_records = [serializer.serialize_data(rec, is_root=True) for rec in records_group]
-
-            # get maximum set of fields from records
-            all_fields = list({k for rec in serialized_records for k in rec.keys()})
-
-            # fill sql_values with ordered values from serialized records
-            # if field isn't in some records - fill with None
-            sql_values = tuple(
-                serialized_record[k] if k in serialized_record else None
-                for serialized_record in serialized_records
-                for k in all_fields
-            )
-
-            columns_mapping = schema_manager.get_columns_mapping(key_type)
-            quoted_columns = [f'"{columns_mapping[field]}"' for field in all_fields]
-            columns_str = ", ".join(quoted_columns)
-
-            value_placeholders = ", ".join([f"({', '.join(['?']*len(all_fields))})" for _ in range(len(records_group))])
-
-            table_name = schema_manager.table_name_for_type(key_type)
-
-            primary_keys = [columns_mapping[primary_key] for primary_key in schema_manager.get_primary_keys(key_type)]
-
-            schema_manager.create_table(
-                table_name, columns_mapping.values(), if_not_exists=True, primary_keys=primary_keys
-            )
-
-            sql_statement = f'REPLACE INTO "{table_name}" ({columns_str}) VALUES {value_placeholders};'
-
-            if not primary_keys:
-                # TODO (Roman): this is a workaround for handling singleton records.
-                #  Since they don't have primary keys, we can't automatically replace existing records.
-                #  So this code just deletes the existing records before saving.
-                #  As a possible solution, we can introduce some mandatory primary key that isn't based on the
-                #  key fields.
-                self.delete_many((rec.get_key() for rec in records_group))
+        # Create tables and write records under the lock for the connection, which is shared by all threads
+        # when pooled is False, so that transactions from different threads do not interleave
+        with self._get_lock():
+            # Create tables before the write transaction is opened because create_table commits,
+            # this is skipped by the schema manager for the tables it already knows
+            for key_type in grouped_records.keys():
+                columns_mapping = schema_manager.get_columns_mapping(key_type)
+                primary_keys = [
+                    columns_mapping[primary_key] for primary_key in schema_manager.get_primary_keys(key_type)
+                ]
+                schema_manager.create_table(
+                    schema_manager.table_name_for_type(key_type),
+                    columns_mapping.values(),
+                    if_not_exists=True,
+                    primary_keys=primary_keys,
+                )
+                schema_manager.create_indexes(key_type)
 
+            # Write all groups in a single transaction which is committed on exit or rolled back on error
+            dataset = DatasetUtil.combine(dataset)
             connection = self._get_connection()
-            cursor = connection.cursor()
-            cursor.execute(sql_statement, sql_values)
-
-            connection.commit()
+            with connection:
+                cursor = connection.cursor()
+                for key_type, records_group in grouped_records.items():
+                    table_name = schema_manager.table_name_for_type(key_type)
+                    columns_mapping = schema_manager.get_columns_mapping(key_type)
+
+                    # Write all columns of the table so the same prepared statement is reused for every record,
+                    # REPLACE overwrites the entire row so columns not present in the record are set to NULL.
+                    # The unique index includes the dataset column, so REPLACE only overwrites the record with
+                    # the same key in the same dataset, this also applies to singleton records without key fields
+                    fields = tuple(columns_mapping.keys())
+                    columns_str = ", ".join(f'"{columns_mapping[field]}"' for field in fields)
+                    value_placeholders = ", ".join(["?"] * len(fields))
+                    sql_statement = (
+                        f'REPLACE INTO "{table_name}" ("{dataset_column}", {columns_str}) '
+                        f"VALUES (?, {value_placeholders});"
+                    )
+
+                    # Serialize and write records in chunks to limit the size of parameter lists held in memory
+                    for records_chunk in ListUtil.chunks(records_group, self.batch_size):
+                        serialized_records = (serializer.serialize_data(rec, is_root=True) for rec in records_chunk)
+                        sql_values = (
+                            (dataset, *(serialized_record.get(field) for field in fields))
+                            for serialized_record in serialized_records
+                        )
+                        cursor.executemany(sql_statement, sql_values)
 
     def delete_one(
         self,
@@ -336,40 +607,42 @@ class SqliteDb(Db):
         for key in keys:
             grouped_keys[key.get_key_type()].append(key)
 
-        for key_type, keys_group in grouped_keys.items():
-            table_name = schema_manager.table_name_for_type(key_type)
-
-            existing_tables = schema_manager.existing_tables()
-            if table_name not in existing_tables:
-                continue
-
-            key_fields = schema_manager.get_primary_keys(key_type)
-            columns_mapping = schema_manager.get_columns_mapping(key_type)
-
-            # if keys_group don't support "in" or "len" operator convert it to tuple
-            if not hasattr(keys_group, "__contains__") or not hasattr(keys_group, "__len__"):
-                keys_group = tuple(keys_group)
-
-            # construct sql_statement with placeholders for values
-            sql_statement = f'DELETE FROM "{table_name}"'
-            sql_statement = self._add_where_keys_in_clause(sql_statement, key_fields, columns_mapping, len(keys_group))
-            sql_statement += ";"
-
-            # serialize keys to tuple
-            query_values = self._serialize_keys_to_flat_tuple(keys_group, key_fields, serializer)
-
-            # perform delete query
-            connection = self._get_connection()
-            cursor = connection.cursor()
-            cursor.execute(sql_statement, query_values)
-            connection.commit()
+        # Delete all groups in a single transaction which is committed on exit or rolled back on error,
+        # hold the lock for the connection so that transactions from different threads do not interleave
+        dataset = DatasetUtil.combine(dataset)
+        connection = self._get_connection()
+        with self._get_lock():
+            # Check tables before the write transaction is opened because migrating a table commits
+            key_types = [key_type for key_type in grouped_keys.keys() if schema_manager.has_table_for_type(key_type)]
+            with connection:
+                cursor = connection.cursor()
+                for key_type in key_types:
+                    table_name = schema_manager.table_name_for_type(key_type)
+                    key_fields = schema_manager.get_primary_keys(key_type)
+                    columns_mapping = schema_manager.get_columns_mapping(key_type)
+                    key_columns = tuple(columns_mapping[key_field] for key_field in key_fields)
+
+                    # Delete in chunks to stay under the SQL variable limit
+                    for keys_chunk in ListUtil.chunks(grouped_keys[key_type], self._get_keys_chunk_size(key_fields, 1)):
+                        key_tuples = tuple(
+                            dict.fromkeys(self._serialize_key_tuple(key, key_fields, serializer) for key in keys_chunk)
+                        )
+
+                        # Records are deleted only from the specified dataset, records in parent datasets
+                        # with the same key remain and become visible in this dataset
+                        keys_condition = self._get_keys_in_condition(key_columns, len(key_tuples))
+                        where_str = " AND ".join([f'"{dataset_column}" = ?', *filter(None, [keys_condition])])
+                        sql_statement = f'DELETE FROM "{table_name}" WHERE {where_str};'
+                        query_values = (dataset, *(value for key_tuple in key_tuples for value in key_tuple))
+                        cursor.execute(sql_statement, query_values)
 
     def delete_all_and_drop_db(self) -> None:
         # Check that db_id matches temp_db_prefix
         Context.error_if_not_temp_db(self.db_id)
 
-        # Close connection
-        self.close_connection()
+        # Close connection after the running transactions and queries that hold the lock are completed
+        with self._get_lock():
+            self.close_connection()
 
         # Check that filename also matches temp_db_prefix. It should normally match db_id
         # we already checked, but given the critical importance of this check will check db_filename
@@ -379,35 +652,81 @@ class SqliteDb(Db):
         Context.error_if_not_temp_db(db_filename)
 
         # Delete database file if exists, all checks gave been performed
-        if os.path.exists(db_file_path):
-            os.remove(db_file_path)
+        # Also delete write-ahead log and shared memory files that remain if the database was used in WAL mode
+        for file_path in (db_file_path, f"{db_file_path}-wal", f"{db_file_path}-shm"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
     def close_connection(self) -> None:
-        if (connection := _connection_dict.get(self.db_id, None)) is not None:
-            # Close connection
-            connection.close()
-            # Remove from dictionary so connection can be reopened on next access
-            del _connection_dict[self.db_id]
-            del _schema_manager_dict[self.db_id]
-            pass
+        with _connection_lock:
+            # Close connections for this db_id opened by all processes and threads
+            connection_keys = [key for key in _connection_dict.keys() if key[0] == self.db_id]
+            for connection_key in connection_keys:
+                # Remove from dictionary so connection can be reopened on next access
+                connection = _connection_dict.pop(connection_key)
+                _schema_manager_dict.pop(connection_key, None)
+                _lock_dict.pop(connection_key, None)
+                # Close connection
+                connection.close()
+
+    def _get_connection_key(self) -> Tuple:
+        """Key in the connection dictionary, includes process and thread when pooled is True."""
+        if self.pooled:
+            return self.db_id, os.getpid(), threading.get_ident()
+        else:
+            return (self.db_id,)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get PyMongo database object."""
-        if (connection := _connection_dict.get(self.db_id, None)) is None:
-            # TODO: Implement dispose logic
-            db_file = self._get_db_file()
-            connection = sqlite3.connect(db_file, check_same_thread=False)
-            connection.row_factory = dict_factory
-            _connection_dict[self.db_id] = connection
+        """Get sqlite3 connection object, a new connection is opened on first access."""
+        connection_key = self._get_connection_key()
+        if (connection := _connection_dict.get(connection_key, None)) is None:
+            with _connection_lock:
+                # Check again under the lock in case another thread has opened the connection
+                if (connection := _connection_dict.get(connection_key, None)) is None:
+                    # TODO: Implement dispose logic
+                    db_file = self._get_db_file()
+                    # Use check_same_thread=False in both modes so that close_connection can close all connections
+                    connection = sqlite3.connect(db_file, timeout=self.busy_timeout, check_same_thread=False)
+                    connection.row_factory = dict_factory
+                    if self.pooled:
+                        self._configure_pooled_connection(connection)
+                    _connection_dict[connection_key] = connection
         return connection
 
+    def _configure_pooled_connection(self, connection: sqlite3.Connection) -> None:
+        """Set WAL journal mode and pragmas for a pooled connection."""
+        # WAL mode is persistent in the database file and allows readers to run concurrently with one writer
+        connection.execute("PRAGMA journal_mode=WAL;")
+        if self.synchronous is not None:
+            connection.execute(f"PRAGMA synchronous={self.synchronous};")
+        if self.cache_size is not None:
+            connection.execute(f"PRAGMA cache_size={int(self.cache_size)};")
+        if self.mmap_size is not None:
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)};")
+
     def _get_schema_manager(self) -> SqliteSchemaManager:
-        """Get PyMongo database object."""
-        if (result := _schema_manager_dict.get(self.db_id, None)) is None:
+        """Get schema manager for the connection returned by _get_connection."""
+        connection_key = self._get_connection_key()
+        if (result := _schema_manager_dict.get(connection_key, None)) is None:
             # TODO: Implement dispose logic
             connection = self._get_connection()
-            result = SqliteSchemaManager(sqlite_connection=connection)
-            _schema_manager_dict[self.db_id] = result
+            with _connection_lock:
+                # Check again under the lock in case another thread has created the schema manager
+                if (result := _schema_manager_dict.get(connection_key, None)) is None:
+                    result = SqliteSchemaManager(sqlite_connection=connection)
+                    _schema_manager_dict[connection_key] = result
+        return result
+
+    def _get_lock(self) -> threading.RLock:
+        """
+        Get the lock for the connection returned by _get_connection, hold it for each transaction, query execution
+        and schema manager access because the connection and schema manager are shared by all threads when pooled
+        is False (the lock is only used by one thread when pooled is True).
+        """
+        connection_key = self._get_connection_key()
+        if (result := _lock_dict.get(connection_key, None)) is None:
+            with _connection_lock:
+                result = _lock_dict.setdefault(connection_key, threading.RLock())
         return result
 
     def _get_db_file(self) -> str:
@@ -14,17 +14,24 @@
 
 import sqlite3
 from dataclasses import dataclass
+from dataclasses import field
 from inspect import isclass
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import cast
+from cl.runtime.db.dataset_util import DatasetUtil
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.records.protocols import KeyProtocol
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
 from cl.runtime.schema.schema import Schema
 
+dataset_column = "_dataset"
+"""Name of the column that stores the dataset of each row, present in every table created by the schema manager."""
+
 
 @dataclass(slots=True, kw_only=True)
 class SqliteSchemaManager:
@@ -39,6 +46,24 @@ class SqliteSchemaManager:
     add_class_to_column_names: bool = True
     """If True - class name will be added to the column name in format ClassName.field_name."""
 
+    _tables: Set[str] | None = None
+    """Cached names of existing tables, loaded on first access and updated by DDL issued by this schema manager."""
+
+    _table_columns_cache: Dict[str, Set[str]] = field(default_factory=dict)
+    """Cached column names of each table, loaded on first access and updated by DDL issued by this schema manager."""
+
+    _indexed_types: Set[Type] = field(default_factory=set)
+    """Types for which secondary indexes were created by create_indexes."""
+
+    _columns_mapping_cache: Dict[Type, Dict[str, str]] = field(default_factory=dict)
+    """Cached result of get_columns_mapping for each type."""
+
+    _reversed_columns_mapping_cache: Dict[Type, Dict[str, str]] = field(default_factory=dict)
+    """Cached result of get_reversed_columns_mapping for each type."""
+
+    _primary_keys_cache: Dict[Type, Tuple[str, ...]] = field(default_factory=dict)
+    """Cached result of get_primary_keys for each type."""
+
     def create_table(
         self,
         table_name: str,
@@ -51,8 +76,22 @@ class SqliteSchemaManager:
 
         No need to specify column types because sqlite supports dynamic typing.
         Mile wide table contains columns for all subtypes.
+
+        The table has an additional dataset column, the unique index is on primary keys and dataset
+        so the same key can be stored in more than one dataset.
+
+        If the table already exists and if_not_exists is True, the columns that are not yet present
+        in the table are added in place, existing columns and data remain unchanged.
         """
 
+        columns = (dataset_column, *(column for column in columns if column != dataset_column))
+        primary_keys = [*(primary_keys or []), dataset_column]
+
+        # For a table known to exist, only add the missing columns (no DDL if none are missing)
+        if if_not_exists and table_name in self._get_tables():
+            self._add_missing_columns_and_migrate(table_name, columns, primary_keys)
+            return
+
         if_not_exists_part: str = " IF NOT EXISTS" if if_not_exists else ""
         columns_str: str = '"' + '", "'.join(columns) + '"'
 
@@ -62,19 +101,118 @@ class SqliteSchemaManager:
         # execute create table statement
         cursor = self.sqlite_connection.cursor()
         cursor.execute(create_table_statement)
+        self._create_key_index(table_name, primary_keys)
 
-        if primary_keys:
-            keys_str = ", ".join([f'"{key}"' for key in primary_keys])
+        self.sqlite_connection.commit()
+        self._get_tables().add(table_name)
+        self._table_columns_cache.pop(table_name, None)
+
+        # With IF NOT EXISTS the statement has no effect on a table created by another process,
+        # add the columns that may be missing in this case
+        if if_not_exists:
+            self._add_missing_columns_and_migrate(table_name, columns, primary_keys)
+
+    def _create_key_index(self, table_name: str, primary_keys: List[str]) -> None:
+        """Create unique index on primary keys and dataset column if it does not exist, does not commit."""
+        keys_str = ", ".join([f'"{key}"' for key in primary_keys])
 
-            # Make index name based on table name to be unique within database
-            index_name = f"{table_name}_key_index"
+        # Make index name based on table name to be unique within database
+        index_name = f"{table_name}_dataset_key_index"
 
-            create_unique_index_statement = (
-                f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({keys_str});'
+        create_unique_index_statement = (
+            f'CREATE UNIQUE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({keys_str});'
+        )
+        self.sqlite_connection.execute(create_unique_index_statement)
+
+    def _add_missing_columns_and_migrate(
+        self,
+        table_name: str,
+        columns: Iterable[str],
+        primary_keys: List[str],
+    ) -> None:
+        """
+        Add missing columns to an existing table. If the dataset column is among them, the table was created
+        without datasets: assign its rows to the root dataset and replace the key index by the dataset key index.
+        """
+        if dataset_column in self.add_missing_columns(table_name, columns):
+            cursor = self.sqlite_connection.cursor()
+            cursor.execute(
+                f'UPDATE "{table_name}" SET "{dataset_column}" = ? WHERE "{dataset_column}" IS NULL;',
+                (DatasetUtil.root(),),
             )
-            cursor.execute(create_unique_index_statement)
+            cursor.execute(f'DROP INDEX IF EXISTS "{table_name}_key_index";')
+            self._create_key_index(table_name, primary_keys)
+            self.sqlite_connection.commit()
 
-        self.sqlite_connection.commit()
+    def create_indexes(self, type_: Type) -> None:
+        """
+        Create secondary indexes declared for the table of the specified type (see Schema.get_type_indexes)
+        if they do not yet exist, the table must already exist.
+        """
+
+        # Skip DDL for types whose indexes were already created
+        if type_ in self._indexed_types:
+            return
+
+        table_name = self.table_name_for_type(type_)
+        columns_mapping = self.get_columns_mapping(type_)
+        index_decls = Schema.get_type_indexes(type_)
+        if index_decls:
+            cursor = self.sqlite_connection.cursor()
+            for index_decl in index_decls:
+                index_columns = []
+                for element in index_decl.elements:
+                    if (column := columns_mapping.get(element.name, None)) is None:
+                        raise RuntimeError(
+                            f"Index '{index_decl.name}' for table '{table_name}' refers to element '{element.name}' "
+                            f"which is not a field of any type stored in this table."
+                        )
+                    direction = "DESC" if element.direction == IndexSortOrderEnum.DESCENDING else "ASC"
+                    index_columns.append(f'"{column}" {direction}')
+
+                # Make index name based on table name to be unique within database
+                index_name = f"{table_name}_{index_decl.name}_index"
+                index_columns_str = ", ".join(index_columns)
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({index_columns_str});')
+            self.sqlite_connection.commit()
+        self._indexed_types.add(type_)
+
+    def add_missing_columns(self, table_name: str, columns: Iterable[str]) -> List[str]:
+        """
+        Add columns that are not present in an existing table using ALTER TABLE and return the added columns.
+
+        The added columns are NULL for existing rows, this is how a field not set in a record is stored.
+        """
+
+        columns = tuple(columns)
+        table_columns = self.get_table_columns(table_name)
+        if any(column not in table_columns for column in columns):
+            # The columns may have been added by another connection since the cache was loaded, reload
+            self._table_columns_cache.pop(table_name, None)
+            table_columns = self.get_table_columns(table_name)
+
+        missing_columns = [column for column in columns if column not in table_columns]
+        if missing_columns:
+            cursor = self.sqlite_connection.cursor()
+            for column in missing_columns:
+                try:
+                    cursor.execute(f'ALTER TABLE "{table_name}" ADD COLUMN "{column}";')
+                except sqlite3.OperationalError as e:
+                    # Skip if the column was added by another connection after the cache was reloaded
+                    if "duplicate column name" not in str(e):
+                        raise
+            self.sqlite_connection.commit()
+            table_columns.update(missing_columns)
+        return missing_columns
+
+    def get_table_columns(self, table_name: str) -> Set[str]:
+        """Return column names of an existing table (cached, do not modify the returned set)."""
+        if (result := self._table_columns_cache.get(table_name, None)) is None:
+            cursor = self.sqlite_connection.cursor()
+            cursor.execute(f'PRAGMA table_info("{table_name}");')
+            result = {column_info["name"] for column_info in cursor.fetchall()}
+            self._table_columns_cache[table_name] = result
+        return result
 
     def delete_table_by_name(self, name: str, if_exists: bool = True) -> None:
         """Delete table in db."""
@@ -82,6 +220,9 @@ class SqliteSchemaManager:
         if_exists_part: str = " IF EXISTS" if if_exists else ""
         cursor.execute(f"DROP TABLE {if_exists_part} '{name}';")
         self.sqlite_connection.commit()
+        self._get_tables().discard(name)
+        self._table_columns_cache.pop(name, None)
+        self._indexed_types = {x for x in self._indexed_types if self.table_name_for_type(x) != name}
 
     def table_name_for_type(self, type_: Type) -> str:
         """Return table name for the given type."""
@@ -92,18 +233,71 @@ class SqliteSchemaManager:
 
     def existing_tables(self) -> List[str]:
         """Return existing tables in db."""
-        cursor = self.sqlite_connection.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-
-        return [select_res["name"] for select_res in cursor.fetchall()]
+        return list(self._get_tables())
+
+    def has_table(self, table_name: str) -> bool:
+        """Return True if the table exists, the catalog is queried again only when the table is not in cache."""
+        if table_name in self._get_tables():
+            return True
+        else:
+            # The table may have been created by another connection since the cache was loaded
+            self._tables = None
+            return table_name in self._get_tables()
+
+    def has_table_for_type(self, type_: Type) -> bool:
+        """
+        Return True if the table for the specified type exists. A table created before datasets were added
+        is migrated when it is first accessed, so queries that use the dataset column match its rows.
+        """
+        table_name = self.table_name_for_type(type_)
+        if not self.has_table(table_name):
+            return False
+        if dataset_column not in self.get_table_columns(table_name):
+            columns_mapping = self.get_columns_mapping(type_)
+            primary_keys = [*(columns_mapping[key] for key in self.get_primary_keys(type_)), dataset_column]
+            self._add_missing_columns_and_migrate(table_name, (dataset_column,), primary_keys)
+        return True
+
+    def clear_cache(self) -> None:
+        """Clear cached metadata, call after the schema is modified other than through this schema manager."""
+        self._tables = None
+        self._table_columns_cache.clear()
+        self._indexed_types.clear()
+        self._columns_mapping_cache.clear()
+        self._reversed_columns_mapping_cache.clear()
+        self._primary_keys_cache.clear()
+
+    def _get_tables(self) -> Set[str]:
+        """Return cached set of existing table names, query the catalog if not yet loaded."""
+        if self._tables is None:
+            cursor = self.sqlite_connection.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            self._tables = {select_res["name"] for select_res in cursor.fetchall()}
+        return self._tables
 
     def _get_type_fields(self, type_: Type) -> Dict[str, Type]:  # TODO: Consolidate this and similar code in Schema
         """Return field name and type of annotation based type declaration."""
         return type_.__annotations__
 
-    # TODO (Roman): make cached but only for key types
     def get_columns_mapping(self, type_: Type) -> Dict[str, str]:
-        """Collect all types in hierarchy and check type conflicts for fields with the same name."""
+        """
+        Collect all types in hierarchy and check type conflicts for fields with the same name,
+        return mapping of field names to column names (cached, do not modify the returned dictionary).
+        """
+        if (result := self._columns_mapping_cache.get(type_, None)) is None:
+            result = self._build_columns_mapping(type_)
+            self._columns_mapping_cache[type_] = result
+        return result
+
+    def get_reversed_columns_mapping(self, type_: Type) -> Dict[str, str]:
+        """Return mapping of column names to field names (cached, do not modify the returned dictionary)."""
+        if (result := self._reversed_columns_mapping_cache.get(type_, None)) is None:
+            result = {v: k for k, v in self.get_columns_mapping(type_).items()}
+            self._reversed_columns_mapping_cache[type_] = result
+        return result
+
+    def _build_columns_mapping(self, type_: Type) -> Dict[str, str]:
+        """Build the mapping returned by get_columns_mapping without using the cache."""
 
         types_in_hierarchy = Schema.get_types_in_hierarchy(type_)
         key_type = cast(KeyProtocol, type_).get_key_type()
@@ -155,6 +349,9 @@ class SqliteSchemaManager:
 
     def get_primary_keys(self, type_: Type) -> Tuple[str, ...]:
         """Return list of primary key fields."""
-        key_type = cast(KeyProtocol, type_).get_key_type()
-        key_fields = self._get_type_fields(key_type)
-        return tuple(key_fields.keys())
+        if (result := self._primary_keys_cache.get(type_, None)) is None:
+            key_type = cast(KeyProtocol, type_).get_key_type()
+            key_fields = self._get_type_fields(key_type)
+            result = tuple(key_fields.keys())
+            self._primary_keys_cache[type_] = result
+        return result
@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from itertools import islice
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Tuple
 
 
 class ListUtil:
@@ -22,3 +26,12 @@ class ListUtil:
     def is_empty(cls, values: List | None) -> bool:
         """Returns true if the list is None or has zero length."""
         return values is None or len(values) == 0
+
+    @classmethod
+    def chunks(cls, values: Iterable, chunk_size: int) -> Iterator[Tuple]:
+        """Split an iterable into consecutive tuples of at most chunk_size elements without materializing it."""
+        if chunk_size < 1:
+            raise RuntimeError(f"Chunk size {chunk_size} is less than one.")
+        iterator = iter(values)
+        while chunk := tuple(islice(iterator, chunk_size)):
+            yield chunk
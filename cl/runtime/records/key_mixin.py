@@ -15,6 +15,7 @@
 from abc import ABC
 from abc import abstractmethod
 from typing import Type
+from cl.runtime.records.key_util import KeyUtil
 
 
 class KeyMixin(ABC):
@@ -27,3 +28,14 @@ class KeyMixin(ABC):
     @abstractmethod
     def get_key_type(cls) -> Type:
         """Return key type even when called from a record."""
+
+    def __init_subclass__(cls, **kwargs):
+        """Make key types hashable, dataclass decorator with eq=True sets __hash__ to None unless set in the class."""
+        super().__init_subclass__(**kwargs)
+        if not hasattr(cls, "get_key") and "__hash__" not in cls.__dict__:
+            # Records are mutable and compare all fields, only key types are made hashable
+            cls.__hash__ = KeyMixin.__hash__
+
+    def __hash__(self) -> int:
+        """Hash of key type and key field values, consistent with dataclass equality of key fields."""
+        return hash(KeyUtil.get_key_tuple(self))
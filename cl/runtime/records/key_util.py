@@ -15,8 +15,17 @@
 import ast
 import inspect
 import textwrap
+from operator import attrgetter
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Type
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots
+
+_key_fields_getter_dict: Dict[Type, Callable[[Any], Tuple]] = {}
+"""Dict of functions returning the tuple of key field values with key type as the key."""
 
 
 class KeyUtil:
@@ -68,3 +77,28 @@ class KeyUtil:
                 key_fields.append(node.attr)
 
         return key_fields
+
+    @classmethod
+    def get_key_tuple(cls, key_or_record: Any) -> Tuple:
+        """
+        Return a hashable tuple of key type followed by key field values for a key or a record, where
+        embedded keys are also converted to tuples. Key and record with the same key produce the same tuple.
+        """
+        key_type = key_or_record.get_key_type()
+        if (key_fields_getter := _key_fields_getter_dict.get(key_type, None)) is None:
+            # Key type slots include only key fields, use slots of the entire class hierarchy because
+            # for Python 3.11 and later __slots__ includes fields declared in this class only,
+            # attrgetter returns a tuple only for more than one field
+            key_slots = _get_class_hierarchy_slots(key_type)
+            if len(key_slots) == 0:
+                key_fields_getter = lambda x: ()  # noqa
+            elif len(key_slots) == 1:
+                key_fields_getter = lambda x, getter=attrgetter(key_slots[0]): (getter(x),)  # noqa
+            else:
+                key_fields_getter = attrgetter(*key_slots)
+            _key_fields_getter_dict[key_type] = key_fields_getter
+
+        return (
+            key_type,
+            *(cls.get_key_tuple(v) if hasattr(v, "get_key_type") else v for v in key_fields_getter(key_or_record)),
+        )
@@ -18,65 +18,75 @@ from dataclasses import fields
 from dataclasses import is_dataclass
 from types import NoneType
 from types import UnionType
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import Union
 from typing import get_args
 from typing import get_origin
 from cl.runtime.log.exceptions.user_error import UserError
 
+_FieldValidator = Tuple[str, Tuple[type, ...] | None, Callable[[Any], bool] | None, bool, Any]
+"""
+Field name, tuple of types if isinstance check with this tuple is sufficient (otherwise None), callable
+that checks the value if it is not (otherwise None), True if the field is required, and field type.
+"""
+
+_init_methods_dict: Dict[Type, Tuple[Callable, ...]] = {}
+"""Dictionary of 'init' methods in class hierarchy in the order from base to derived using class as key."""
+
+_validator_dict: Dict[Type, Tuple[_FieldValidator, ...]] = {}
+"""Dictionary of field validators built once from dataclass fields using class as key."""
+
 
 class RecordUtil:
     """Utilities for working with records."""
 
     @classmethod
-    def init_all(cls, obj) -> None:
-        """Invoke 'init' for each class in the order from base to derived, then validate against schema."""
+    def init_all(cls, obj, *, skip_validation: bool = False) -> None:
+        """
+        Invoke 'init' for each class in the order from base to derived, then validate against schema.
 
-        # Keep track of which init methods in class hierarchy were already called
-        invoked = set()
+        Args:
+            obj: Object to initialize and validate
+            skip_validation: If True, invoke 'init' methods without validation (use for data validated when saved)
+        """
 
-        # Reverse the MRO to start from base to derived
-        for class_ in reversed(obj.__class__.__mro__):
-            class_init = getattr(class_, "init", None)
-            if class_init is not None and (qualname := class_init.__qualname__) not in invoked:
-                # Add qualname to invoked to prevent executing the same method twice
-                invoked.add(qualname)
-                # Invoke 'init' method of superclass if it exists, otherwise do nothing
-                class_init(obj)
+        # Invoke 'init' method of each class in hierarchy that implements it
+        for class_init in cls._get_init_methods(obj.__class__):
+            class_init(obj)
 
         # Perform validation against the schema only after all init methods are called
-        cls.validate(obj)
+        if not skip_validation:
+            cls.validate(obj)
 
     @classmethod
     def validate(cls, obj) -> None:
         """Validate against schema (invoked by init_all after all init methods are called)."""
         # TODO: Support other dataclass-like frameworks
         class_name = obj.__class__.__name__
-        if is_dataclass(obj):
-            for field in fields(obj):
-                field_value = getattr(obj, field.name)
-                if field_value is not None:
-                    # Check that for the fields that have values, the values are of the right type
-                    if not cls._is_instance(field_value, field.type):
-                        field_type_name = cls._get_field_type_name(field.type)
-                        value_type_name = type(field_value).__name__
-                        if "member_descriptor" not in value_type_name:  # TODO(Roman): Remove when fixed
-                            raise RuntimeError(
-                                f"""Type mismatch for field '{field.name}' of class {class_name}.
+        for field_name, field_types, field_check, is_required, field_type in cls._get_validator(obj.__class__):
+            field_value = getattr(obj, field_name)
+            if field_value is not None:
+                # Check that for the fields that have values, the values are of the right type
+                if not (isinstance(field_value, field_types) if field_types is not None else field_check(field_value)):
+                    field_type_name = cls._get_field_type_name(field_type)
+                    value_type_name = type(field_value).__name__
+                    if "member_descriptor" not in value_type_name:  # TODO(Roman): Remove when fixed
+                        raise RuntimeError(
+                            f"""Type mismatch for field '{field_name}' of class {class_name}.
 Type in dataclass declaration: {field_type_name}
 Type of the value: {type(field_value).__name__}
 Note: In case of containers, type mismatch may be in one of the items.
 """
-                            )
-                else:
-                    default_is_none = field.default is None
-                    default_factory_is_missing = field.default_factory is MISSING
-                    default_value_not_set = default_is_none and default_factory_is_missing
-                    if default_value_not_set and not cls._is_optional(field.type):
-                        # Error if a field is None but declared as required
-                        raise UserError(f"Field '{field.name}' in class '{class_name}' is required but not set.")
+                        )
+            elif is_required:
+                # Error if a field is None but declared as required
+                raise UserError(f"Field '{field_name}' in class '{class_name}' is required but not set.")
 
     @classmethod
     def is_abstract(cls, record_type: Type) -> bool:
@@ -96,6 +106,73 @@ Note: In case of containers, type mismatch may be in one of the items.
                 result.append(subclass)
         return result
 
+    @classmethod
+    def _get_init_methods(cls, type_: Type) -> Tuple[Callable, ...]:
+        """Return cached 'init' methods in class hierarchy in the order from base to derived, each included once."""
+        if (result := _init_methods_dict.get(type_, None)) is None:
+            # Keep track of which init methods in class hierarchy were already included
+            included = set()
+            init_methods = []
+
+            # Reverse the MRO to start from base to derived
+            for class_ in reversed(type_.__mro__):
+                class_init = getattr(class_, "init", None)
+                if class_init is not None and (qualname := class_init.__qualname__) not in included:
+                    # Add qualname to included to prevent executing the same method twice
+                    included.add(qualname)
+                    init_methods.append(class_init)
+
+            result = tuple(init_methods)
+            _init_methods_dict[type_] = result
+        return result
+
+    @classmethod
+    def _get_validator(cls, type_: Type) -> Tuple[_FieldValidator, ...]:
+        """Return cached field validators for the class built from its dataclass fields, empty for other classes."""
+        if (result := _validator_dict.get(type_, None)) is None:
+            validators = []
+            for field in fields(type_) if is_dataclass(type_) else ():
+                field_types = cls._get_isinstance_types(field.type)
+                field_check = cls._get_check(field.type) if field_types is None else None
+                default_value_not_set = field.default is None and field.default_factory is MISSING
+                is_required = default_value_not_set and not cls._is_optional(field.type)
+                validators.append((field.name, field_types, field_check, is_required, field.type))
+            result = tuple(validators)
+            _validator_dict[type_] = result
+        return result
+
+    @classmethod
+    def _get_isinstance_types(cls, field_type) -> Tuple[type, ...] | None:
+        """
+        Return tuple of types if the value can be checked using isinstance with this tuple (for a type
+        or a union of types that are not generic), otherwise None.
+        """
+        if isinstance(field_type, type) and get_origin(field_type) is None:
+            return (field_type,)
+        elif get_origin(field_type) in [UnionType, Union]:
+            args = get_args(field_type)
+            if all(isinstance(arg, type) and get_origin(arg) is None for arg in args):
+                return args
+        return None
+
+    @classmethod
+    def _get_check(cls, field_type) -> Callable[[Any], bool]:
+        """Return callable built once for the type hint with the same result as '_is_instance' for this hint."""
+        if (field_types := cls._get_isinstance_types(field_type)) is not None:
+            return lambda value: isinstance(value, field_types)
+        elif (origin := get_origin(field_type)) in [list, dict] and (args := get_args(field_type)):
+            if origin is list:
+                item_check = cls._get_check(args[0])
+                return lambda value: isinstance(value, list) and all(item_check(item) for item in value)
+            elif isinstance(args[0], type):
+                key_type = args[0]
+                value_check = cls._get_check(args[1])
+                return lambda value: isinstance(value, dict) and all(
+                    isinstance(k, key_type) and value_check(v) for k, v in value.items()
+                )
+        # Use the general implementation for other type hints
+        return lambda value: bool(cls._is_instance(value, field_type))
+
     @classmethod
     def _is_instance(cls, field_value, field_type) -> bool:
 
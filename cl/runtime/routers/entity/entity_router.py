@@ -19,6 +19,7 @@ from fastapi import APIRouter
 from fastapi import Body
 from fastapi import Header
 from fastapi import Query
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
 from cl.runtime.routers.entity.delete_request import DeleteRequest
 from cl.runtime.routers.entity.delete_response import DeleteResponse
 from cl.runtime.routers.entity.list_panels_request import ListPanelsRequest
@@ -44,7 +45,9 @@ async def get_list_panels(
     user: str = Header(None, description="User identifier or identity token"),
 ) -> ListPanelsResponse:
     """List of panels for the specified record."""
-    return ListPanelsResponseItem.list_panels(ListPanelsRequest(type=type, key=key, dataset=dataset, user=user))
+    return await ThreadPoolUtil.run(
+        ListPanelsResponseItem.list_panels, ListPanelsRequest(type=type, key=key, dataset=dataset, user=user)
+    )
 
 
 @router.get("/panel", response_model=PanelResponse)
@@ -55,7 +58,9 @@ async def get_panel(
     dataset: str = Query(None, description="Dataset string"),
 ):
     """Return panel content by its displayed name."""
-    return PanelResponseUtil.get_content(PanelRequest(type=type, panel_id=panel_id, key=key, dataset=dataset))
+    return await ThreadPoolUtil.run(
+        PanelResponseUtil.get_content, PanelRequest(type=type, panel_id=panel_id, key=key, dataset=dataset)
+    )
 
 
 @router.post("/save", response_model=SaveResponse)
@@ -67,7 +72,8 @@ async def save(
 ) -> SaveResponse:
     """Save panel content."""
 
-    return SaveResponse.save_entity(
+    return await ThreadPoolUtil.run(
+        SaveResponse.save_entity,
         SaveRequest(
             record_dict=record_in_dict,
             old_record_key=old_record_key,
@@ -85,7 +91,8 @@ async def delete_many(
 ) -> DeleteResponse:
     """Delete entities."""
 
-    return DeleteResponse.delete_many(
+    return await ThreadPoolUtil.run(
+        DeleteResponse.delete_many,
         DeleteRequest(
             record_keys=record_keys,
             dataset=dataset,
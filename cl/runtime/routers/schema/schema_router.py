@@ -18,6 +18,7 @@ from fastapi import APIRouter
 from fastapi import Header
 from fastapi import Query
 from starlette.requests import Request
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
 from cl.runtime.routers.schema.type_hierarchy_request import TypeHierarchyRequest
 from cl.runtime.routers.schema.type_hierarchy_response_item import TypeHierarchyResponseItem
 from cl.runtime.routers.schema.type_request import TypeRequest
@@ -36,7 +37,7 @@ router = APIRouter()
 @router.get("/types", response_model=TypesResponse)
 async def get_types(user: str = Header(None, description="User identifier or identity token")) -> TypesResponse:
     """Information about the record types."""
-    return TypesResponseItem.get_types(UserRequest(user=user))
+    return await ThreadPoolUtil.run(TypesResponseItem.get_types, UserRequest(user=user))
 
 
 @router.get("/typeV2", response_model=TypeResponse)
@@ -46,7 +47,7 @@ async def get_type(
     user: str = Header(None, description="User identifier or identity token"),
 ) -> TypeResponse:
     """Schema for the specified type and its dependencies."""
-    return TypeResponseUtil.get_type(TypeRequest(name=name, module=module, user=user))
+    return await ThreadPoolUtil.run(TypeResponseUtil.get_type, TypeRequest(name=name, module=module, user=user))
 
 
 @router.get("/type-hierarchy", response_model=TypeHierarchyResponse)
@@ -58,4 +59,6 @@ async def get_type_hierarchy(
     ),
 ) -> TypeHierarchyResponse:
     """Return type class hierarchy."""
-    return TypeHierarchyResponseItem.get_types(TypeHierarchyRequest(name=name, return_ancestors=return_ancestors))
+    return await ThreadPoolUtil.run(
+        TypeHierarchyResponseItem.get_types, TypeHierarchyRequest(name=name, return_ancestors=return_ancestors)
+    )
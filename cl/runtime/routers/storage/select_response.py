@@ -16,6 +16,7 @@ from __future__ import annotations
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Type
 from pydantic import BaseModel
 from pydantic import Field
 from cl.runtime.context.context import Context
@@ -24,6 +25,7 @@ from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.routers.schema.type_request import TypeRequest
 from cl.runtime.routers.schema.type_response_util import TypeResponseUtil
 from cl.runtime.routers.storage.select_request import SelectRequest
+from cl.runtime.serialization.dict_serializer import _get_class_hierarchy_slots  # TODO: Move to ClassInfo
 from cl.runtime.serialization.ui_dict_serializer import UiDictSerializer
 
 SelectResponseSchema = Dict[str, Any]
@@ -39,6 +41,9 @@ class SelectResponse(BaseModel):
     data: SelectResponseData
     """Data field of the response data type for the /storage/select route."""
 
+    count: int | None = None
+    """Total number of records matching the query, of which data contains one page."""
+
     @classmethod
     def get_records(cls, request: SelectRequest) -> SelectResponse:
         """Implements /storage/select route."""
@@ -53,16 +58,20 @@ class SelectResponse(BaseModel):
         # Get database from the current context
         db = Context.current().db
 
-        # TODO (Roman): replace temporary load_all to load_filter
-        if not hasattr(db, "load_all"):
-            raise RuntimeError(
-                f"Currently database need to implement load_all() method for select records by type. "
-                f"Database {db.__class__.__name__} doesn't have load_all()."
-            )
-
-        # load records by type
-        records = db.load_all(record_type)
-        records = list(records)
+        # Filter, sort and page on the database side, then get the total count for the grid
+        if request.query_dict:
+            filter_obj = cls._get_filter(record_type, request.query_dict)
+            records = db.load_filter(record_type, filter_obj, limit=request.threshold, skip=request.skip)
+            records = list(records)
+            count = db.count_filter(record_type, filter_obj) if cls._is_partial(records, request) else None
+        else:
+            records = db.load_all(record_type, limit=request.threshold, skip=request.skip)
+            records = list(records)
+            count = db.count_all(record_type) if cls._is_partial(records, request) else None
+
+        # Count is known without a separate query when the page is not full
+        if count is None:
+            count = request.skip + len(records)
 
         # TODO: Refactor the code below
 
@@ -71,4 +80,22 @@ class SelectResponse(BaseModel):
         # TODO (Roman): check if we are calling /select somewhere other than the main grid.
         serialized_records = tuple(ui_serializer.serialize_record_for_table(record) for record in records)
 
-        return SelectResponse(schema=type_decl_dict, data=serialized_records).dict(by_alias=True)
+        return SelectResponse(schema=type_decl_dict, data=serialized_records, count=count).dict(by_alias=True)
+
+    @classmethod
+    def _get_filter(cls, record_type: Type, query_dict: Dict[str, Any]) -> Any:
+        """Create filter object of record_type where only the fields in the query dictionary are set."""
+        # Fields not in the query are set to None rather than their defaults so that they are not matched
+        query_fields = {
+            CaseUtil.pascale_to_snake_case_keep_trailing_underscore(k): v
+            for k, v in query_dict.items()
+            if not k.startswith("_")
+        }
+        return record_type(**{k: query_fields.get(k) for k in _get_class_hierarchy_slots(record_type)})
+
+    @classmethod
+    def _is_partial(cls, records: List, request: SelectRequest) -> bool:
+        """Return True if there may be records outside the returned page."""
+        return (request.skip > 0 and not records) or (
+            request.threshold is not None and len(records) >= request.threshold
+        )
@@ -20,6 +20,7 @@ from fastapi import Header
 from fastapi import Query
 from fastapi.responses import ORJSONResponse
 from starlette.requests import Request
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
 from cl.runtime.routers.storage.dataset_response import DatasetResponse
 from cl.runtime.routers.storage.datasets_request import DatasetsRequest
 from cl.runtime.routers.storage.env_response import EnvResponse
@@ -50,7 +51,7 @@ async def get_datasets(
     user: str = Header(None, description="User identifier or identity token"),
 ) -> DatasetsResponse:
     """Information about the environments."""
-    return DatasetResponse.get_datasets(DatasetsRequest(type=type, module=module, user=user))
+    return await ThreadPoolUtil.run(DatasetResponse.get_datasets, DatasetsRequest(type=type, module=module, user=user))
 
 
 @router.get("/record", response_model=RecordResponse)
@@ -65,10 +66,11 @@ async def get_record(
     user: str = Header(None, description="User identifier or identity token"),
 ) -> RecordResponse:
     """Schema and data for a single record specified by a key."""
-    return RecordResponse.get_record(
+    return await ThreadPoolUtil.run(
+        RecordResponse.get_record,
         RecordRequest(
             type=type, key=key, module=module, dataset=dataset, ignore_record_absence=ignore_record_absence, user=user
-        )
+        ),
     )
 
 
@@ -88,8 +90,9 @@ async def storage_select(
     Get entities by query with schema information.
     """
 
-    return SelectResponse.get_records(
-        request=SelectRequest(
+    return await ThreadPoolUtil.run(
+        SelectResponse.get_records,
+        SelectRequest(
             type_=type_, query_dict=query_dict, threshold=threshold, skip=skip, module=module, table_format=table_format
-        )
+        ),
     )
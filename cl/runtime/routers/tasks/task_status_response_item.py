@@ -16,12 +16,14 @@ from __future__ import annotations
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Tuple
 from typing import cast
 from pydantic import BaseModel
 from cl.runtime import Context
 from cl.runtime.log.log_entry import LogEntry
 from cl.runtime.log.log_entry_level_enum import LogEntryLevelEnum
 from cl.runtime.primitive.case_util import CaseUtil
+from cl.runtime.records.key_util import KeyUtil
 from cl.runtime.routers.tasks.task_status_request import TaskStatusRequest
 from cl.runtime.tasks.task import Task
 from cl.runtime.tasks.task_run import TaskRun
@@ -67,21 +69,26 @@ class TaskStatusResponseItem(BaseModel):
         task_run_keys = [TaskRunKey(task_run_id=x) for x in request.task_run_ids]  # TODO: Update if task_run_id is UUID
         task_runs = cast(Iterable[TaskRun], context.load_many(TaskRun, task_run_keys))
 
+        # Load each task and log entry shared by several runs only once, including the log entries that are not found
+        tasks: Dict[Tuple, Task] = {}
+        log_entries: Dict[Tuple, LogEntry | None] = {}
+
         response_items = []
         for task_run in task_runs:
-            task_obj = context.load_one(Task, task_run.task)
+            if (task_key_tuple := KeyUtil.get_key_tuple(task_run.task)) not in tasks:
+                tasks[task_key_tuple] = context.load_one(Task, task_run.task)
+            task_obj = tasks[task_key_tuple]
 
             # Displayed to the user in case of UserError
-            user_message = (
-                log_entry.message
-                if (
-                    task_run.log_entry is not None
-                    and (log_entry := context.load_one(LogEntry, task_run.log_entry, is_record_optional=True))
-                    is not None
-                    and log_entry.level == LogEntryLevelEnum.USER_ERROR
-                )
-                else None
-            )
+            user_message = None
+            if task_run.log_entry is not None:
+                if (log_entry_key_tuple := KeyUtil.get_key_tuple(task_run.log_entry)) not in log_entries:
+                    log_entries[log_entry_key_tuple] = context.load_one(
+                        LogEntry, task_run.log_entry, is_record_optional=True
+                    )
+                log_entry = log_entries[log_entry_key_tuple]
+                if log_entry is not None and log_entry.level == LogEntryLevelEnum.USER_ERROR:
+                    user_message = log_entry.message
 
             response_items.append(
                 TaskStatusResponseItem(
@@ -15,6 +15,7 @@
 from typing import List
 from fastapi import APIRouter
 from fastapi import Request
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
 from cl.runtime.routers.tasks.run_error_response_item import RunErrorResponseItem
 from cl.runtime.routers.tasks.run_request import RunRequest
 from cl.runtime.routers.tasks.run_response_item import RunResponseItem
@@ -38,7 +39,7 @@ async def tasks_run(request: Request, payload: RunRequest):
 
     # Run tasks without blocking the process
     payload.headers = headers
-    return RunResponseItem.run_tasks(payload)
+    return await ThreadPoolUtil.run(RunResponseItem.run_tasks, payload)
 
 
 @router.post("/run/cancel")
@@ -55,9 +56,9 @@ async def tasks_cancel_all():
 
 @router.post("/run/status", response_model=List[TaskStatusResponseItem])
 async def tasks_status(payload: TaskStatusRequest):
-    return TaskStatusResponseItem.get_task_statuses(request=payload)
+    return await ThreadPoolUtil.run(TaskStatusResponseItem.get_task_statuses, payload)
 
 
 @router.post("/run/result", response_model=List[TaskResultResponseItem])
 async def tasks_result(payload: TaskResultRequest):
-    return TaskResultResponseItem.get_task_results(request=payload)
+    return await ThreadPoolUtil.run(TaskResultResponseItem.get_task_results, payload)
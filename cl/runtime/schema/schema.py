@@ -34,6 +34,7 @@ from cl.runtime.records.class_info import ClassInfo
 from cl.runtime.records.protocols import KeyProtocol
 from cl.runtime.schema.type_decl import TypeDecl
 from cl.runtime.schema.type_decl_key import TypeDeclKey
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
 from cl.runtime.settings.context_settings import ContextSettings
 
 
@@ -273,3 +274,34 @@ class Schema:
 
         # TODO)Major): Use ClassInfo.get_inheritance_chain and record base classes in DB so unknow types can also be returned
         return set(schema_type for schema_type in Schema.get_types() if record_type in schema_type.__mro__)
+
+    @classmethod
+    @cached
+    def get_type_indexes(cls, record_type: Type) -> List[TypeIndexDecl]:
+        """
+        Return secondary index declarations for the table of record_type, ordered from base to derived.
+
+        Notes:
+            - A record type declares indexes by implementing classmethod 'get_indexes' returning List[TypeIndexDecl]
+            - Indexes declared by all types in the hierarchy of the key type are included
+            - The primary key index is not included because it is created together with the table
+        """
+
+        key_type = cast(KeyProtocol, record_type).get_key_type()
+
+        # Only consider the types that implement get_indexes themselves rather than inherit it from a base
+        types_ = [key_type, *cls.get_types_in_hierarchy(key_type)]
+        index_decls = [
+            index_decl for type_ in types_ if "get_indexes" in vars(type_) for index_decl in type_.get_indexes()
+        ]
+
+        # Use element names for indexes without a name and remove duplicates keeping the first declaration
+        result = {}
+        for index_decl in index_decls:
+            if index_decl.name is None:
+                index_decl = TypeIndexDecl(
+                    name="_".join(element.name for element in index_decl.elements),
+                    elements=index_decl.elements,
+                )
+            result.setdefault(index_decl.name, index_decl)
+        return list(result.values())
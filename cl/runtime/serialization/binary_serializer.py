@@ -0,0 +1,131 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime as dt
+import struct
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+from typing import List
+from uuid import UUID
+import msgpack
+from cl.runtime.records.protocols import TDataDict
+from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.dict_serializer import alias_dict
+from cl.runtime.serialization.dict_serializer import get_type_dict
+
+_DATE_EXT = 1
+"""MessagePack extension type code for date stored as big-endian int32 proleptic Gregorian ordinal."""
+
+_TIME_EXT = 2
+"""MessagePack extension type code for time without timezone stored as big-endian int64 microseconds since midnight."""
+
+_NAIVE_DATETIME_EXT = 3
+"""MessagePack extension type code for datetime without timezone stored as big-endian int64 microseconds since epoch."""
+
+_UUID_EXT = 4
+"""MessagePack extension type code for UUID stored as 16 bytes."""
+
+_ENUM_EXT = 5
+"""MessagePack extension type code for enum stored as MessagePack array of enum class short name and item name."""
+
+_EPOCH = dt.datetime(1970, 1, 1)
+"""Epoch for datetime without timezone."""
+
+_MICROSECOND = dt.timedelta(microseconds=1)
+"""Resolution of stored datetime and time values."""
+
+
+@dataclass(slots=True, kw_only=True)
+class BinarySerializer(DictSerializer):
+    """
+    Serialization for slots-based classes to a compact binary format (MessagePack) where bytes are stored natively
+    and dates, times, datetimes, UUIDs and enums are stored as MessagePack extension types instead of strings.
+
+    Notes:
+        - Timezone-aware datetimes use the standard MessagePack timestamp extension type and are loaded in UTC
+        - Data and keys are stored as maps with '_type' field in the same way as DictSerializer
+    """
+
+    def serialize_to_bytes(self, data) -> bytes:
+        """Serialize to bytes, invoke init_all before serialization."""
+        return msgpack.packb(self.serialize_data(data), default=self._pack_ext, datetime=True)
+
+    def deserialize_from_bytes(self, data: bytes):
+        """Deserialize object from bytes, invoke init_all after deserialization."""
+        return self.deserialize_data(msgpack.unpackb(data, ext_hook=self._unpack_ext, timestamp=3))
+
+    def serialize_data(self, data, select_fields: List[str] | None = None):
+        if isinstance(data, Enum):
+            # Convert enum to extension type here because MessagePack would store IntEnum as int
+            return self._pack_ext(data)
+        else:
+            return super(BinarySerializer, self).serialize_data(data, select_fields)
+
+    def deserialize_data(self, data: TDataDict):
+        if isinstance(data, Enum):
+            # Enum is already created from extension type
+            return data
+        else:
+            return super(BinarySerializer, self).deserialize_data(data)
+
+    @classmethod
+    def _pack_ext(cls, value: Any) -> msgpack.ExtType:
+        """Convert value not supported by MessagePack to extension type."""
+        # Check datetime before date because datetime is a subclass of date
+        if isinstance(value, dt.datetime):
+            # Timezone-aware datetimes do not reach here because they use the standard timestamp extension type
+            return msgpack.ExtType(_NAIVE_DATETIME_EXT, struct.pack(">q", (value - _EPOCH) // _MICROSECOND))
+        elif isinstance(value, dt.date):
+            return msgpack.ExtType(_DATE_EXT, struct.pack(">i", value.toordinal()))
+        elif isinstance(value, dt.time):
+            if value.tzinfo is not None:
+                raise RuntimeError(f"Cannot serialize time {value} with timezone {value.tzname()}.")
+            microseconds = ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+            return msgpack.ExtType(_TIME_EXT, struct.pack(">q", microseconds))
+        elif isinstance(value, UUID):
+            return msgpack.ExtType(_UUID_EXT, value.bytes)
+        elif isinstance(value, Enum):
+            # To find short name, use 'in' which is faster than 'get' when most types do not have aliases
+            short_name = alias_dict[type_] if (type_ := type(value)) in alias_dict else type_.__name__
+            # Cache type for subsequent reverse lookup
+            get_type_dict()[short_name] = type_
+            return msgpack.ExtType(_ENUM_EXT, msgpack.packb((short_name, value.name)))
+        else:
+            raise RuntimeError(f"Cannot serialize data of type '{type(value)}'.")
+
+    @classmethod
+    def _unpack_ext(cls, code: int, data: bytes) -> Any:
+        """Convert extension type to value."""
+        if code == _NAIVE_DATETIME_EXT:
+            return _EPOCH + struct.unpack(">q", data)[0] * _MICROSECOND
+        elif code == _DATE_EXT:
+            return dt.date.fromordinal(struct.unpack(">i", data)[0])
+        elif code == _TIME_EXT:
+            seconds, microsecond = divmod(struct.unpack(">q", data)[0], 1_000_000)
+            minutes, second = divmod(seconds, 60)
+            hour, minute = divmod(minutes, 60)
+            return dt.time(hour, minute, second, microsecond)
+        elif code == _UUID_EXT:
+            return UUID(bytes=data)
+        elif code == _ENUM_EXT:
+            short_name, item_name = msgpack.unpackb(data)
+            if (enum_type := get_type_dict().get(short_name, None)) is None:
+                raise RuntimeError(
+                    f"Enum not found for name or alias '{short_name}' during deserialization. "
+                    f"Ensure all serialized enums are included in package import settings."
+                )
+            return enum_type[item_name]
+        else:
+            return msgpack.ExtType(code, data)
@@ -13,14 +13,21 @@
 # limitations under the License.
 
 import sys
+import types
 from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Tuple
 from typing import Type
+from typing import Union
 from typing import cast
+from typing import get_args
+from typing import get_origin
+from typing import get_type_hints
 from cl.runtime.backend.core.base_type_info import BaseTypeInfo
 from cl.runtime.backend.core.tab_info import TabInfo
 from cl.runtime.log.exceptions.user_error import UserError
@@ -43,6 +50,9 @@ _type_dict: Dict[str, Type] = None
 class_hierarchy_slots_dict: Dict[Type, Tuple] = dict()
 """Dictionary of slots in class hierarchy in the order of declaration from base to derived."""
 
+_type_plan_dict: Dict[Tuple[Type, Type, bool], "_TypePlan"] = dict()
+"""Dictionary of serialization plans using serializer type, data type and pascalize_keys flag as key."""
+
 collect_slots = sys.version_info.major > 3 or sys.version_info.major == 3 and sys.version_info.minor >= 11
 """For Python 3.11 and later, __slots__ includes fields for this class only, use MRO to include base class slots."""
 
@@ -100,6 +110,32 @@ def _get_class_hierarchy_slots(data_type) -> Tuple[str]:
         return cast(Tuple[str], result)
 
 
+@dataclass(slots=True, kw_only=True)
+class _TypePlan:
+    """
+    Serialization plan for a slots-based class, created once for each serializer type
+    and reused for each instance.
+    """
+
+    type_: Type
+    """Class of the serialized data, also used as the constructor during deserialization."""
+
+    short_name: str
+    """Class name or its alias stored in '_type' field."""
+
+    fields: Tuple[Tuple[str, str, bool], ...]
+    """Tuple of (slot name, serialized key, is primitive) in the order of declaration from base to derived."""
+
+    fields_by_key: Dict[str, Tuple[str, bool, Callable[[Any], Any] | None]]
+    """
+    Dictionary of (slot name, is primitive, decoder) using serialized key as dictionary key, where decoder
+    deserializes values of a field whose declared type is known to the serializer or is None.
+    """
+
+    abstract_error: str | None
+    """Error message if the class is abstract and cannot be deserialized, otherwise None."""
+
+
 # TODO: Add checks for to_node, from_node implementation for custom override of default serializer
 @dataclass(slots=True, kw_only=True)
 class DictSerializer:
@@ -108,6 +144,12 @@ class DictSerializer:
     pascalize_keys: bool = False
     """If true, pascalize keys during serialization."""
 
+    skip_validation: bool = False
+    """
+    If true, do not validate deserialized objects against the schema (init methods are still invoked),
+    use for trusted data such as records loaded from a database that were validated when saved.
+    """
+
     primitive_type_names = ["NoneType", "str", "float", "int", "bool", "date", "time", "datetime", "bytes", "UUID"]
     """Detect primitive type by checking if class name is in this list."""
 
@@ -130,23 +172,18 @@ class DictSerializer:
             # Invoke 'init' for each class in class hierarchy that implements it, in the order from base to derived
             RecordUtil.init_all(data)
 
-            # Get slots from this class and its bases in the order of declaration from base to derived
-            all_slots = _get_class_hierarchy_slots(data.__class__)
-            # Serialize slot values in the order of declaration except those that are None
+            # Get plan with slots from this class and its bases in the order of declaration from base to derived
+            plan = self._get_type_plan(data.__class__)
+            primitive_type_names = self.primitive_type_names
+            # Serialize slot values in the order of declaration except those that are None,
+            # values of fields declared with primitive types are used without checking their type
             result = {
-                k if not self.pascalize_keys else CaseUtil.snake_to_pascal_case_keep_trailing_underscore(k): (
-                    v if v.__class__.__name__ in self.primitive_type_names else self.serialize_data(v)
-                )
-                for k in all_slots
-                if (not select_fields or k in select_fields) and (v := getattr(data, k)) is not None
+                k: v if is_primitive or v.__class__.__name__ in primitive_type_names else self.serialize_data(v)
+                for slot, k, is_primitive in plan.fields
+                if (not select_fields or slot in select_fields) and (v := getattr(data, slot)) is not None
             }
-            # To find short name, use 'in' which is faster than 'get' when most types do not have aliases
-            short_name = alias_dict[type_] if (type_ := data.__class__) in alias_dict else type_.__name__
-            # Cache type for subsequent reverse lookup
-            type_dict = get_type_dict()
-            type_dict[short_name] = type_
             # Add to result
-            result["_type"] = short_name
+            result["_type"] = plan.short_name
             return result
         elif isinstance(data, dict):
             # Dictionary, return with serialized values
@@ -198,32 +235,35 @@ class DictSerializer:
                     )
 
                 # Check if the class is abstract
-                if RecordUtil.is_abstract(deserialized_type):
-                    descendants = RecordUtil.get_non_abstract_descendants(deserialized_type)
-                    descendant_names = sorted(set([x.__name__ for x in descendants]))
-                    if len(descendant_names) > 0:
-                        descendant_names_str = ", ".join(descendant_names)
-                        raise UserError(
-                            f"Record {deserialized_type.__name__} cannot be created directly, "
-                            f"but the following descendant records can: {descendant_names_str}"
-                        )
+                plan = self._get_type_plan(deserialized_type)
+                if plan.abstract_error is not None:
+                    raise UserError(plan.abstract_error)
+
+                primitive_type_names = self.primitive_type_names
+                fields_by_key = plan.fields_by_key
+                deserialized_fields = {}
+                for k, v in data.items():
+                    if k == "_type":
+                        continue
+                    if (field := fields_by_key.get(k, None)) is not None:
+                        slot, is_primitive, decoder = field
                     else:
-                        raise UserError(
-                            f"Record {deserialized_type.__name__} cannot be created directly "
-                            f"and there are no descendant records that can."
+                        # Not a slot of this class, the constructor will report the error
+                        slot = CaseUtil.pascale_to_snake_case_keep_trailing_underscore(k) if self.pascalize_keys else k
+                        is_primitive, decoder = False, None
+                    # Values of fields declared with primitive types are used without checking their type
+                    if decoder is not None:
+                        deserialized_fields[slot] = decoder(v)
+                    else:
+                        deserialized_fields[slot] = (
+                            v
+                            if is_primitive or v.__class__.__name__ in primitive_type_names
+                            else self.deserialize_data(v)
                         )
-
-                deserialized_fields = {
-                    CaseUtil.pascale_to_snake_case_keep_trailing_underscore(k) if self.pascalize_keys else k: (
-                        v if v.__class__.__name__ in self.primitive_type_names else self.deserialize_data(v)
-                    )
-                    for k, v in data.items()
-                    if k != "_type"
-                }
-                result = deserialized_type(**deserialized_fields)  # noqa
+                result = plan.type_(**deserialized_fields)  # noqa
 
                 # Invoke 'init' for each class in class hierarchy that implements it, in the order from base to derived
-                RecordUtil.init_all(result)
+                RecordUtil.init_all(result, skip_validation=self.skip_validation)
                 return result
             elif (short_name := data.get("_enum", None)) is not None:
                 # If _enum is specified, create an instance of _enum using _name
@@ -266,6 +306,78 @@ class DictSerializer:
         else:
             raise RuntimeError(f"Cannot deserialize data of type '{type(data)}'.")
 
+    def _get_type_plan(self, data_type: Type) -> _TypePlan:
+        """Return cached serialization plan for the class, create if it does not exist."""
+        plan_key = (self.__class__, data_type, self.pascalize_keys)
+        if (result := _type_plan_dict.get(plan_key, None)) is not None:
+            return result
+
+        # Fields are primitive if their declared type is one of primitive types or its union with None,
+        # use the type of the value for fields whose type hints cannot be resolved
+        try:
+            type_hints = get_type_hints(data_type)
+        except Exception:  # noqa
+            type_hints = {}
+        slots = _get_class_hierarchy_slots(data_type)
+        fields = tuple(
+            (
+                slot,
+                CaseUtil.snake_to_pascal_case_keep_trailing_underscore(slot) if self.pascalize_keys else slot,
+                self._is_primitive_hint(type_hints.get(slot, None)),
+            )
+            for slot in slots
+        )
+        decoders = {slot: self._get_field_decoder(type_hints.get(slot, None)) for slot in slots}
+
+        # To find short name, use 'in' which is faster than 'get' when most types do not have aliases
+        short_name = alias_dict[data_type] if data_type in alias_dict else data_type.__name__
+        # Cache type for subsequent reverse lookup
+        type_dict = get_type_dict()
+        type_dict[short_name] = data_type
+
+        abstract_error = None
+        if RecordUtil.is_abstract(data_type):
+            descendants = RecordUtil.get_non_abstract_descendants(data_type)
+            descendant_names = sorted(set([x.__name__ for x in descendants]))
+            if len(descendant_names) > 0:
+                descendant_names_str = ", ".join(descendant_names)
+                abstract_error = (
+                    f"Record {data_type.__name__} cannot be created directly, "
+                    f"but the following descendant records can: {descendant_names_str}"
+                )
+            else:
+                abstract_error = (
+                    f"Record {data_type.__name__} cannot be created directly "
+                    f"and there are no descendant records that can."
+                )
+
+        result = _TypePlan(
+            type_=data_type,
+            short_name=short_name,
+            fields=fields,
+            fields_by_key={k: (slot, is_primitive, decoders[slot]) for slot, k, is_primitive in fields},
+            abstract_error=abstract_error,
+        )
+        _type_plan_dict[plan_key] = result
+        return result
+
+    def _is_primitive_hint(self, type_hint) -> bool:
+        """Check if type hint is one of primitive types or their union with None."""
+        if type_hint is None:
+            return False
+        elif get_origin(type_hint) in (Union, types.UnionType):
+            args = [arg for arg in get_args(type_hint) if arg is not type(None)]
+            return len(args) > 0 and all(self._is_primitive_hint(arg) for arg in args)
+        else:
+            return isinstance(type_hint, type) and type_hint.__name__ in self.primitive_type_names
+
+    def _get_field_decoder(self, type_hint) -> Callable[[Any], Any] | None:
+        """
+        Return a function that deserializes values of a field with the specified type hint without checking
+        the type of each value, or None to deserialize them using deserialize_data.
+        """
+        return None
+
     @classmethod
     def _serialize_primitive(cls, value: TPrimitive, class_name: str) -> TPrimitive:
         """Serialize primitive value applying the applicable conversion rules."""
@@ -15,23 +15,136 @@
 import base64
 import datetime as dt
 import json
+import math
+import re
+import types
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import Tuple
+from typing import Type
+from typing import Union
+from typing import get_args
+from typing import get_origin
 from uuid import UUID
+import orjson
 from cl.runtime.records.protocols import TDataDict
 from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.string_value_parser_enum import CUSTOM_TYPE_VALUE_TO_NAME
 from cl.runtime.serialization.string_value_parser_enum import StringValueCustomTypeEnum
 from cl.runtime.serialization.string_value_parser_enum import StringValueParser
 
+_typed_value_types: Dict[Type, StringValueCustomTypeEnum] = {
+    dt.date: StringValueCustomTypeEnum.DATE,
+    dt.datetime: StringValueCustomTypeEnum.DATETIME,
+    dt.time: StringValueCustomTypeEnum.TIME,
+    bool: StringValueCustomTypeEnum.BOOL,
+    UUID: StringValueCustomTypeEnum.UUID,
+    bytes: StringValueCustomTypeEnum.BYTES,
+}
+"""Custom types of values stored as a string with type prefix using value class as key."""
 
-class FlatDictSerializer(DictSerializer):
+_typed_value_parsers: Dict[Type, Tuple[str, Callable[[str], Any]]] = {
+    type_: (
+        f"```{CUSTOM_TYPE_VALUE_TO_NAME.get(custom_type, custom_type.name)} ",
+        {
+            StringValueCustomTypeEnum.DATE: dt.date.fromisoformat,
+            StringValueCustomTypeEnum.DATETIME: dt.datetime.fromisoformat,
+            StringValueCustomTypeEnum.TIME: dt.time.fromisoformat,
+            StringValueCustomTypeEnum.BOOL: lambda x: DictSerializer._deserialize_primitive(x, "bool"),
+            StringValueCustomTypeEnum.UUID: UUID,
+            StringValueCustomTypeEnum.BYTES: lambda x: base64.b64decode(x.encode()),
+        }[custom_type],
+    )
+    for type_, custom_type in _typed_value_types.items()
+}
+"""Tuple of (type prefix, parser of value without prefix) using the declared field type as key."""
+
+
+def _serialize_typed_value(data: Any, custom_type: StringValueCustomTypeEnum) -> str:
+    """Serialize value of one of the types in _typed_value_types to a string with type prefix."""
+    if custom_type == StringValueCustomTypeEnum.BOOL:
+        serialized_value = DictSerializer._deserialize_primitive(data, "bool")
+    elif custom_type == StringValueCustomTypeEnum.UUID:
+        serialized_value = str(data)
+    elif custom_type == StringValueCustomTypeEnum.BYTES:
+        serialized_value = base64.b64encode(data).decode()
+    else:
+        serialized_value = data.isoformat()
+    return StringValueParser.add_type_prefix(serialized_value, custom_type)
+
+
+_long_digits_re = re.compile(r"\d{19}")
+"""Regex for a sequence of digits long enough to be an integer that may not fit into 64 bits."""
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    """Return True if JSON-compatible data contains NaN or infinity."""
+    if data.__class__ is float:
+        return not math.isfinite(data)
+    elif isinstance(data, dict):
+        return any(_has_non_finite_float(value) for value in data.values())
+    elif isinstance(data, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in data)
+    else:
+        return False
+
+
+def _json_dumps(data: Any) -> str:
+    """Encode JSON-compatible data in a single call, fall back to json module for values orjson does not support."""
+    try:
+        result = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # Integers that do not fit into 64 bits
+        return json.dumps(data)
+    # orjson writes NaN and infinity as null, check for them only when null is present in the output
+    if "null" in result and _has_non_finite_float(data):
+        return json.dumps(data)
+    return result
+
+
+def _json_loads(data: str) -> Any:
+    """Decode JSON string, fall back to json module for values orjson does not support."""
+    # orjson converts integers that do not fit into 64 bits to float, decode them with json module
+    if _long_digits_re.search(data) is not None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except ValueError:
+        # NaN and Infinity written by json module
+        return json.loads(data)
+
+
+class _NestedSerializer(DictSerializer):
     """
-    Serialization for slot-based classes to flat dict (without nested fields).
-    Complex types serialize as a json string.
+    Serialization of the entire value of a complex field to JSON-compatible data in a single pass,
+    where nested data, dicts and lists are kept as is and values of other types are stored as
+    a string with type prefix.
+    """
+
+    primitive_type_names = ["NoneType", "str", "float", "int"]
+
+    def serialize_data(self, data, select_fields: List[str] | None = None):
+        if (custom_type := _typed_value_types.get(data.__class__, None)) is not None:
+            return _serialize_typed_value(data, custom_type)
+        else:
+            return super().serialize_data(data, select_fields)
+
+
+_nested_serializer = _NestedSerializer()
+"""Serializer for values of complex fields."""
+
+
+class _LegacySerializer(DictSerializer):
+    """
+    Serialization of the value of a complex field in the format used before it was encoded in a single pass,
+    where data, dicts and lists nested inside the value are stored as json strings with type prefix.
     """
 
     primitive_type_names = ["NoneType", "float", "int"]
 
-    def serialize_data(self, data, select_fields: List[str] | None = None, *, is_root: bool = False):
+    def serialize_data(self, data, select_fields: List[str] | None = None):
         if isinstance(data, str):
             return data
 
@@ -40,33 +153,69 @@ class FlatDictSerializer(DictSerializer):
         else:
             serialized_data = super().serialize_data(data, select_fields)
 
-        value_custom_type = StringValueParser.get_custom_type(serialized_data)
+        if (value_custom_type := StringValueParser.get_custom_type(serialized_data)) is None:
+            return serialized_data
+        elif isinstance(serialized_data, (dict, list)):
+            return StringValueParser.add_type_prefix(json.dumps(serialized_data), value_custom_type)
+        elif (custom_type := _typed_value_types.get(serialized_data.__class__, None)) is not None:
+            return _serialize_typed_value(serialized_data, custom_type)
+        else:
+            return serialized_data
+
+
+_legacy_serializer = _LegacySerializer()
+"""Serializer for values of complex fields in the format used before single-pass encoding."""
+
+
+class FlatDictSerializer(DictSerializer):
+    """
+    Serialization for slot-based classes to flat dict (without nested fields).
+    Complex types serialize as a json string.
+    """
 
-        if not is_root and value_custom_type is not None:
-            handled_serialized_value = None
-            if serialized_data.__class__.__name__ in ("date", "datetime", "time"):
-                handled_serialized_value = serialized_data.isoformat()
-            elif serialized_data.__class__.__name__ == "bool":
-                handled_serialized_value = self._deserialize_primitive(data, "bool")
-            elif serialized_data.__class__.__name__ == "UUID":
-                handled_serialized_value = str(data)
-            elif serialized_data.__class__.__name__ == "bytes":
-                handled_serialized_value = base64.b64encode(data).decode()
-            elif isinstance(serialized_data, (dict, list)):
-                # TODO (Roman): refactor to avoid nested data json dumps.
-                #  It is enough to do single json dump for the entire object.
-                handled_serialized_value = json.dumps(serialized_data)
-            return (
-                StringValueParser.add_type_prefix(handled_serialized_value, value_custom_type)
-                if handled_serialized_value is not None
-                else serialized_data
-            )
+    primitive_type_names = ["NoneType", "float", "int"]
+
+    def serialize_data(self, data, select_fields: List[str] | None = None, *, is_root: bool = False):
+        if isinstance(data, str):
+            return data
+        elif is_root:
+            return super().serialize_data(data, select_fields)
+        elif (custom_type := _typed_value_types.get(data.__class__, None)) is not None:
+            return _serialize_typed_value(data, custom_type)
+        elif data.__class__.__name__ in super().primitive_type_names:
+            return data
+
+        # Serialize the entire value to JSON-compatible data and encode it as a json string once,
+        # data, dicts and lists nested inside the value are stored as json objects and arrays
+        serialized_data = _nested_serializer.serialize_data(data, select_fields)
+        value_custom_type = StringValueParser.get_custom_type(serialized_data)
+        if value_custom_type in (StringValueCustomTypeEnum.DICT, StringValueCustomTypeEnum.LIST):
+            return StringValueParser.add_type_prefix(_json_dumps(serialized_data), value_custom_type)
         else:
             return serialized_data
 
+    def serialize_to_json(self, data) -> str:
+        """Serialize a record to a JSON string with complex fields stored as json strings with type prefix."""
+        return _json_dumps(self.serialize_data(data, is_root=True))
+
+    def deserialize_from_json(self, data: str | bytes):
+        """Deserialize a record from a JSON string created by serialize_to_json."""
+        return self.deserialize_data(_json_loads(data.decode() if isinstance(data, bytes) else data))
+
+    def serialize_legacy_data(self, data):
+        """
+        Serialize the value of a field in the format used before complex fields were encoded in a single pass,
+        where nested data, dicts and lists are stored as json strings with type prefix.
+        """
+        return _legacy_serializer.serialize_data(data)
+
     def deserialize_data(self, data: TDataDict):
         # check all str values if it is flattened from some type
         if isinstance(data, str):
+            # Most strings do not have type prefix, return them without parsing
+            if not data.startswith("```"):
+                return data
+
             converted_data, custom_type = StringValueParser.parse(data)
 
             if custom_type is not None:
@@ -83,7 +232,9 @@ class FlatDictSerializer(DictSerializer):
                 elif custom_type == StringValueCustomTypeEnum.BYTES:
                     converted_data = base64.b64decode(converted_data.encode())
                 else:
-                    converted_data = json.loads(converted_data)
+                    # Values saved before nested data was stored as json objects contain nested json strings
+                    # with type prefix, they are decoded by the recursive call for each nested value
+                    converted_data = _json_loads(converted_data)
 
             # TODO (Roman): consider to add serialize_primitive() method and override it
             # return deserialized primitives to avoid infinity recursion
@@ -93,3 +244,28 @@ class FlatDictSerializer(DictSerializer):
             converted_data = data
 
         return super().deserialize_data(converted_data)
+
+    def _is_primitive_hint(self, type_hint) -> bool:
+        # Strings are stored without type prefix, use values of fields declared as str without parsing them
+        return type_hint is str or super()._is_primitive_hint(type_hint)
+
+    def _get_field_decoder(self, type_hint) -> Callable[[Any], Any] | None:
+        # For the union of a single type with None, use the decoder for this type
+        if get_origin(type_hint) in (Union, types.UnionType):
+            args = [arg for arg in get_args(type_hint) if arg is not type(None)]
+            type_hint = args[0] if len(args) == 1 else None
+
+        if (typed_value_parser := _typed_value_parsers.get(type_hint, None)) is None:
+            return None
+        type_prefix, parser = typed_value_parser
+        type_prefix_len = len(type_prefix)
+
+        def decoder(value: Any) -> Any:
+            # Values of fields whose type is known are parsed without detecting type from the prefix,
+            # other values are deserialized by checking their type
+            if value.__class__ is str and value.startswith(type_prefix):
+                return parser(value[type_prefix_len:])
+            else:
+                return self.deserialize_data(value)
+
+        return decoder
@@ -79,6 +79,9 @@ CUSTOM_TYPE_VALUE_TO_NAME: Final[Dict[StringValueCustomTypeEnum, str]] = {
 }
 """Enum value to name mapping."""
 
+_typed_value_pattern = re.compile("```(?P<type>.*?) .*")
+"""Pattern for string representation of a custom type value with type prefix."""
+
 
 class StringValueParser:
     """Parser for string value representations of custom types."""
@@ -110,9 +113,8 @@ class StringValueParser:
             "any_string_without_prefix" -> "any_string_without_prefix", None
         """
 
-        # Check if value starts with type info prefix using regex
-        typed_value_pattern = re.compile("```(?P<type>.*?) .*")
-        typed_value_match = typed_value_pattern.match(value)
+        # Check if value starts with type info prefix using regex, skip the match for values without it
+        typed_value_match = _typed_value_pattern.match(value) if value.startswith("```") else None
 
         if typed_value_match:
             # get custom type name according to pattern
@@ -43,6 +43,12 @@ class ContextSettings(Settings):
     db_uri: str | None = None
     """Optional database URI to connect to the database. Required for basic mongo db data source."""
 
+    thread_pool_size: int = 16
+    """Maximum number of threads used to run blocking code such as database I/O from async code."""
+
+    db_data_format: str = "json"
+    """Format of records stored as blobs by databases such as RedisDb, 'json' or 'binary' (MessagePack)."""
+
     def init(self) -> None:
         """Same as __init__ but can be used when field values are set both during and after construction."""
 
@@ -70,6 +76,14 @@ class ContextSettings(Settings):
                 f"{type(self).__name__} field 'db_class' must be a string " f"in module.ClassName format."
             )
 
+        if isinstance(self.thread_pool_size, str) and self.thread_pool_size.isdigit():
+            self.thread_pool_size = int(self.thread_pool_size)
+        if not isinstance(self.thread_pool_size, int) or self.thread_pool_size < 1:
+            raise RuntimeError(f"{type(self).__name__} field 'thread_pool_size' must be a positive int.")
+
+        if self.db_data_format not in ("json", "binary"):
+            raise RuntimeError(f"{type(self).__name__} field 'db_data_format' must be 'json' or 'binary'.")
+
     @classmethod
     def get_prefix(cls) -> str:
         return "runtime_context"
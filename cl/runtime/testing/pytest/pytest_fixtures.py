@@ -42,3 +42,34 @@ def celery_test_queue_fixture():
     yield
     celery_delete_existing_tasks()
     print("Stopping celery workers and cleaning up tasks.")
+
+
+@pytest.fixture(scope="function")
+def mongomock_fixture(monkeypatch):
+    """Pytest function fixture to run BasicMongoDb against mongomock instead of a MongoDB server."""
+
+    # Import inside the fixture because mongomock is a test requirement only
+    import mongomock
+    from cl.runtime.db.mongo import basic_mongo_db
+
+    # Replace client class and clear cached clients and databases so they are created using mongomock
+    monkeypatch.setattr(basic_mongo_db, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(basic_mongo_db, "_client_dict", {})
+    monkeypatch.setattr(basic_mongo_db, "_db_dict", {})
+    monkeypatch.setattr(basic_mongo_db, "_collection_dict", {})
+    yield
+
+
+@pytest.fixture(scope="function")
+def fakeredis_fixture(monkeypatch):
+    """Pytest function fixture to run RedisDb against fakeredis instead of a Redis server."""
+
+    # Import inside the fixture because fakeredis is a test requirement only
+    import fakeredis
+    from cl.runtime.db.redis import redis_db
+
+    # Clear cached clients and create new clients using an in-process server that is discarded after the test
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_db, "_client_dict", {})
+    monkeypatch.setattr(redis_db.RedisDb, "_create_client", lambda self: fakeredis.FakeRedis(server=server))
+    yield
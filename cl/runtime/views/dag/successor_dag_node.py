@@ -20,6 +20,7 @@ from cl.runtime import RecordMixin
 from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.primitive.case_util import CaseUtil
 from cl.runtime.records.dataclasses_extensions import missing
+from cl.runtime.records.key_util import KeyUtil
 from cl.runtime.view.dag.dag import Dag
 from cl.runtime.view.dag.dag_edge import DagEdge
 from cl.runtime.view.dag.dag_layout_enum import DagLayoutEnum
@@ -101,6 +102,16 @@ class SuccessorDagNode(SuccessorDagNodeKey, RecordMixin[SuccessorDagNodeKey]):
         ignore_fields = ignore_fields or []
         nodes, edges = [node.to_dag_node()], []
 
+        # Load each successor shared by several nodes only once, including the successors that are not found
+        loaded_nodes: dict[tuple, Optional[SuccessorDagNode]] = {}
+
+        def load_node(node_key: SuccessorDagNodeKey) -> Optional[SuccessorDagNode]:
+            """Load the node for the given key or return the node loaded earlier for the same key."""
+            key_tuple = KeyUtil.get_key_tuple(node_key)
+            if key_tuple not in loaded_nodes:
+                loaded_nodes[key_tuple] = Context.current().load_one(SuccessorDagNodeKey, node_key)
+            return loaded_nodes[key_tuple]
+
         def traverse_graph_from_node(node_record: SuccessorDagNode, source_node: DagNode):
             """Recursively traverse the graph starting from the given node.
 
@@ -130,7 +141,7 @@ class SuccessorDagNode(SuccessorDagNodeKey, RecordMixin[SuccessorDagNodeKey]):
 
             for field_name, field_value in node_fields.items():
                 if isinstance(field_value, SuccessorDagNodeKey):
-                    loaded_node = Context.current().load_one(SuccessorDagNodeKey, field_value)
+                    loaded_node = load_node(field_value)
                     if loaded_node is None:
                         SuccessorDagNode.__append_empty_node(
                             source_node=source_node,
@@ -165,7 +176,7 @@ class SuccessorDagNode(SuccessorDagNodeKey, RecordMixin[SuccessorDagNodeKey]):
                             if edges_names and len(edges_names) == len(field_value):
                                 edge_label = edges_names[index - 1]
 
-                        loaded_node = Context.current().load_one(SuccessorDagNodeKey, node_key)
+                        loaded_node = load_node(node_key)
                         if loaded_node is None:
                             SuccessorDagNode.__append_empty_node(
                                 source_node=source_node,
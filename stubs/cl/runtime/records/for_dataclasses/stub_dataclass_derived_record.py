@@ -13,6 +13,9 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from typing import List
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.type_index_decl import TypeIndexDecl
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_record import StubDataclassRecord
 
 
@@ -23,6 +26,11 @@ class StubDataclassDerivedRecord(StubDataclassRecord):
     derived_field: str = "derived"
     """Stub field."""
 
+    @classmethod
+    def get_indexes(cls) -> List[TypeIndexDecl]:
+        """Secondary indexes for the table of this type."""
+        return [TypeIndexDecl(elements=[IndexDecl(name="derived_field")])]
+
     def non_virtual_derived_handler(self) -> None:
         pass
 
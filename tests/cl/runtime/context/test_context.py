@@ -13,8 +13,10 @@
 # limitations under the License.
 
 import pytest
+import asyncio
 from cl.runtime.context.context import Context
 from cl.runtime.context.testing_context import TestingContext
+from stubs.cl.runtime import StubDataclassRecord
 
 
 def test_context_manager():
@@ -46,5 +48,123 @@ def test_context_manager():
         Context.current()
 
 
+def test_batch():
+    """Test buffering of save and delete operations in 'with context.batch()' block."""
+
+    with TestingContext() as context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(3)]
+        keys = [record.get_key() for record in records]
+        context.save_one(records[2])
+
+        # Save calls made inside the block are written together at the end of the outermost block
+        with context.batch():
+            with context.batch():
+                context.save_one(records[0])
+                context.save_many(records[1:2])
+                context.delete_one(StubDataclassRecord, keys[2])
+
+            # Buffered operations are not yet written but are visible through the context
+            assert list(context.db.load_many(StubDataclassRecord, keys)) == [None, None, records[2]]
+            assert context.load_one(StubDataclassRecord, keys[0]) is records[0]
+            assert context.load_one(StubDataclassRecord, keys[2], is_record_optional=True) is None
+            assert context.load_many(StubDataclassRecord, keys) == [records[0], records[1], None]
+
+            # Later operation for the same key replaces the earlier one
+            context.delete_many([keys[1]])
+            assert context.load_one(StubDataclassRecord, keys[1], is_record_optional=True) is None
+
+        assert list(context.load_many(StubDataclassRecord, keys)) == [records[0], None, None]
+
+        # Queries write the batch before reading
+        with context.batch():
+            context.save_one(records[1])
+            assert len(list(context.load_all(StubDataclassRecord))) == 2
+
+        # Buffered operations are discarded when the block exits with an exception
+        with pytest.raises(RuntimeError):
+            with context.batch():
+                context.delete_many(keys)
+                raise RuntimeError("Test error")
+        assert list(context.load_many(StubDataclassRecord, keys)) == records[:2] + [None]
+
+        # Records passed as keys are deleted directly after writing the batch, in the same way as in delete_one
+        with context.batch():
+            context.save_one(records[2])
+            context.delete_many([records[0]])
+            assert list(context.db.load_many(StubDataclassRecord, keys)) == [None, records[1], records[2]]
+            context.delete_many([keys[1]])
+            assert context.db.load_one(StubDataclassRecord, keys[1]) == records[1]
+        assert list(context.load_many(StubDataclassRecord, keys)) == [None, None, records[2]]
+
+
+def test_identity_map():
+    """Test returning the same record instance for the same key when 'use_identity_map' is set."""
+
+    with TestingContext() as root_context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(2)]
+        keys = [record.get_key() for record in records]
+        root_context.save_many(records)
+
+        # Without identity map, each load returns a new instance
+        assert root_context.load_one(StubDataclassRecord, keys[0]) is not root_context.load_one(
+            StubDataclassRecord, keys[0]
+        )
+
+        with Context(use_identity_map=True) as context:
+            # Repeated loads return the same instance
+            loaded = context.load_one(StubDataclassRecord, keys[0])
+            assert loaded == records[0]
+            assert context.load_one(StubDataclassRecord, keys[0]) is loaded
+
+            # Duplicate keys are loaded once and merged with the records already in the identity map
+            loaded_many = context.load_many(StubDataclassRecord, [keys[1], keys[0], keys[1]])
+            assert loaded_many[1] is loaded
+            assert loaded_many[0] is loaded_many[2]
+            assert loaded_many[0] == records[1]
+
+            # Records saved through the context replace the loaded records, deleted records are removed
+            updated = StubDataclassRecord(id="id0")
+            context.save_one(updated)
+            assert context.load_one(StubDataclassRecord, keys[0]) is updated and updated is not loaded
+            context.delete_one(StubDataclassRecord, keys[1])
+            assert context.load_one(StubDataclassRecord, keys[1], is_record_optional=True) is None
+
+            # Records saved inside a batch are removed until the batch is written
+            with context.batch():
+                context.save_one(records[0])
+            assert context.load_one(StubDataclassRecord, keys[0]) == records[0]
+
+        # The identity map is discarded on exiting from 'with' clause
+        with Context(use_identity_map=True) as context:
+            assert context.load_one(StubDataclassRecord, keys[0]) is not loaded
+
+
+def test_async_methods():
+    """Test that async methods use the same batch and identity map as their sync counterparts."""
+
+    async def run_test(context: Context):
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(2)]
+        keys = [record.get_key() for record in records]
+
+        # Async saves inside a batch are buffered and visible to async loads
+        with context.batch():
+            await context.save_one_async(records[0])
+            await context.save_many_async(records[1:])
+            assert list(context.db.load_many(StubDataclassRecord, keys)) == [None, None]
+            assert await context.load_one_async(StubDataclassRecord, keys[0]) is records[0]
+            await context.delete_many_async([keys[1]])
+            assert await context.load_many_async(StubDataclassRecord, keys) == [records[0], None]
+        assert await context.count_all_async(StubDataclassRecord) == 1
+
+        # Async loads return the instances from the identity map
+        loaded = await context.load_one_async(StubDataclassRecord, keys[0])
+        assert loaded == records[0]
+        assert context.load_one(StubDataclassRecord, keys[0]) is loaded
+
+    with TestingContext():
+        with Context(use_identity_map=True) as context:
+            asyncio.run(run_test(context))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,72 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import asyncio
+import threading
+import time
+from cl.runtime.context.context import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.context.thread_pool_util import ThreadPoolUtil
+
+
+def _get_current_context(context_id: str | None = None) -> tuple[Context, str]:
+    """Return current context and thread name, optionally entering a nested context inside the worker."""
+    if context_id is not None:
+        with Context(context_id=context_id):
+            assert Context.current().context_id == context_id
+    return Context.current(), threading.current_thread().name
+
+
+def test_context_propagation():
+    """Test that the current context is available in the worker thread."""
+
+    async def run_test():
+        with TestingContext() as context:
+            worker_context, thread_name = await ThreadPoolUtil.run(_get_current_context)
+            assert worker_context is context
+            assert thread_name != threading.current_thread().name
+
+            # Context entered inside the worker does not change the context stack of the caller
+            worker_context, _ = await ThreadPoolUtil.run(_get_current_context, context_id="nested")
+            assert worker_context is context
+            assert Context.current() is context
+
+    asyncio.run(run_test())
+
+
+def test_event_loop_not_blocked():
+    """Test that blocking work in the thread pool does not block other coroutines."""
+
+    async def run_test():
+        ticks = []
+
+        async def tick():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        with TestingContext():
+            start = time.monotonic()
+            await asyncio.gather(ThreadPoolUtil.run(time.sleep, 0.2), tick())
+
+        # All ticks happened while the blocking call was running
+        assert len(ticks) == 5
+        assert ticks[-1] - start < 0.15
+
+    asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,145 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+from cl.runtime.context.context import Context
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.local.cached_db import CachedDb
+from cl.runtime.db.sql.sqlite_db import SqliteDb
+from cl.runtime.records.class_info import ClassInfo
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+def test_immutable_types():
+    """Test caching of immutable types and invalidation on save and delete."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        base_db = context.db
+        cached_db = CachedDb(
+            db_id="temp;test_immutable_types", base_db=base_db, immutable_types=["StubDataclassRecordKey"]
+        )
+        record = StubDataclassDerivedRecord(id="abc", derived_field="a")
+        key = record.get_key()
+        cached_db.save_one(record)
+
+        # The second load is returned from cache, a record saved directly to base_db is not seen
+        assert cached_db.load_one(StubDataclassRecord, key) == record
+        assert cached_db.load_one(StubDataclassRecord, key, dataset="\\A") == record
+        base_db.save_one(StubDataclassDerivedRecord(id="abc", derived_field="b"))
+        assert cached_db.load_one(StubDataclassRecord, key) == record
+        assert cached_db.load_one(StubDataclassRecord, key, dataset="\\A") == record
+        assert cached_db.get_cache().hit_count == 2
+
+        # Saving through the cached database invalidates the key in all datasets
+        updated_record = StubDataclassDerivedRecord(id="abc", derived_field="c")
+        cached_db.save_one(updated_record)
+        assert cached_db.load_one(StubDataclassRecord, key) == updated_record
+        assert cached_db.load_one(StubDataclassRecord, key, dataset="\\A") == updated_record
+
+        # Deleting through the cached database invalidates the key
+        cached_db.delete_one(StubDataclassRecord.get_key_type(), key)
+        assert cached_db.load_many(StubDataclassRecord, [key]) == [None]
+
+        # Types without a policy are not cached
+        singleton = StubDataclassSingleton()
+        cached_db.save_one(singleton)
+        cached_db.load_one(StubDataclassSingleton, singleton.get_key())
+        assert cached_db.load_one(StubDataclassSingleton, singleton.get_key()) == singleton
+        assert cached_db.get_cache().get_entry_count() == 0
+        cached_db.clear_cache()
+
+
+def test_ttl():
+    """Test cached records expire after the time specified for their type."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        base_db = context.db
+        cached_db = CachedDb(db_id="temp;test_ttl", base_db=base_db, type_ttls={"StubDataclassRecordKey": 0.1})
+        record = StubDataclassRecord(id="abc")
+        cached_db.save_one(record)
+        assert cached_db.load_one(StubDataclassRecord, record.get_key()) == record
+
+        # Record saved directly to base_db is seen after the cached record expires
+        updated_record = StubDataclassDerivedRecord(id="abc")
+        base_db.save_one(updated_record)
+        assert cached_db.load_one(StubDataclassRecord, record.get_key()) == record
+        time.sleep(0.2)
+        assert cached_db.load_one(StubDataclassRecord, record.get_key()) == updated_record
+        cached_db.clear_cache()
+
+
+def test_write_behind():
+    """Test records are written to base database on context exit in write-behind mode."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        base_db = context.db
+        cached_db = CachedDb(db_id="temp;test_write_behind", base_db=base_db, write_behind=True)
+        records = [StubDataclassRecord(id=str(i)) for i in range(3)]
+        keys = [x.get_key() for x in records]
+        with Context(db=cached_db) as cached_context:
+            cached_context.save_many(records[:2])
+            cached_context.save_one(records[2], dataset="\\A")
+            assert list(base_db.load_many(StubDataclassRecord, keys)) == [None, None, None]
+
+            # Pending records are written before loading from base database
+            assert cached_context.load_one(StubDataclassRecord, keys[0]) == records[0]
+            cached_context.save_one(StubDataclassDerivedRecord(id="3"))
+            assert (
+                base_db.load_one(StubDataclassRecord, StubDataclassRecord(id="3").get_key(), is_record_optional=True)
+                is None
+            )
+
+        # Pending records are written on context exit
+        assert base_db.load_one(StubDataclassRecord, StubDataclassRecord(id="3").get_key()) is not None
+        assert list(base_db.load_many(StubDataclassRecord, keys, dataset="\\A")) == records
+
+
+def test_threads():
+    """Test saving and loading records through the cached database from more than one thread."""
+
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        cached_db = CachedDb(
+            db_id="temp;test_threads",
+            base_db=context.db,
+            immutable_types=["StubDataclassRecordKey"],
+            max_entries=50,
+            write_behind=True,
+        )
+
+        def save_and_load(i: int):
+            records = [StubDataclassRecord(id=f"thread{i}_{j}") for j in range(20)]
+            keys = [x.get_key() for x in records]
+            for _ in range(5):
+                cached_db.save_many(records)
+                assert cached_db.load_many(StubDataclassRecord, keys) == records
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(save_and_load, range(8)))
+
+        cached_db.flush()
+        assert context.count_all(StubDataclassRecord) == 8 * 20
+        assert cached_db.get_cache().get_entry_count() <= 50
+        cached_db.clear_cache()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
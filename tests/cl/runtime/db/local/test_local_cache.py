@@ -13,7 +13,12 @@
 # limitations under the License.
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from cl.runtime.db.local.cache_eviction_policy_enum import CacheEvictionPolicyEnum
 from cl.runtime.db.local.local_cache import LocalCache
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from stubs.cl.runtime import StubDataclassDerivedRecord
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_record import StubDataclassRecord
 
 
@@ -46,5 +51,121 @@ def test_smoke():
     assert cache.load_one(StubDataclassRecord, key) is record  # In case of local cache only, also the same object
 
 
+def test_load_all_filter_and_delete():
+    """Test load_all, load_filter, count and delete methods."""
+
+    cache = LocalCache()
+    records = [StubDataclassRecord(id=f"base{i}") for i in range(2)]
+    derived_records = [StubDataclassDerivedRecord(id=f"derived{i}", derived_field=str(i % 2)) for i in range(4)]
+    cache.save_many(records + derived_records)
+    cache.save_one(StubDataclassRecord(id="other_dataset"), dataset="\\A")
+
+    # Load all returns records of the specified type and its subtypes from the specified dataset
+    assert cache.load_all(StubDataclassRecord) == records + derived_records
+    assert cache.load_all(StubDataclassDerivedRecord) == derived_records
+    assert len(cache.load_all(StubDataclassRecord, dataset="\\A")) == 1
+
+    # Load filter matches the fields that are set in the filter object
+    filter_obj = StubDataclassDerivedRecord(id=None, derived_field="1")
+    assert cache.load_filter(StubDataclassDerivedRecord, filter_obj) == derived_records[1::2]
+
+    # Count methods use the same type, dataset and filter rules as the load methods
+    assert cache.count_all(StubDataclassRecord) == 6
+    assert cache.count_all(StubDataclassDerivedRecord) == 4
+    assert cache.count_all(StubDataclassRecord, dataset="\\A") == 1
+    assert cache.count_all(StubDataclassRecord, dataset="\\B") == 0
+    assert cache.count_filter(StubDataclassDerivedRecord, filter_obj) == 2
+    assert cache.count_filter(StubDataclassDerivedRecord, filter_obj, dataset="\\A") == 0
+
+    # Delete records
+    cache.delete_one(StubDataclassRecord.get_key_type(), records[0].get_key())
+    cache.delete_many([x.get_key() for x in derived_records[:2]])
+    assert cache.load_all(StubDataclassRecord) == records[1:] + derived_records[2:]
+    assert cache.get_entry_count() == 4
+
+
+def test_load_page():
+    """Test paging and sorting in load_all and load_filter methods."""
+
+    cache = LocalCache()
+    records = [StubDataclassDerivedRecord(id=f"id{i}", derived_field=str(i % 3)) for i in range(6)]
+    records.append(StubDataclassDerivedRecord(id="none", derived_field=None))
+    cache.save_many(records)
+
+    # Records are returned in the order of insertion when sort is not specified
+    assert cache.load_all(StubDataclassRecord, limit=2, skip=1) == records[1:3]
+    assert cache.load_all(StubDataclassRecord, skip=5) == records[5:]
+    assert cache.load_all(StubDataclassRecord, limit=0) == []
+    with pytest.raises(RuntimeError):
+        cache.load_all(StubDataclassRecord, limit=-1)
+
+    # None values are last in both directions
+    ascending = [IndexDecl(name="derived_field", direction=IndexSortOrderEnum.ASCENDING)]
+    assert [x.id for x in cache.load_all(StubDataclassRecord, sort=ascending)] == [
+        "id0", "id3", "id1", "id4", "id2", "id5", "none"
+    ]  # fmt: skip
+    descending = [IndexDecl(name="derived_field", direction=IndexSortOrderEnum.DESCENDING)]
+    assert [x.id for x in cache.load_all(StubDataclassRecord, sort=descending, limit=3)] == ["id2", "id5", "id1"]
+
+    # Filter with paging
+    filter_obj = StubDataclassDerivedRecord(id=None, derived_field="1")
+    assert cache.load_filter(StubDataclassDerivedRecord, filter_obj, skip=1) == [records[4]]
+
+
+def test_eviction():
+    """Test LRU and LFU eviction and counters."""
+
+    records = [StubDataclassRecord(id=f"id{i}") for i in range(4)]
+    keys = [x.get_key() for x in records]
+
+    # LRU evicts the least recently used record
+    cache = LocalCache(max_entries=3)
+    cache.save_many(records[:3])
+    cache.load_one(StubDataclassRecord, keys[0])
+    cache.save_one(records[3])
+    assert cache.load_many(StubDataclassRecord, keys) == [records[0], None, records[2], records[3]]
+    assert (cache.hit_count, cache.miss_count, cache.eviction_count) == (4, 1, 1)
+
+    # LFU evicts the least frequently used record
+    cache = LocalCache(max_entries=3, eviction_policy=CacheEvictionPolicyEnum.LFU)
+    cache.save_many(records[:3])
+    cache.load_many(StubDataclassRecord, [keys[0], keys[0], keys[1], keys[2], keys[1]])
+    cache.save_one(records[3])
+    assert cache.load_many(StubDataclassRecord, keys) == [records[0], records[1], None, records[3]]
+    assert cache.eviction_count == 1
+
+    # Size limit
+    cache = LocalCache(max_bytes=2 * LocalCache._get_size(records[0]))  # noqa
+    cache.save_many(records)
+    assert cache.get_entry_count() == 2
+    assert cache.byte_count <= cache.max_bytes
+    assert cache.eviction_count == 2
+
+    # Clear the cache
+    cache.delete_all_and_drop_db()
+    assert cache.get_entry_count() == 0
+    assert cache.byte_count == 0
+
+
+def test_threads():
+    """Test saving, loading and evicting records from more than one thread."""
+
+    cache = LocalCache(max_entries=50)
+
+    def save_and_load(i: int):
+        records = [StubDataclassRecord(id=f"thread{i}_{j}") for j in range(20)]
+        for _ in range(20):
+            cache.save_many(records)
+            cache.load_many(StubDataclassRecord, [x.get_key() for x in records])
+            cache.delete_one(StubDataclassRecord, records[0].get_key())
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(save_and_load, range(8)))
+
+    # Counters and entries are consistent after concurrent updates
+    assert cache.get_entry_count() <= 50
+    assert cache.hit_count + cache.miss_count == 8 * 20 * 20
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
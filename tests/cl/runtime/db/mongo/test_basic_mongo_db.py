@@ -13,9 +13,14 @@
 # limitations under the License.
 
 import pytest
+import asyncio
 from cl.runtime.context.testing_context import TestingContext
 from cl.runtime.db.mongo.basic_mongo_db import BasicMongoDb
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.testing.pytest.pytest_fixtures import mongomock_fixture  # noqa
+from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
 from stubs.cl.runtime import StubDataclassDerivedRecord
 from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_record import StubDataclassRecord
 
@@ -84,8 +89,81 @@ def test_load_filter():
         assert all(x.derived_field == filter_obj.derived_field for x in loaded_records)
 
 
-@pytest.mark.skip("Requires MongoDB server.")  # TODO: Switch test to MongoMock
-def test_smoke():
+def test_load_all(mongomock_fixture):
+    """Test 'load_all' method."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        base_records = [StubDataclassRecord(id=f"base{i}") for i in range(3)]
+        derived_records = [StubDataclassDerivedRecord(id=f"derived{i}") for i in range(3)]
+        derived_from_derived_records = [StubDataclassDerivedFromDerivedRecord(id="derived_from_derived")]
+        context.save_many(base_records + derived_records + derived_from_derived_records)
+
+        # Fetch in batches smaller than the number of records, result is returned lazily
+        context.db.fetch_size = 2
+        loaded_records = context.load_all(StubDataclassDerivedRecord)
+        assert not isinstance(loaded_records, list)
+        loaded_records = sorted(loaded_records, key=lambda x: x.id)
+        assert loaded_records == sorted(derived_records + derived_from_derived_records, key=lambda x: x.id)
+
+
+def test_load_page(mongomock_fixture):
+    """Test paging, sorting and counting in 'load_all' and 'load_filter' methods."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassDerivedRecord(id=f"id{i:02}", derived_field=str(i % 3)) for i in range(10)]
+        context.save_many(reversed(records))
+        context.save_one(StubDataclassRecord(id="other"))
+
+        # Pages are sorted by key when sort is not specified
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=3)) == records[:3]
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=3, skip=8)) == records[8:]
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=0)) == []
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=None, skip=8)) == records[8:]
+        with pytest.raises(RuntimeError):
+            list(context.load_all(StubDataclassDerivedRecord, limit=-1))
+        with pytest.raises(RuntimeError):
+            list(context.load_all(StubDataclassDerivedRecord, skip=-1))
+        assert context.count_all(StubDataclassDerivedRecord) == 10
+        assert context.count_all(StubDataclassRecord) == 11
+
+        # Sort by a non-key field
+        sort = [IndexDecl(name="derived_field", direction=IndexSortOrderEnum.DESCENDING)]
+        expected_records = sorted(records, key=lambda x: (-int(x.derived_field), x.id))
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=4, skip=1, sort=sort)) == expected_records[1:5]
+
+        # Filter with paging and count
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_field="1")
+        assert list(context.load_filter(StubDataclassDerivedRecord, filter_obj, limit=2, skip=1)) == records[4:8:3]
+        assert context.count_filter(StubDataclassDerivedRecord, filter_obj) == 3
+
+
+def test_async(mongomock_fixture):
+    """Test async methods."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassDerivedRecord(id=f"id{i}") for i in range(5)]
+        keys = [record.get_key() for record in records]
+
+        async def run_test():
+            await context.save_many_async(records)
+            loaded, count = await asyncio.gather(
+                context.load_many_async(StubDataclassDerivedRecord, keys),
+                context.count_all_async(StubDataclassDerivedRecord),
+            )
+            assert loaded == records
+            assert count == len(records)
+            assert await context.load_all_async(StubDataclassDerivedRecord, skip=3) == records[3:]
+
+            await context.delete_many_async(keys[:2])
+            assert await context.load_many_async(StubDataclassDerivedRecord, keys) == [None, None, *records[2:]]
+
+        asyncio.run(run_test())
+
+
+def test_smoke(mongomock_fixture):
     """Smoke test."""
 
     # TODO: Do not hardcode DB name
@@ -108,5 +186,66 @@ def test_smoke():
         assert context.load_one(StubDataclassRecord, key) == record  # Not the same object but equal
 
 
+def test_load_many(mongomock_fixture):
+    """Test 'load_many' method."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(5)]
+        derived_records = [StubDataclassDerivedRecord(id=f"derived{i}") for i in range(2)]
+        context.save_many(records + derived_records)
+
+        # Query in chunks smaller than the number of keys, results are in input order
+        context.db.batch_size = 2
+        expected_records = list(reversed(records + derived_records))
+        keys = [x.get_key() for x in expected_records]
+        unknown_key = StubDataclassRecord(id="unknown").get_key()
+        loaded_records = context.load_many(StubDataclassRecord, [keys[0], unknown_key, *keys[1:], keys[0], None])
+        assert loaded_records == [expected_records[0], None, *expected_records[1:], expected_records[0], None]
+
+        # Records are returned without lookup
+        assert context.load_many(StubDataclassRecord, [records[0]])[0] is records[0]
+
+
+def test_save_and_delete_many(mongomock_fixture):
+    """Test 'save_many' and 'delete_many' methods."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        # Save in batches smaller than the number of records
+        context.db.batch_size = 2
+        records = [StubDataclassRecord(id=f"id{i}") for i in range(5)]
+        derived_records = [StubDataclassDerivedRecord(id=f"derived{i}") for i in range(2)]
+        context.save_many(records + derived_records)
+        keys = [x.get_key() for x in records + derived_records]
+        assert context.load_many(StubDataclassRecord, keys) == records + derived_records
+
+        # Saving again replaces the documents with the same key
+        updated_records = [StubDataclassDerivedRecord(id=x.id, derived_field="updated") for x in records]
+        context.save_many(updated_records)
+        assert context.load_many(StubDataclassRecord, keys) == updated_records + derived_records
+        assert context.db._get_db()["StubDataclassRecordKey"].count_documents({}) == len(keys)  # noqa
+
+        # Delete in batches
+        context.delete_many(keys[1:])
+        assert context.load_many(StubDataclassRecord, keys) == [updated_records[0]] + [None] * (len(keys) - 1)
+
+
+def test_indexes(mongomock_fixture):
+    """Test indexes created on first access to a collection."""
+
+    db_class = ClassInfo.get_class_path(BasicMongoDb)
+    with TestingContext(db_class=db_class) as context:
+        context.save_one(StubDataclassDerivedRecord(id="abc"))
+        index_info = context.db._get_db()["StubDataclassRecordKey"].index_information()  # noqa
+        assert index_info["_key_1"]["unique"]
+        assert index_info["_type_1"]["key"] == [("_type", 1)]
+        assert index_info["derived_field"]["key"] == [("derived_field", 1)]
+
+        # Unique index on _key rejects a second document with the same key
+        with pytest.raises(Exception):
+            context.db._get_db()["StubDataclassRecordKey"].insert_one({"_key": "abc"})  # noqa
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,164 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import math
+import time
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.db.redis.redis_db import RedisDb
+from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.testing.pytest.pytest_fixtures import fakeredis_fixture  # noqa
+from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
+
+
+def test_smoke(fakeredis_fixture):
+    """Smoke test."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [
+            StubDataclassRecord(id="abc1"),
+            StubDataclassNestedFields(primitive="abc2"),
+            StubDataclassPrimitiveFields(key_str_field="abc3"),
+        ]
+        context.save_many(records)
+
+        # Records of different key types are returned in the order of keys, None for missing keys
+        keys = [record.get_key() for record in records]
+        missing_key = StubDataclassRecord(id="missing").get_key()
+        loaded_records = context.load_many(StubDataclassRecord, [keys[2], missing_key, *keys[:2], records[0], None])
+        assert loaded_records == [records[2], None, *records[:2], records[0], None]
+        assert context.load_one(StubDataclassRecord, keys[0]) == records[0]
+
+        # Delete
+        context.delete_one(StubDataclassRecord, keys[0])
+        assert context.load_one(StubDataclassRecord, keys[0], is_record_optional=True) is None
+        context.delete_many(keys[1:])
+        assert context.load_many(StubDataclassRecord, keys) == [None, None, None]
+
+
+def test_load_all_and_filter(fakeredis_fixture):
+    """Test load_all and load_filter methods."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        base_records = [StubDataclassRecord(id=f"base{i}") for i in range(2)]
+        derived_records = [StubDataclassDerivedRecord(id=f"derived{i}", derived_field=str(i % 2)) for i in range(4)]
+        derived_from_derived_records = [StubDataclassDerivedFromDerivedRecord(id="derived_from_derived")]
+        context.save_many(base_records + derived_records + derived_from_derived_records)
+
+        # Records are sorted by key
+        assert context.load_all(StubDataclassRecord) == base_records + derived_records + derived_from_derived_records
+        assert context.load_all(StubDataclassDerivedRecord) == derived_records + derived_from_derived_records
+        assert context.load_all(StubDataclassRecord, limit=2, skip=1) == [base_records[1], derived_records[0]]
+        sort = [IndexDecl(name="derived_field", direction=IndexSortOrderEnum.ASCENDING)]
+        assert context.load_all(StubDataclassDerivedRecord, sort=sort, limit=2) == derived_records[0::2]
+
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_field="1")
+        assert context.load_filter(StubDataclassDerivedRecord, filter_obj) == derived_records[1::2]
+        assert context.count_filter(StubDataclassDerivedRecord, filter_obj) == 2
+
+        # Record saved with another type under the same key is returned once, deleted records are not returned
+        replaced_record = StubDataclassDerivedRecord(id="base0")
+        context.save_one(replaced_record)
+        context.delete_one(StubDataclassRecord, derived_records[0].get_key())
+        loaded_records = context.load_all(StubDataclassRecord)
+        assert loaded_records == [replaced_record, base_records[1], *derived_records[1:], *derived_from_derived_records]
+        assert context.count_all(StubDataclassDerivedRecord) == 5
+
+
+def test_ttl(fakeredis_fixture):
+    """Test record expiration."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        context.db.type_ttls = {"StubDataclassRecordKey": 0.1}
+        record = StubDataclassRecord()
+        other_record = StubDataclassPrimitiveFields()
+        context.save_many([record, other_record])
+        assert context.load_one(StubDataclassRecord, record.get_key()) == record
+
+        # Only records of the key type with TTL expire
+        time.sleep(0.2)
+        assert context.load_one(StubDataclassRecord, record.get_key(), is_record_optional=True) is None
+        assert context.load_all(StubDataclassRecord) == []
+        assert context.load_one(StubDataclassPrimitiveFields, other_record.get_key()) == other_record
+
+
+def test_binary_format(fakeredis_fixture):
+    """Test saving records in binary format."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        json_record = StubDataclassPrimitiveFields(key_str_field="json")
+        context.save_one(json_record)
+
+        context.db.data_format = "binary"
+        binary_records = [StubDataclassRecord(id="binary"), StubDataclassPrimitiveFields(key_str_field="binary")]
+        context.save_many(binary_records)
+        binary_record_key = context.db._get_record_key(StubDataclassRecordKey, "binary")  # noqa
+        assert not context.db._get_client().get(binary_record_key).startswith(b"{")  # noqa
+
+        # Records saved in both formats are loaded
+        keys = [json_record.get_key(), *[record.get_key() for record in binary_records]]
+        assert context.load_many(StubDataclassRecord, keys) == [json_record, *binary_records]
+        assert len(context.load_all(StubDataclassPrimitiveFields)) == 2
+
+        # Error for unknown format
+        context.db.data_format = "xml"
+        with pytest.raises(RuntimeError):
+            context.save_one(json_record)
+
+
+def test_json_format_special_values(fakeredis_fixture):
+    """Test saving floats that are not finite and integers that do not fit into 64 bits in JSON format."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [
+            StubDataclassPrimitiveFields(key_str_field="nan", obj_float_field=float("nan")),
+            StubDataclassPrimitiveFields(key_str_field="inf", obj_float_field=-float("inf")),
+            StubDataclassPrimitiveFields(key_str_field="long", obj_long_field=2**70),
+        ]
+        context.save_many(records)
+
+        loaded = context.load_many(StubDataclassPrimitiveFields, [record.get_key() for record in records])
+        assert math.isnan(loaded[0].obj_float_field)
+        assert loaded[1:] == records[1:]
+
+
+def test_delete_all_and_drop_db(fakeredis_fixture):
+    """Test deleting all keys of the database."""
+
+    db_class = ClassInfo.get_class_path(RedisDb)
+    with TestingContext(db_class=db_class) as context:
+        context.save_many([StubDataclassRecord(id=f"id{i}") for i in range(5)])
+        other_db = RedisDb(db_id="temp;other")
+        other_db.save_one(StubDataclassRecord())
+
+        # Keys of other databases are not deleted
+        context.db.delete_all_and_drop_db()
+        assert context.load_all(StubDataclassRecord) == []
+        assert len(other_db.load_all(StubDataclassRecord)) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
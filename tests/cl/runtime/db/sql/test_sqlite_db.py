@@ -13,12 +13,18 @@
 # limitations under the License.
 
 import pytest
+import asyncio
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Iterable
 from cl.runtime.context.testing_context import TestingContext
 from cl.runtime.db.sql.sqlite_db import SqliteDb
 from cl.runtime.records.class_info import ClassInfo
+from cl.runtime.schema.index_decl import IndexDecl
+from cl.runtime.schema.index_sort_order_enum import IndexSortOrderEnum
+from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
 from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
 from stubs.cl.runtime import StubDataclassDerivedRecord
 from stubs.cl.runtime import StubDataclassDictFields
@@ -174,6 +180,320 @@ def test_load_all():
         loaded_records = context.load_all(StubDataclassDerivedRecord)
         assert _assert_equals_iterable_without_ordering(derived_samples, loaded_records)
 
+        # Fetch in batches smaller than the number of records
+        context.db.fetch_size = 2
+        loaded_records = context.load_all(StubDataclassRecord)
+        assert _assert_equals_iterable_without_ordering(all_samples, loaded_records)
+
+
+def test_save_many_in_chunks():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Use more records than the batch size and the SQLite variable limit to check chunking
+        context.db.batch_size = 100
+        samples = [StubDataclassPrimitiveFields(key_str_field=f"key{i}") for i in range(2500)]
+        context.save_many(samples)
+
+        sample_keys = [sample.get_key() for sample in samples]
+        loaded_records = [context.load_one(type(key), key) for key in sample_keys[::250]]
+        assert loaded_records == samples[::250]
+        assert len(list(context.load_all(StubDataclassPrimitiveFields))) == len(samples)
+
+
+def test_load_and_delete_many_in_chunks():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Use small chunk and fetch sizes to check chunking and streaming with a moderate number of records
+        context.db.variable_limit = 10
+        context.db.fetch_size = 3
+        samples = [StubDataclassRecord(id=f"id{i}") for i in range(50)]
+        context.save_many(samples)
+
+        # Results are returned in the order of keys, including duplicate and missing keys
+        keys = [sample.get_key() for sample in reversed(samples)]
+        missing_key = StubDataclassRecord(id="missing").get_key()
+        loaded_records = list(context.load_many(StubDataclassRecord, [keys[0], missing_key, *keys, keys[0]]))
+        assert loaded_records == [samples[-1], None, *reversed(samples), samples[-1]]
+
+        # Delete every other record
+        context.delete_many(keys[::2])
+        loaded_records = list(context.load_many(StubDataclassRecord, keys))
+        assert loaded_records == [None if i % 2 == 0 else x for i, x in enumerate(reversed(samples))]
+
+
+def test_add_columns_to_existing_table():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Create a table with only the key column as though it was created by an earlier version of the record
+        schema_manager = context.db._get_schema_manager()  # noqa
+        columns_mapping = schema_manager.get_columns_mapping(StubDataclassRecord.get_key_type())
+        table_name = schema_manager.table_name_for_type(StubDataclassRecord)
+        key_column = columns_mapping["id"]
+        schema_manager.create_table(table_name, ["_type", key_column], primary_keys=[key_column])
+
+        # Saving a record with fields not yet in the table adds the missing columns
+        record = StubDataclassDerivedRecord(id="abc")
+        context.save_one(record)
+        assert context.load_one(StubDataclassDerivedRecord, record.get_key()) == record
+
+
+def test_load_filter():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Create test record and populate with sample data
+        offset = 0
+        matching_records = [StubDataclassDerivedRecord(id=str(offset + i), derived_field="a") for i in range(2)]
+        offset = len(matching_records)
+        non_matching_records = [StubDataclassDerivedRecord(id=str(offset + i), derived_field="b") for i in range(2)]
+        other_records = [StubDataclassRecord(id="other")]
+        context.save_many(matching_records + non_matching_records + other_records)
+
+        # Load using filter
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_field="a")
+        loaded_records = context.load_filter(StubDataclassDerivedRecord, filter_obj)
+        assert _assert_equals_iterable_without_ordering(matching_records, loaded_records)
+
+        # Filter on more than one field
+        filter_obj = StubDataclassDerivedRecord(id="1", derived_field="a")
+        assert list(context.load_filter(StubDataclassDerivedRecord, filter_obj)) == [matching_records[1]]
+
+        # The index declared by the record type is used by the query
+        connection = context.db._get_connection()  # noqa
+        query_plan = connection.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM "StubDataclassRecordKey" '
+            'WHERE "StubDataclassDerivedRecord.derived_field" = ?;',
+            ("a",),
+        ).fetchall()
+        assert "StubDataclassRecordKey_derived_field_index" in str(query_plan)
+
+
+def test_load_filter_legacy_format():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        records = [StubDataclassListFields(id=str(i)) for i in range(2)]
+        records.append(StubDataclassListFields(id="2", float_list=[1.0, float("nan"), float("inf")]))
+        context.save_many(records)
+
+        # Store the list in the first row as it was saved before complex fields were encoded in a single pass
+        schema_manager = context.db._get_schema_manager()  # noqa
+        columns_mapping = schema_manager.get_columns_mapping(StubDataclassListFields.get_key_type())
+        table_name = schema_manager.table_name_for_type(StubDataclassListFields)
+        legacy_value = "```LIST " + json.dumps(records[0].float_list)
+        connection = context.db._get_connection()  # noqa
+        connection.execute(
+            f'UPDATE "{table_name}" SET "{columns_mapping["float_list"]}" = ? WHERE "{columns_mapping["id"]}" = ?;',
+            (legacy_value, "0"),
+        )
+        connection.commit()
+
+        # Filter on a complex field matches rows in both formats
+        filter_obj = StubDataclassListFields(id=None, float_list=records[0].float_list)
+        loaded_records = context.load_filter(StubDataclassListFields, filter_obj)
+        assert _assert_equals_iterable_without_ordering(records[:2], loaded_records)
+
+
+def test_load_page():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        samples = [StubDataclassDerivedRecord(id=f"id{i:02}", derived_field=str(i % 3)) for i in range(10)]
+        context.save_many(reversed(samples))
+        context.save_one(StubDataclassRecord(id="other"))
+
+        # Pages are sorted by key fields when sort is not specified
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=3)) == samples[:3]
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=3, skip=8)) == samples[8:]
+        assert list(context.load_all(StubDataclassDerivedRecord, skip=7)) == samples[7:]
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=0)) == []
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=None, skip=8)) == samples[8:]
+        with pytest.raises(RuntimeError):
+            list(context.load_all(StubDataclassDerivedRecord, limit=-1))
+        with pytest.raises(RuntimeError):
+            list(context.load_all(StubDataclassDerivedRecord, skip=-1))
+        assert context.count_all(StubDataclassDerivedRecord) == 10
+        assert context.count_all(StubDataclassRecord) == 11
+
+        # Sort by a non-key field, key fields are used as tie-breakers
+        sort = [IndexDecl(name="derived_field", direction=IndexSortOrderEnum.DESCENDING)]
+        expected_records = sorted(samples, key=lambda x: (-int(x.derived_field), x.id))
+        assert list(context.load_all(StubDataclassDerivedRecord, limit=4, skip=1, sort=sort)) == expected_records[1:5]
+
+        # Filter with paging and count
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_field="1")
+        assert list(context.load_filter(StubDataclassDerivedRecord, filter_obj, limit=2, skip=1)) == samples[4:8:3]
+        assert context.count_filter(StubDataclassDerivedRecord, filter_obj) == 3
+
+        # Paging is applied after dataset lookup
+        context.save_one(StubDataclassDerivedRecord(id="id00", derived_field="1"), dataset="\\A")
+        assert context.count_filter(StubDataclassDerivedRecord, filter_obj, dataset="\\A") == 4
+        loaded_records = list(context.load_filter(StubDataclassDerivedRecord, filter_obj, dataset="\\A", limit=2))
+        assert [x.id for x in loaded_records] == ["id00", "id01"]
+
+        # Unknown sort field
+        with pytest.raises(RuntimeError):
+            list(context.load_all(StubDataclassDerivedRecord, sort=[IndexDecl(name="unknown")]))
+
+
+def test_pooled_connections():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        context.db.pooled = True
+        connection = context.db._get_connection()  # noqa
+        assert connection.execute("PRAGMA journal_mode;").fetchone()["journal_mode"] == "wal"
+
+        def save_and_load(i: int):
+            """Save and load records from a separate thread using the connection for this thread."""
+            records = [StubDataclassRecord(id=f"thread{i}_{j}") for j in range(20)]
+            context.db.save_many(records)
+            loaded_records = list(context.db.load_many(StubDataclassRecord, [x.get_key() for x in records]))
+            assert loaded_records == records
+            return context.db._get_connection()  # noqa
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            thread_connections = list(executor.map(save_and_load, range(8)))
+
+        # Each thread uses its own connection, all records are visible to this thread
+        assert connection not in thread_connections
+        assert len(list(context.load_all(StubDataclassRecord))) == 8 * 20
+
+
+def test_shared_connection_threads():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # The connection is shared by all threads when pooled is False
+        assert not context.db.pooled
+        context.db.batch_size = 5
+
+        def save_load_and_delete(i: int):
+            """Save, load and delete records from a separate thread using the shared connection."""
+            records = [StubDataclassDerivedRecord(id=f"thread{i}_{j}", derived_field=str(i)) for j in range(20)]
+            keys = [x.get_key() for x in records]
+            for _ in range(5):
+                context.db.save_many(records)
+                assert list(context.db.load_many(StubDataclassDerivedRecord, keys)) == records
+                filter_obj = StubDataclassDerivedRecord(id=None, derived_field=str(i))
+                assert list(context.db.load_filter(StubDataclassDerivedRecord, filter_obj)) == records
+                context.db.delete_many(keys[10:])
+                assert context.db.count_filter(StubDataclassDerivedRecord, filter_obj) == 10
+            return context.db._get_connection()  # noqa
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            thread_connections = set(executor.map(save_load_and_delete, range(8)))
+
+        # All threads use the same connection, transactions do not interleave
+        assert thread_connections == {context.db._get_connection()}  # noqa
+        assert context.count_all(StubDataclassDerivedRecord) == 8 * 10
+
+
+def test_async():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Pooled connections allow queries from more than one worker thread to run at the same time
+        context.db.pooled = True
+        samples = [StubDataclassDerivedRecord(id=f"id{i}", derived_field=str(i % 2)) for i in range(10)]
+        keys = [sample.get_key() for sample in samples]
+
+        async def run_test():
+            await context.save_many_async(samples[1:])
+            await context.save_one_async(samples[0])
+
+            # Run several queries concurrently, lazy results are returned as lists
+            filter_obj = StubDataclassDerivedRecord(id=None, derived_field="1")
+            loaded, loaded_all, loaded_filter, count = await asyncio.gather(
+                context.load_many_async(StubDataclassDerivedRecord, keys),
+                context.load_all_async(StubDataclassDerivedRecord, limit=3),
+                context.load_filter_async(StubDataclassDerivedRecord, filter_obj),
+                context.count_all_async(StubDataclassDerivedRecord),
+            )
+            assert loaded == samples
+            assert loaded_all == samples[:3]
+            assert loaded_filter == samples[1::2]
+            assert count == len(samples)
+            assert await context.load_one_async(StubDataclassDerivedRecord, keys[0]) == samples[0]
+
+            await context.delete_one_async(StubDataclassDerivedRecord, keys[0])
+            await context.delete_many_async(keys[1:5])
+            assert await context.count_all_async(StubDataclassDerivedRecord) == 5
+
+        asyncio.run(run_test())
+
+
+def test_datasets():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Records in the root dataset are visible in child datasets
+        root_records = [StubDataclassDerivedRecord(id=str(i), derived_field="root") for i in range(3)]
+        context.save_many(root_records)
+        keys = [x.get_key() for x in root_records]
+        assert list(context.load_many(StubDataclassDerivedRecord, keys, dataset="\\A\\B")) == root_records
+
+        # Record saved to a child dataset overrides the record with the same key in its descendants only
+        a_record = StubDataclassDerivedRecord(id="1", derived_field="a")
+        context.save_one(a_record, dataset="\\A")
+        expected_records = [root_records[0], a_record, root_records[2]]
+        assert list(context.load_many(StubDataclassDerivedRecord, keys)) == root_records
+        assert list(context.load_many(StubDataclassDerivedRecord, keys, dataset="\\A")) == expected_records
+        assert list(context.load_many(StubDataclassDerivedRecord, keys, dataset="\\A\\B")) == expected_records
+        assert list(context.load_many(StubDataclassDerivedRecord, keys, dataset="\\C")) == root_records
+
+        # Load all and load filter return one record per key from the nearest dataset
+        loaded_records = context.load_all(StubDataclassDerivedRecord, dataset="\\A\\B")
+        assert _assert_equals_iterable_without_ordering(expected_records, loaded_records)
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_field="root")
+        loaded_records = context.load_filter(StubDataclassDerivedRecord, filter_obj, dataset="\\A")
+        assert _assert_equals_iterable_without_ordering([root_records[0], root_records[2]], loaded_records)
+
+        # Deleting from the child dataset makes the record from the parent dataset visible again
+        context.delete_one(StubDataclassDerivedRecord.get_key_type(), a_record.get_key(), dataset="\\A")
+        assert list(context.load_many(StubDataclassDerivedRecord, keys, dataset="\\A")) == root_records
+
+        # Singleton records are stored separately for each dataset
+        context.save_one(StubDataclassSingleton(str_field="root"))
+        context.save_one(StubDataclassSingleton(str_field="a"), dataset="\\A")
+        singleton_key = StubDataclassSingleton().get_key()
+        assert context.load_one(StubDataclassSingleton, singleton_key).str_field == "root"
+        assert context.load_one(StubDataclassSingleton, singleton_key, dataset="\\A\\B").str_field == "a"
+
+
+def test_table_without_dataset_column():
+    db_class = ClassInfo.get_class_path(SqliteDb)
+    with TestingContext(db_class=db_class) as context:
+        # Create a table and its key index in the layout used before datasets were added
+        schema_manager = context.db._get_schema_manager()  # noqa
+        columns_mapping = schema_manager.get_columns_mapping(StubDataclassRecord.get_key_type())
+        table_name = schema_manager.table_name_for_type(StubDataclassRecord)
+        columns_str = ", ".join(f'"{column}"' for column in columns_mapping.values())
+        connection = context.db._get_connection()  # noqa
+        connection.execute(f'CREATE TABLE "{table_name}" ({columns_str});')
+        connection.execute(
+            f'CREATE UNIQUE INDEX "{table_name}_key_index" ON "{table_name}" ("{columns_mapping["id"]}");'
+        )
+
+        # Insert rows without saving through the database
+        records = [StubDataclassDerivedRecord(id=str(i), derived_field="a" if i else "b") for i in range(3)]
+        serializer = FlatDictSerializer()
+        fields = tuple(columns_mapping.keys())
+        connection.executemany(
+            f'INSERT INTO "{table_name}" ({columns_str}) VALUES ({", ".join(["?"] * len(fields))});',
+            [
+                tuple(serializer.serialize_data(record, is_root=True).get(field) for field in fields)
+                for record in records
+            ],
+        )
+        connection.commit()
+
+        # The table is migrated before the first read or delete, so the existing rows are found
+        keys = [record.get_key() for record in records]
+        filter_obj = StubDataclassDerivedRecord(id=None, derived_field="a")
+        assert context.load_one(StubDataclassDerivedRecord, keys[0]) == records[0]
+        assert _assert_equals_iterable_without_ordering(records, context.load_all(StubDataclassDerivedRecord))
+        assert _assert_equals_iterable_without_ordering(
+            records[1:], context.load_filter(StubDataclassDerivedRecord, filter_obj)
+        )
+        assert context.count_all(StubDataclassDerivedRecord) == 3
+        assert context.count_filter(StubDataclassDerivedRecord, filter_obj) == 2
+        context.delete_many(keys[:2])
+        assert list(context.load_many(StubDataclassDerivedRecord, keys)) == [None, None, records[2]]
+
 
 @pytest.mark.skip("Performance test.")
 def test_performance():
@@ -103,5 +103,75 @@ def test_get_columns_mapping():
     assert expected_columns == resolved_columns
 
 
+def test_metadata_cache():
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = dict_factory
+    schema_manager = SqliteSchemaManager(sqlite_connection=connection)
+
+    # Column mappings and primary keys are computed once and reused
+    columns_mapping = schema_manager.get_columns_mapping(StubDataclassRecordKey)
+    assert schema_manager.get_columns_mapping(StubDataclassRecordKey) is columns_mapping
+    reversed_columns_mapping = schema_manager.get_reversed_columns_mapping(StubDataclassRecordKey)
+    assert reversed_columns_mapping == {v: k for k, v in columns_mapping.items()}
+    assert schema_manager.get_primary_keys(StubDataclassRecordKey) == ("id",)
+
+    # Tables created or dropped by the schema manager update the cache
+    table_name = schema_manager.table_name_for_type(StubDataclassRecordKey)
+    assert not schema_manager.has_table(table_name)
+    schema_manager.create_table(table_name, columns_mapping.values(), primary_keys=[columns_mapping["id"]])
+    assert schema_manager.has_table(table_name)
+    schema_manager.delete_table_by_name(table_name)
+    assert not schema_manager.has_table(table_name)
+
+    # Tables created by another connection are detected on cache miss
+    connection.execute('CREATE TABLE "OtherTable" ("a");')
+    assert schema_manager.has_table("OtherTable")
+    connection.close()
+
+
+def test_add_missing_columns():
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = dict_factory
+    schema_manager = SqliteSchemaManager(sqlite_connection=connection)
+
+    # Create table with some of the columns and insert a row
+    schema_manager.create_table("StubTable", ["a", "b"], primary_keys=["a"])
+    connection.execute('INSERT INTO "StubTable" ("_dataset", "a", "b") VALUES (?, 1, 2);', ("\\",))
+    connection.commit()
+
+    # Missing columns are added in place, existing data is preserved
+    schema_manager.create_table("StubTable", ["a", "b", "c", "d"], primary_keys=["a"])
+    assert schema_manager.get_table_columns("StubTable") == {"_dataset", "a", "b", "c", "d"}
+    assert connection.execute('SELECT * FROM "StubTable";').fetchall() == [
+        {"_dataset": "\\", "a": 1, "b": 2, "c": None, "d": None}
+    ]
+
+    # Columns added by another connection are detected in a new schema manager
+    connection.execute('ALTER TABLE "StubTable" ADD COLUMN "e";')
+    other_schema_manager = SqliteSchemaManager(sqlite_connection=connection)
+    assert other_schema_manager.add_missing_columns("StubTable", ["a", "e", "f"]) == ["f"]
+    connection.close()
+
+
+def test_add_dataset_column():
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = dict_factory
+    schema_manager = SqliteSchemaManager(sqlite_connection=connection)
+
+    # Create table without the dataset column and with the key index used before datasets were introduced
+    connection.execute('CREATE TABLE "StubTable" ("a", "b");')
+    connection.execute('CREATE UNIQUE INDEX "StubTable_key_index" ON "StubTable" ("a");')
+    connection.execute('INSERT INTO "StubTable" ("a", "b") VALUES (1, 2);')
+    connection.commit()
+
+    # Existing rows are assigned to the root dataset and the same key can be stored in another dataset
+    schema_manager.create_table("StubTable", ["a", "b"], primary_keys=["a"])
+    assert connection.execute('SELECT * FROM "StubTable";').fetchall() == [{"a": 1, "b": 2, "_dataset": "\\"}]
+    connection.execute('INSERT INTO "StubTable" ("_dataset", "a", "b") VALUES (?, 1, 3);', ("\\A",))
+    index_names = {x["name"] for x in connection.execute('PRAGMA index_list("StubTable");').fetchall()}
+    assert index_names == {"StubTable_dataset_key_index"}
+    connection.close()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -23,5 +23,14 @@ def test_is_empty():
     assert not ListUtil.is_empty([1])
 
 
+def test_chunks():
+    """Test splitting an iterable into chunks."""
+    assert list(ListUtil.chunks([], 2)) == []
+    assert list(ListUtil.chunks([1, 2, 3], 2)) == [(1, 2), (3,)]
+    assert list(ListUtil.chunks((x for x in range(4)), 2)) == [(0, 1), (2, 3)]
+    with pytest.raises(RuntimeError):
+        list(ListUtil.chunks([1], 0))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -13,9 +13,40 @@
 # limitations under the License.
 
 import pytest
+from dataclasses import dataclass
+from typing import Type
+from cl.runtime.records.key_mixin import KeyMixin
 from cl.runtime.records.key_util import KeyUtil
 from cl.runtime.schema.module_decl import ModuleDecl
 from cl.runtime.schema.type_decl import TypeDecl
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassRecordKey
+from stubs.cl.runtime import StubDataclassSingleton
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_nested_fields_key import StubDataclassNestedFieldsKey
+
+
+@dataclass(slots=True, kw_only=True)
+class _StubBaseKey(KeyMixin):
+    """Key with a single field."""
+
+    id: str | None = None
+    """Unique identifier."""
+
+    @classmethod
+    def get_key_type(cls) -> Type:
+        return _StubBaseKey
+
+
+@dataclass(slots=True, kw_only=True)
+class _StubDerivedKey(_StubBaseKey):
+    """Key with a field inherited from the base key and a field declared in this class."""
+
+    version: int | None = None
+    """Version of the record."""
+
+    @classmethod
+    def get_key_type(cls) -> Type:
+        return _StubDerivedKey
 
 
 def test_get_key_fields():
@@ -25,5 +56,38 @@ def test_get_key_fields():
     assert KeyUtil.get_key_fields(ModuleDecl) == ["module_name"]
 
 
+def test_get_key_tuple():
+    """Test KeyUtil.get_key_tuple method and hashing of keys."""
+
+    # Key and record with the same key produce the same tuple
+    record = StubDataclassRecord(id="abc")
+    key = record.get_key()
+    assert KeyUtil.get_key_tuple(key) == (StubDataclassRecordKey, "abc")
+    assert KeyUtil.get_key_tuple(record) == KeyUtil.get_key_tuple(key)
+    assert KeyUtil.get_key_tuple(StubDataclassSingleton().get_key()) == (StubDataclassSingleton().get_key_type(),)
+
+    # Embedded keys are converted to tuples
+    nested_key = StubDataclassNestedFieldsKey()
+    assert KeyUtil.get_key_tuple(nested_key) == (
+        StubDataclassNestedFieldsKey,
+        "abc",
+        (StubDataclassRecordKey, "def"),
+        (StubDataclassRecordKey, "xyz"),
+    )
+
+    # Keys are hashable and equal keys have the same hash, records are not hashable
+    assert {key: 1}[StubDataclassRecordKey(id="abc")] == 1
+    assert hash(nested_key) == hash(StubDataclassNestedFieldsKey())
+    assert len({StubDataclassRecordKey(id="abc"), StubDataclassRecordKey(id="def"), key}) == 2
+    with pytest.raises(TypeError):
+        hash(record)
+
+    # Inherited key fields are included
+    derived_key = _StubDerivedKey(id="abc", version=1)
+    assert KeyUtil.get_key_tuple(derived_key) == (_StubDerivedKey, "abc", 1)
+    assert derived_key != _StubDerivedKey(id="def", version=1)
+    assert len({derived_key, _StubDerivedKey(id="abc", version=1), _StubDerivedKey(id="def", version=1)}) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -14,6 +14,7 @@
 
 import pytest
 from cl.runtime.db.protocols import TKey
+from cl.runtime.log.exceptions.user_error import UserError
 from cl.runtime.records.record_util import RecordUtil
 from cl.runtime.testing.regression_guard import RegressionGuard
 from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
@@ -28,6 +29,7 @@ from stubs.cl.runtime import StubDataclassOtherDerivedRecord
 from stubs.cl.runtime import StubDataclassPrimitiveFields
 from stubs.cl.runtime import StubDataclassRecord
 from stubs.cl.runtime import StubDataclassSingleton
+from stubs.cl.runtime.records.for_dataclasses.stub_dataclass_aliased_record import StubDataclassAliasedRecord
 
 
 class _Base:
@@ -113,5 +115,25 @@ def test_validate():
         RecordUtil.validate(sample)
 
 
+def test_validate_errors():
+    """Test errors reported by RecordUtil.validate using validators cached for each type."""
+
+    # Type mismatch for a primitive field
+    with pytest.raises(RuntimeError, match="obj_int_field"):
+        RecordUtil.validate(StubDataclassPrimitiveFields(obj_int_field="abc"))
+
+    # Type mismatch for an item of a container field
+    with pytest.raises(RuntimeError, match="str_list"):
+        RecordUtil.validate(StubDataclassListFields(str_list=["abc", 123]))
+
+    # Required field is not set
+    with pytest.raises(UserError, match="'a'"):
+        RecordUtil.validate(StubDataclassAliasedRecord(id="abc"))
+
+    # Validator is built once for each type
+    validator = RecordUtil._get_validator(StubDataclassListFields)  # noqa
+    assert RecordUtil._get_validator(StubDataclassListFields) is validator  # noqa
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
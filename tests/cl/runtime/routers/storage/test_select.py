@@ -0,0 +1,52 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from cl.runtime.context.testing_context import TestingContext
+from cl.runtime.routers.storage.select_request import SelectRequest
+from cl.runtime.routers.storage.select_response import SelectResponse
+from stubs.cl.runtime import StubDataclassDerivedRecord
+
+
+def test_method():
+    """Test paging and filtering for /storage/select route."""
+
+    with TestingContext() as context:
+        records = [StubDataclassDerivedRecord(id=f"id{i:02}", derived_field=str(i % 2)) for i in range(5)]
+        context.save_many(records)
+
+        type_ = StubDataclassDerivedRecord.__name__
+        module = StubDataclassDerivedRecord.__module__
+
+        # Full page, total count is queried separately
+        result = SelectResponse.get_records(SelectRequest(type_=type_, module=module, threshold=2, skip=1))
+        assert [x["Id"] for x in result["data"]] == ["id01", "id02"]
+        assert result["count"] == 5
+
+        # Last page, total count is known from the page
+        result = SelectResponse.get_records(SelectRequest(type_=type_, module=module, threshold=4, skip=3))
+        assert [x["Id"] for x in result["data"]] == ["id03", "id04"]
+        assert result["count"] == 5
+
+        # Filter by query dictionary with PascalCase field names
+        query_dict = {"DerivedField": "1"}
+        result = SelectResponse.get_records(
+            SelectRequest(type_=type_, module=module, query_dict=query_dict, threshold=1)
+        )
+        assert [x["Id"] for x in result["data"]] == ["id01"]
+        assert result["count"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
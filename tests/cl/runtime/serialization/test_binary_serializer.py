@@ -0,0 +1,124 @@
+# Copyright (C) 2023-present The Project Contributors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import datetime as dt
+from uuid import UUID
+import orjson
+from cl.runtime.serialization.binary_serializer import BinarySerializer
+from cl.runtime.serialization.dict_serializer import DictSerializer
+from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
+from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
+from stubs.cl.runtime import StubDataclassDerivedRecord
+from stubs.cl.runtime import StubDataclassDictFields
+from stubs.cl.runtime import StubDataclassDictListFields
+from stubs.cl.runtime import StubDataclassListDictFields
+from stubs.cl.runtime import StubDataclassListFields
+from stubs.cl.runtime import StubDataclassNestedFields
+from stubs.cl.runtime import StubDataclassOptionalFields
+from stubs.cl.runtime import StubDataclassOtherDerivedRecord
+from stubs.cl.runtime import StubDataclassPrimitiveFields
+from stubs.cl.runtime import StubDataclassRecord
+from stubs.cl.runtime import StubDataclassSingleton
+
+
+def test_data_serialization():
+    """Test roundtrip serialization to bytes."""
+
+    sample_types = [
+        StubDataclassRecord,
+        StubDataclassNestedFields,
+        StubDataclassDerivedRecord,
+        StubDataclassDerivedFromDerivedRecord,
+        StubDataclassOtherDerivedRecord,
+        StubDataclassListFields,
+        StubDataclassOptionalFields,
+        StubDataclassDictFields,
+        StubDataclassDictListFields,
+        StubDataclassListDictFields,
+        StubDataclassPrimitiveFields,
+        StubDataclassSingleton,
+    ]
+
+    serializer = BinarySerializer()
+
+    for sample_type in sample_types:
+        obj_1 = sample_type()
+        serialized_1 = serializer.serialize_to_bytes(obj_1)
+        obj_2 = serializer.deserialize_from_bytes(serialized_1)
+        serialized_2 = serializer.serialize_to_bytes(obj_2)
+
+        assert obj_1 == obj_2
+        assert serialized_1 == serialized_2
+
+
+def test_primitive_values():
+    """Test roundtrip serialization of values stored as extension types."""
+
+    obj = StubDataclassPrimitiveFields(
+        obj_date_field=dt.date(1, 1, 1),
+        obj_time_field=dt.time(23, 59, 59, 999999),
+        obj_date_time_field=dt.datetime(2003, 5, 1, 10, 15, 0, 123000, tzinfo=dt.timezone.utc),
+        obj_uuid_field=UUID(int=2**128 - 1),
+        obj_bytes_field=bytes(range(256)),
+    )
+    serializer = BinarySerializer()
+    assert serializer.deserialize_from_bytes(serializer.serialize_to_bytes(obj)) == obj
+
+    # Datetime without timezone
+    naive_datetime = dt.datetime(1900, 1, 1, 0, 0, 0, 1)
+    assert serializer._unpack_ext(*serializer._pack_ext(naive_datetime)) == naive_datetime  # noqa
+
+
+def test_serialized_size():
+    """Compare size of binary serialization with JSON serialization of dict and flat dict formats."""
+
+    records = [
+        StubDataclassPrimitiveFields(key_str_field=f"abc{i}", obj_bytes_field=bytes(range(256)) * 4) for i in range(100)
+    ] + [
+        StubDataclassListFields(
+            id=f"abc{i}", float_list=[j / 7 for j in range(1000)], date_list=[dt.date(2003, 5, 1)] * 100
+        )
+        for i in range(100)
+    ]
+
+    binary_serializer = BinarySerializer()
+    dict_serializer = DictSerializer()
+    flat_dict_serializer = FlatDictSerializer()
+    formats = {
+        "binary": (binary_serializer.serialize_to_bytes, binary_serializer.deserialize_from_bytes),
+        "dict": (
+            lambda x: orjson.dumps(dict_serializer.serialize_data(x), default=lambda v: v.hex()),
+            None,  # Bytes are not supported by JSON without conversion
+        ),
+        "flat_dict": (
+            lambda x: flat_dict_serializer.serialize_to_json(x).encode(),
+            flat_dict_serializer.deserialize_from_json,
+        ),
+    }
+
+    sizes = {}
+    for format_name, (serialize, deserialize) in formats.items():
+        serialized = [serialize(record) for record in records]
+        sizes[format_name] = sum(len(x) for x in serialized)
+        if deserialize is not None:
+            assert [deserialize(x) for x in serialized] == records
+
+    # Binary format is more compact than both JSON formats
+    assert sizes["binary"] < sizes["dict"]
+    assert sizes["binary"] < sizes["flat_dict"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
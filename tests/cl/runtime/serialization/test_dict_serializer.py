@@ -60,5 +60,42 @@ def test_data_serialization():
         pass
 
 
+def test_type_plan():
+    """Test that serialization plan is created once for each type and detects primitive fields."""
+
+    serializer = DictSerializer()
+    plan = serializer._get_type_plan(StubDataclassPrimitiveFields)  # noqa
+    assert serializer._get_type_plan(StubDataclassPrimitiveFields) is plan  # noqa
+    assert plan.short_name == "StubDataclassPrimitiveFields"
+
+    # Enums and nested data are serialized recursively
+    non_primitive_slots = [slot for slot, key, is_primitive in plan.fields if not is_primitive]
+    assert non_primitive_slots == ["key_enum_field", "obj_enum_field"]
+
+    # Keys are pascalized in a separate plan
+    pascalize_serializer = DictSerializer(pascalize_keys=True)
+    pascalize_plan = pascalize_serializer._get_type_plan(StubDataclassPrimitiveFields)  # noqa
+    assert pascalize_plan is not plan
+    assert pascalize_plan.fields_by_key["ObjStrField"] == ("obj_str_field", True, None)
+
+    obj = StubDataclassPrimitiveFields()
+    assert pascalize_serializer.deserialize_data(pascalize_serializer.serialize_data(obj)) == obj
+
+
+def test_skip_validation():
+    """Test skipping validation of deserialized objects."""
+
+    serialized = DictSerializer().serialize_data(StubDataclassPrimitiveFields())
+    serialized["obj_int_field"] = "abc"
+
+    # Type mismatch is detected by default
+    with pytest.raises(RuntimeError):
+        DictSerializer().deserialize_data(serialized)
+
+    # Validation is skipped for trusted data
+    obj = DictSerializer(skip_validation=True).deserialize_data(serialized)
+    assert obj.obj_int_field == "abc"
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
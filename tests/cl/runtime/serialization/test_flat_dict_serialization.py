@@ -13,7 +13,11 @@
 # limitations under the License.
 
 import pytest
+import json
+import math
+from typing import Any
 from cl.runtime.serialization.flat_dict_serializer import FlatDictSerializer
+from stubs.cl.runtime import StubDataclassData
 from stubs.cl.runtime import StubDataclassDerivedFromDerivedRecord
 from stubs.cl.runtime import StubDataclassDerivedRecord
 from stubs.cl.runtime import StubDataclassDictFields
@@ -27,6 +31,19 @@ from stubs.cl.runtime import StubDataclassPrimitiveFields
 from stubs.cl.runtime import StubDataclassRecord
 from stubs.cl.runtime import StubDataclassSingleton
 
+_complex_prefixes = ("```json ", "```LIST ")
+"""Type prefixes of complex field values."""
+
+
+def _to_legacy_value(value: Any) -> Any:
+    """Store nested dicts and lists as json strings with type prefix, as done before single-pass encoding."""
+    if isinstance(value, dict):
+        return "```json " + json.dumps({k: _to_legacy_value(v) for k, v in value.items()})
+    elif isinstance(value, list):
+        return "```LIST " + json.dumps([_to_legacy_value(v) for v in value])
+    else:
+        return value
+
 
 def test_data_serialization():
     sample_types = [
@@ -56,5 +73,80 @@ def test_data_serialization():
         assert serialized_1 == serialized_2
 
 
+def test_single_pass_json():
+    sample_types = [
+        StubDataclassNestedFields,
+        StubDataclassListFields,
+        StubDataclassDictListFields,
+        StubDataclassListDictFields,
+    ]
+
+    serializer = FlatDictSerializer()
+
+    for sample_type in sample_types:
+        obj = sample_type()
+        serialized = serializer.serialize_data(obj, is_root=True)
+
+        legacy_serialized = {}
+        for k, v in serialized.items():
+            if isinstance(v, str) and v.startswith(_complex_prefixes):
+                # Nested data, dicts and lists are stored inside a single json string
+                prefix, json_str = v.split(" ", 1)
+                assert not any(x in json_str for x in _complex_prefixes)
+                legacy_serialized[k] = _to_legacy_value(json.loads(json_str))
+            else:
+                legacy_serialized[k] = v
+
+        # Values stored with nested json strings can still be loaded
+        assert serializer.deserialize_data(legacy_serialized) == obj
+
+
+def test_non_finite_and_long_values():
+    serializer = FlatDictSerializer()
+
+    # Floats that are not finite and integers that do not fit into 64 bits round-trip inside complex fields
+    obj = StubDataclassListFields(
+        float_list=[float("nan"), 1.0, float("inf"), -float("inf")],
+        data_list=[StubDataclassData(int_field=2**70)],
+    )
+    serialized = serializer.serialize_data(obj, is_root=True)
+    deserialized = serializer.deserialize_data(serialized)
+    assert math.isnan(deserialized.float_list[0])
+    assert deserialized.float_list[1:] == obj.float_list[1:]
+    assert deserialized.data_list == obj.data_list
+
+
+def test_legacy_format():
+    serializer = FlatDictSerializer()
+
+    for sample_type in [StubDataclassNestedFields, StubDataclassListFields, StubDataclassListDictFields]:
+        obj = sample_type()
+        serialized = serializer.serialize_data(obj, is_root=True)
+        for k, v in serialized.items():
+            if k == "_type":
+                continue
+            # Values of complex fields in legacy format store nested data, dicts and lists as json strings
+            legacy_value = serializer.serialize_legacy_data(getattr(obj, k))
+            if isinstance(v, str) and v.startswith(_complex_prefixes):
+                prefix, json_str = v.split(" ", 1)
+                assert legacy_value == _to_legacy_value(json.loads(json_str))
+            else:
+                assert legacy_value == v
+
+
+def test_typed_fields():
+    serializer = FlatDictSerializer()
+
+    obj = StubDataclassPrimitiveFields(obj_str_field="```DATE 2003-05-01")
+    serialized = serializer.serialize_data(obj, is_root=True)
+    assert serialized["obj_date_field"] == "```DATE 2003-05-01"
+    assert serialized["obj_bool_field"] == "```bool Y"
+
+    # Fields declared as str are not parsed, values of other fields are parsed based on declared type
+    deserialized = serializer.deserialize_data(serialized)
+    assert deserialized.obj_str_field == "```DATE 2003-05-01"
+    assert deserialized == obj
+
+
 if __name__ == "__main__":
     pytest.main([__file__])